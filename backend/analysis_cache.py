@@ -0,0 +1,103 @@
+import hashlib
+import json
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+from sqlite_store import SQLiteStore
+
+# page_data fields the analyzer reads; links only contribute their text
+ANALYSIS_FIELDS = ('status_code', 'title', 'title_length', 'meta_description', 'meta_description_length',
+                   'canonical', 'og_tags', 'headings', 'full_text', 'word_count', 'total_images',
+                   'images_without_alt')
+
+
+def analysis_cache_key(page_data, keywords, version):
+    """Hash of everything a page analysis depends on (its URL excluded, so identical templates share it)"""
+    content = {field: page_data.get(field) for field in ANALYSIS_FIELDS}
+    content['link_texts'] = [link.get('text', '') for link in page_data.get('links', [])]
+    content['keywords'] = keywords
+    content['version'] = version
+    encoded = json.dumps(content, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class AnalysisDiskStore(SQLiteStore):
+    """Disk tier of the analysis cache, so memoized analyses survive restarts and are shared by processes"""
+
+    SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    key TEXT PRIMARY KEY,
+    analysis BLOB NOT NULL,
+    updated_at TEXT NOT NULL
+);
+"""
+
+    def get(self, key):
+        row = self.connection().execute('SELECT analysis FROM analyses WHERE key = ?', (key,)).fetchone()
+        return zlib.decompress(row['analysis']).decode('utf-8') if row else None
+
+    def set(self, key, encoded):
+        with self.connection() as conn:
+            conn.execute('INSERT OR REPLACE INTO analyses (key, analysis, updated_at) VALUES (?, ?, ?)',
+                         (key, zlib.compress(encoded.encode('utf-8')), datetime.now().isoformat()))
+
+
+class AnalysisCache:
+    """Thread-safe LRU of page analyses keyed by content hash, with an optional SQLite disk tier.
+
+    Entries are kept JSON-encoded so every hit returns a fresh copy that callers may modify.
+    """
+
+    def __init__(self, max_entries=2048, path=None):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.disk = AnalysisDiskStore(path) if path else None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            encoded = self.entries.get(key)
+            if encoded is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return json.loads(encoded)
+
+        encoded = self.disk.get(key) if self.disk else None
+        if encoded is None:
+            with self.lock:
+                self.misses += 1
+            return None
+
+        self._remember(key, encoded)
+        with self.lock:
+            self.hits += 1
+        return json.loads(encoded)
+
+    def clear(self):
+        """Forget the in-memory entries (the disk tier, if any, is kept)"""
+        with self.lock:
+            self.entries.clear()
+
+    def set(self, key, analysis):
+        encoded = json.dumps(analysis)
+        self._remember(key, encoded)
+        if self.disk:
+            self.disk.set(key, encoded)
+
+    def _remember(self, key, encoded):
+        with self.lock:
+            self.entries[key] = encoded
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+
+# Process-wide cache; set ANALYSIS_CACHE_PATH to also keep analyses on disk
+analysis_cache = AnalysisCache(
+    max_entries=int(os.environ.get('ANALYSIS_CACHE_SIZE', '2048')),
+    path=os.environ.get('ANALYSIS_CACHE_PATH') or None
+)
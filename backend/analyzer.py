@@ -1,12 +1,73 @@
-from textblob import TextBlob
-import textstat
-import re
 from collections import Counter
-from sklearn.feature_extraction.text import TfidfVectorizer
+from keywords import SiteKeywordEngine, empty_keywords, pending_keywords
+from text_stats import TextStats
+from analysis_cache import analysis_cache, analysis_cache_key
+from sentiment import SentimentAnalyzer, BACKENDS
+from metrics import timed
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import threading
+import json
 import math
+import os
+
+# Below this many pages the pool's dispatch and pickling overhead outweighs the parallel
+# speedup. Estimated from benchmarks/analysis_pool.py on a single-core host (~1 ms dispatch vs
+# ~3 ms per 1500-word page), where the pool itself is no faster; re-run it on the target hardware
+# before setting ANALYSIS_WORKERS, which is why the pool is off (0) by default.
+PARALLEL_MIN_PAGES = 4
+
+# Part of every analysis cache key: bump whenever a change alters analyze_page's output
+ANALYZER_VERSION = 2
+
+_pool = None
+_pool_config = None
+_pool_lock = threading.Lock()
+_worker_analyzer = None
+
+
+def _init_worker(sentiment_backend=None, sentiment_max_words=None):
+    """Pool initializer: build one analyzer per worker, configured like the parent's, and warm up the heavy NLP dependencies"""
+    global _worker_analyzer
+    _worker_analyzer = SEOAnalyzer(cache=None, sentiment=SentimentAnalyzer(sentiment_backend, max_words=sentiment_max_words))
+    warm_up_analysis(_worker_analyzer)
+
+
+def warm_up_analysis(analyzer):
+    """Load the lazily imported NLP dependencies (scikit-learn, textstat, the sentiment lexicon) now"""
+    text = ' '.join(['Warm up the readability statistics, keyword model and sentiment lexicon.'] * 5)
+    stats = TextStats(text)
+    stats.flesch_reading_ease()
+    engine = SiteKeywordEngine()
+    engine.add_document(0, stats)
+    engine.extract(1)
+    analyzer.sentiment.polarity(text)
+
+
+def _analyze_in_worker(item):
+    page, keywords, stats = item
+    analysis = _worker_analyzer.compute_page_analysis(page, keywords=keywords, stats=stats)
+    if 'error' not in analysis:
+        analysis['overall_score'] = _worker_analyzer.calculate_overall_score(analysis)
+    return analysis
+
+
+def get_process_pool(workers, sentiment_backend=None, sentiment_max_words=None):
+    """Get the shared analysis process pool, (re)creating it if the worker count or analyzer config changed"""
+    global _pool, _pool_config
+    config = (workers, sentiment_backend, sentiment_max_words)
+    with _pool_lock:
+        if _pool is None or _pool_config != config:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            # spawn avoids forking a multi-threaded server process
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                        initializer=_init_worker, initargs=(sentiment_backend, sentiment_max_words))
+            _pool_config = config
+        return _pool
 
 class SEOAnalyzer:
-    def __init__(self):
+    def __init__(self, workers=None, cache=analysis_cache, timings=None, sentiment=None):
         # SEO best practices thresholds
         self.IDEAL_TITLE_MIN = 50
         self.IDEAL_TITLE_MAX = 60
@@ -15,30 +76,123 @@ class SEOAnalyzer:
         self.MIN_WORD_COUNT = 300
         self.IDEAL_WORD_COUNT = 1000
         
-    def analyze_page(self, page_data):
-        """Analyze a single page for SEO metrics"""
+        # Parallel analysis is opt-in: 0/1 workers analyzes pages in-process
+        if workers is None:
+            workers = int(os.environ.get('ANALYSIS_WORKERS', '0'))
+        self.workers = workers
+        
+        # Memoizes analyses of identical page content (None disables)
+        self.cache = cache
+        
+        # Optional metrics.StageTimings collecting per-stage times for the current audit
+        self.timings = timings
+        
+        # Page polarity: the fast 'lexicon' backend by default, 'textblob' (SENTIMENT_BACKEND) for parity checks
+        self.sentiment = sentiment if isinstance(sentiment, SentimentAnalyzer) else SentimentAnalyzer(sentiment)
+        
+    def analyze_page(self, page_data, keywords=None, stats=None):
+        """Analyze a single page for SEO metrics (keywords: precomputed site-level keyword analysis)"""
+        with timed('analyze_page', self.timings):
+            return self._analyze_page(page_data, keywords, stats)
+    
+    def _analyze_page(self, page_data, keywords=None, stats=None):
         if 'error' in page_data:
             return {'error': page_data['error']}
         
+        # Unchanged page (HTTP 304): reuse the analysis stored in the page cache
+        if page_data.get('cached_analysis') is not None:
+            return self.reuse_analysis(page_data, keywords)
+        
+        # Identical content (same template, or the same page in an earlier audit): reuse the memoized analysis
+        key = self.cache_key(page_data, keywords)
+        analysis = self.get_cached_analysis(key, page_data)
+        if analysis is None:
+            analysis = self.compute_page_analysis(page_data, keywords=keywords, stats=stats)
+            self.cache_analysis(key, analysis)
+        return analysis
+    
+    def analyze_page_quick(self, page_data):
+        """Fast single-page analysis: everything but the text metrics (readability, sentiment, keywords).
+        
+        Returns (analysis, complete). A memoized full analysis of the same content is returned when
+        there is one (complete=True); otherwise the analysis lists the metrics still 'pending' and its
+        content score covers word count and structure only.
+        """
+        with timed('analyze_page_quick', self.timings):
+            if 'error' in page_data:
+                return {'error': page_data['error']}, True
+            
+            analysis = self.get_cached_analysis(self.cache_key(page_data), page_data)
+            if analysis is not None:
+                return analysis, True
+            
+            analysis = self.compute_page_analysis(page_data, text_metrics=False)
+            analysis['pending'] = ['readability', 'sentiment', 'keywords']
+            return analysis, False
+    
+    def analysis_version(self):
+        """Analyzer version and the settings that change its output; stored with every cached analysis"""
+        return f'{ANALYZER_VERSION}/{self.sentiment.name}/{self.sentiment.max_words}'
+    
+    def cache_key(self, page_data, keywords=None):
+        if self.cache is None:
+            return None
+        return analysis_cache_key(page_data, keywords, self.analysis_version())
+    
+    def get_cached_analysis(self, key, page_data):
+        """Memoized analysis for this key, relabelled with the page's URL (None on a miss)"""
+        if key is None:
+            return None
+        analysis = self.cache.get(key)
+        if analysis is not None:
+            analysis['url'] = page_data['url']
+        return analysis
+    
+    def cache_analysis(self, key, analysis):
+        if key is not None:
+            self.cache.set(key, analysis)
+    
+    def compute_page_analysis(self, page_data, keywords=None, stats=None, text_metrics=True):
+        """Run every analysis for a page, bypassing the caches"""
+        with timed('technical_seo', self.timings):
+            technical_seo = self.analyze_technical_seo(page_data)
+        with timed('content_seo', self.timings):
+            content_seo = self.analyze_content_seo(page_data, keywords=keywords, stats=stats,
+                                                   text_metrics=text_metrics)
+        with timed('accessibility', self.timings):
+            accessibility = self.analyze_accessibility(page_data)
+        
         analysis = {
             'url': page_data['url'],
-            'technical_seo': self.analyze_technical_seo(page_data),
-            'content_seo': self.analyze_content_seo(page_data),
-            'accessibility': self.analyze_accessibility(page_data),
+            'technical_seo': technical_seo,
+            'content_seo': content_seo,
+            'accessibility': accessibility,
             'issues': [],
             'warnings': [],
             'recommendations': [],
             'positive_highlights': []  # What's working well!
         }
         
-        # Generate issues and recommendations
-        self.generate_issues(page_data, analysis)
-        
-        # Generate positive highlights
-        self.generate_positive_highlights(page_data, analysis)
+        with timed('issues', self.timings):
+            # Generate issues and recommendations
+            self.generate_issues(page_data, analysis)
+            
+            # Generate positive highlights
+            self.generate_positive_highlights(page_data, analysis)
         
         return analysis
     
+    def reuse_analysis(self, page_data, keywords=None):
+        """Previous analysis of an unchanged page, with the current site-wide keywords applied"""
+        analysis = page_data['cached_analysis']
+        analysis['url'] = page_data['url']
+        if keywords is not None:
+            # Keyword lists depend on the rest of the site; the keyword score only on the page itself
+            details = analysis['content_seo']['details']
+            details['top_keywords'] = keywords['top_keywords']
+            details['keyword_density'] = keywords['keyword_density']
+        return analysis
+    
     def analyze_technical_seo(self, page_data):
         """Analyze technical SEO aspects"""
         score = 0
@@ -144,8 +298,8 @@ class SEOAnalyzer:
             'details': details
         }
     
-    def analyze_content_seo(self, page_data):
-        """Analyze content quality and SEO"""
+    def analyze_content_seo(self, page_data, keywords=None, stats=None, text_metrics=True):
+        """Analyze content quality and SEO (text_metrics=False scores only word count and structure)"""
         score = 0
         max_score = 100
         details = {}
@@ -168,36 +322,76 @@ class SEOAnalyzer:
         
         details['word_count'] = word_count
         
+        # Readability, sentiment and keywords (60 points): the costly text metrics
+        if text_metrics:
+            score += self.analyze_text_metrics(text, word_count, details, keywords=keywords, stats=stats)
+        else:
+            max_score -= 60
+            details['readability_status'] = 'pending'
+            details['keyword_status'] = 'pending'
+        
+        # Content structure (15 points)
+        headings = page_data.get('headings', {})
+        total_headings = sum(len(h) for h in headings.values())
+        
+        if total_headings >= 5:
+            score += 15
+            details['content_structure'] = 'well_structured'
+        elif total_headings > 0:
+            score += 8
+            details['content_structure'] = 'basic'
+        else:
+            details['content_structure'] = 'poor'
+        
+        details['total_headings'] = total_headings
+        
+        return {
+            'score': score,
+            'max_score': max_score,
+            'percentage': round((score / max_score) * 100, 1),
+            'details': details
+        }
+    
+    def analyze_text_metrics(self, text, word_count, details, keywords=None, stats=None):
+        """Score readability, tone and keywords into content details; returns the points earned (max 60)"""
+        score = 0
+        
+        # Tokenize once; readability and keywords are all derived from these statistics
+        if stats is None:
+            with timed('text_stats', self.timings):
+                stats = TextStats(text)
+        
         # Readability analysis (25 points)
-        if text and word_count > 50:
-            try:
-                flesch_score = textstat.flesch_reading_ease(text)
-                details['flesch_reading_ease'] = round(flesch_score, 1)
+        with timed('readability', self.timings):
+            if text and word_count > 50:
+                try:
+                    flesch_score = stats.flesch_reading_ease()
+                    details['flesch_reading_ease'] = round(flesch_score, 1)
                 
-                # Score based on readability
-                if 60 <= flesch_score <= 80:  # Ideal range
-                    score += 25
-                    details['readability_status'] = 'optimal'
-                elif 50 <= flesch_score <= 90:
-                    score += 15
-                    details['readability_status'] = 'good'
-                else:
-                    score += 5
-                    details['readability_status'] = 'needs_improvement'
+                    # Score based on readability
+                    if 60 <= flesch_score <= 80:  # Ideal range
+                        score += 25
+                        details['readability_status'] = 'optimal'
+                    elif 50 <= flesch_score <= 90:
+                        score += 15
+                        details['readability_status'] = 'good'
+                    else:
+                        score += 5
+                        details['readability_status'] = 'needs_improvement'
                 
-                # Additional readability metrics
-                details['flesch_kincaid_grade'] = round(textstat.flesch_kincaid_grade(text), 1)
-                details['reading_level'] = self.get_reading_level(flesch_score)
+                    # Additional readability metrics
+                    details['flesch_kincaid_grade'] = round(stats.flesch_kincaid_grade(), 1)
+                    details['reading_level'] = self.get_reading_level(flesch_score)
                 
-            except:
-                details['readability_status'] = 'error'
-        else:
-            details['readability_status'] = 'insufficient_text'
+                except:
+                    details['readability_status'] = 'error'
+            else:
+                details['readability_status'] = 'insufficient_text'
         
         # Sentiment analysis (15 points)
         if text:
-            blob = TextBlob(text)
-            sentiment = blob.sentiment.polarity
+            with timed('sentiment', self.timings):
+                sentiment = self.sentiment.polarity(text)
             
             details['sentiment_polarity'] = round(sentiment, 2)
             
@@ -212,40 +406,26 @@ class SEOAnalyzer:
                 score += 10
         
         # Keyword analysis (20 points)
-        keywords_analysis = self.extract_keywords_tfidf(text)
+        if keywords is not None:
+            keywords_analysis = keywords
+        else:
+            with timed('keywords', self.timings):
+                keywords_analysis = self.extract_keywords_tfidf(text, stats)
         details['top_keywords'] = keywords_analysis['top_keywords']
         details['keyword_density'] = keywords_analysis['keyword_density']
         
-        if len(keywords_analysis['top_keywords']) >= 5:
+        # Placeholder keywords (pending_keywords) carry only the count the page will get
+        keyword_count = keywords_analysis.get('keyword_count', len(keywords_analysis['top_keywords']))
+        if keyword_count >= 5:
             score += 20
             details['keyword_status'] = 'good'
-        elif len(keywords_analysis['top_keywords']) > 0:
+        elif keyword_count > 0:
             score += 10
             details['keyword_status'] = 'limited'
         else:
             details['keyword_status'] = 'none'
         
-        # Content structure (15 points)
-        headings = page_data.get('headings', {})
-        total_headings = sum(len(h) for h in headings.values())
-        
-        if total_headings >= 5:
-            score += 15
-            details['content_structure'] = 'well_structured'
-        elif total_headings > 0:
-            score += 8
-            details['content_structure'] = 'basic'
-        else:
-            details['content_structure'] = 'poor'
-        
-        details['total_headings'] = total_headings
-        
-        return {
-            'score': score,
-            'max_score': max_score,
-            'percentage': round((score / max_score) * 100, 1),
-            'details': details
-        }
+        return score
     
     def analyze_accessibility(self, page_data):
         """Analyze accessibility features"""
@@ -337,60 +517,20 @@ class SEOAnalyzer:
         
         return True
     
-    def extract_keywords_tfidf(self, text):
-        """Extract keywords using TF-IDF"""
-        if not text or len(text.split()) < 10:
-            return {'top_keywords': [], 'keyword_density': {}}
-        
-        try:
-            # Clean text
-            words = re.findall(r'\b[a-zA-Z]{4,}\b', text.lower())
-            
-            if len(words) < 10:
-                return {'top_keywords': [], 'keyword_density': {}}
-            
-            # Use TF-IDF
-            vectorizer = TfidfVectorizer(max_features=20, stop_words='english')
-            tfidf_matrix = vectorizer.fit_transform([text])
-            feature_names = vectorizer.get_feature_names_out()
-            
-            # Get scores
-            scores = tfidf_matrix.toarray()[0]
-            keyword_scores = list(zip(feature_names, scores))
-            keyword_scores.sort(key=lambda x: x[1], reverse=True)
-            
-            # Calculate keyword density
-            word_count = len(words)
-            word_freq = Counter(words)
-            
-            top_keywords = []
-            keyword_density = {}
-            
-            for keyword, score in keyword_scores[:10]:
-                count = word_freq.get(keyword, 0)
-                density = round((count / word_count) * 100, 2)
-                top_keywords.append({
-                    'keyword': keyword,
-                    'tfidf_score': round(score, 3),
-                    'count': count,
-                    'density': density
-                })
-                keyword_density[keyword] = density
-            
-            return {
-                'top_keywords': top_keywords,
-                'keyword_density': keyword_density
-            }
-        except:
-            # Fallback to simple frequency
-            words = re.findall(r'\b[a-zA-Z]{4,}\b', text.lower())
-            word_freq = Counter(words)
-            top_words = word_freq.most_common(10)
-            
-            return {
-                'top_keywords': [{'keyword': w, 'count': c, 'density': 0} for w, c in top_words],
-                'keyword_density': {}
-            }
+    def extract_keywords_tfidf(self, text, stats=None):
+        """Extract keywords for a single page using TF-IDF (site audits use extract_site_keywords)"""
+        engine = SiteKeywordEngine()
+        engine.add_document(0, stats or TextStats(text))
+        return engine.extract(1)[0] or empty_keywords()
+    
+    def extract_site_keywords(self, pages, page_stats):
+        """Extract keywords for every page with one TF-IDF fit across the whole site"""
+        with timed('site_keywords', self.timings):
+            engine = SiteKeywordEngine()
+            for i, stats in enumerate(page_stats):
+                if stats is not None:
+                    engine.add_document(i, stats)
+            return [keywords or empty_keywords() for keywords in engine.extract(len(pages))]
     
     def get_reading_level(self, flesch_score):
         """Convert Flesch score to reading level"""
@@ -517,13 +657,23 @@ class SEOAnalyzer:
     
     def analyze_all_pages(self, crawl_data):
         """Analyze all crawled pages"""
-        pages_analysis = []
+        pages = crawl_data['pages']
         
-        for page in crawl_data['pages']:
-            analysis = self.analyze_page(page)
-            if 'error' not in analysis:
-                analysis['overall_score'] = self.calculate_overall_score(analysis)
-            pages_analysis.append(analysis)
+        # Tokenize each page once, then one site-wide TF-IDF pass instead of a vectorizer per page
+        with timed('text_stats', self.timings):
+            page_stats = [None if 'error' in page else TextStats(page.get('full_text', '')) for page in pages]
+        site_keywords = self.extract_site_keywords(pages, page_stats)
+        
+        # Pool workers rebuild the sentiment backend by name, so a custom backend object stays in-process
+        if self.workers > 1 and len(pages) >= PARALLEL_MIN_PAGES and self.sentiment.name in BACKENDS:
+            pages_analysis = self.analyze_pages_in_pool(pages, site_keywords, page_stats)
+        else:
+            pages_analysis = []
+            for page, keywords, stats in zip(pages, site_keywords, page_stats):
+                analysis = self.analyze_page(page, keywords=keywords, stats=stats)
+                if 'error' not in analysis:
+                    analysis['overall_score'] = self.calculate_overall_score(analysis)
+                pages_analysis.append(analysis)
         
         # Generate site-wide summary
         summary = self.generate_site_summary(pages_analysis, crawl_data)
@@ -534,8 +684,55 @@ class SEOAnalyzer:
             'broken_links': crawl_data.get('broken_links', [])
         }
     
+    def analyze_pages_in_pool(self, pages, site_keywords, page_stats):
+        """Analyze pages in the process pool, sending each distinct uncached page content only once"""
+        pages_analysis = [None] * len(pages)
+        keys = [None] * len(pages)
+        first_index = {}  # cache key -> index of the page dispatched for it
+        pending = []
+        
+        for i, (page, keywords) in enumerate(zip(pages, site_keywords)):
+            if 'error' in page or page.get('cached_analysis') is not None:
+                pages_analysis[i] = self.analyze_page(page, keywords=keywords)
+                continue
+            keys[i] = self.cache_key(page, keywords)
+            cached = self.get_cached_analysis(keys[i], page)
+            if cached is not None:
+                pages_analysis[i] = cached
+            elif keys[i] is None or keys[i] not in first_index:
+                if keys[i] is not None:
+                    first_index[keys[i]] = i
+                pending.append(i)
+        
+        if pending:
+            # Fan out to the process pool; map() returns results in dispatch order
+            pool = get_process_pool(self.workers, self.sentiment.name, self.sentiment.max_words)
+            chunksize = max(1, len(pending) // (self.workers * 4))
+            items = ((pages[i], site_keywords[i], page_stats[i]) for i in pending)
+            # Sub-stage timings happen in the workers and are not collected; time the whole fan-out
+            with timed('analyze_pool', self.timings):
+                results = list(pool.map(_analyze_in_worker, items, chunksize=chunksize))
+            for i, analysis in zip(pending, results):
+                pages_analysis[i] = analysis
+                self.cache_analysis(keys[i], analysis)
+        
+        for i, analysis in enumerate(pages_analysis):
+            if analysis is None:
+                # Same content as a page dispatched earlier in this audit
+                analysis = json.loads(json.dumps(pages_analysis[first_index[keys[i]]]))
+                analysis['url'] = pages[i]['url']
+                pages_analysis[i] = analysis
+            if 'error' not in analysis:
+                analysis['overall_score'] = self.calculate_overall_score(analysis)
+        
+        return pages_analysis
+    
     def generate_site_summary(self, pages_analysis, crawl_data):
         """Generate overall site summary"""
+        with timed('summary', self.timings):
+            return self._generate_site_summary(pages_analysis, crawl_data)
+    
+    def _generate_site_summary(self, pages_analysis, crawl_data):
         valid_pages = [p for p in pages_analysis if 'error' not in p]
         
         if not valid_pages:
@@ -751,3 +948,63 @@ class SEOAnalyzer:
             })
         
         analysis['positive_highlights'] = highlights
+
+
+class StreamingSiteAnalysis:
+    """Analyzes pages one at a time as the crawler yields them.
+
+    Pages are scored immediately without fitting keywords: the keyword score only
+    depends on how many terms a page has (pending_keywords). finish() then fills in
+    every page's keywords from one site-wide TF-IDF fit and builds the site summary.
+    """
+
+    def __init__(self, analyzer=None):
+        self.analyzer = analyzer or SEOAnalyzer()
+        self.pages_analysis = []
+        self.page_stats = []
+
+    def add_page(self, page_data):
+        """Analyze one crawled page and return its analysis"""
+        stats = keywords = None
+        if 'error' not in page_data:
+            with timed('text_stats', self.analyzer.timings):
+                stats = TextStats(page_data.get('full_text', ''))
+            keywords = pending_keywords(stats)
+        analysis = self.analyzer.analyze_page(page_data, keywords=keywords, stats=stats)
+        if 'error' not in analysis:
+            analysis['overall_score'] = self.analyzer.calculate_overall_score(analysis)
+        self.add_result(analysis, stats)
+        return analysis
+
+    def add_result(self, analysis, stats):
+        """Add a page analyzed elsewhere (e.g. by a distributed crawl worker), in crawl order"""
+        self.pages_analysis.append(analysis)
+        self.page_stats.append(stats)
+
+    def running_scores(self):
+        """Average scores over the pages analyzed so far"""
+        valid_pages = [p for p in self.pages_analysis if 'error' not in p]
+        if not valid_pages:
+            return None
+        count = len(valid_pages)
+        return {
+            'overall': round(sum(p['overall_score'] for p in valid_pages) / count, 1),
+            'technical_seo': round(sum(p['technical_seo']['percentage'] for p in valid_pages) / count, 1),
+            'content_seo': round(sum(p['content_seo']['percentage'] for p in valid_pages) / count, 1),
+            'accessibility': round(sum(p['accessibility']['percentage'] for p in valid_pages) / count, 1)
+        }
+
+    def finish(self, crawl_data):
+        """Apply site-wide keywords and build the same result shape as analyze_all_pages"""
+        site_keywords = self.analyzer.extract_site_keywords(self.pages_analysis, self.page_stats)
+        for analysis, keywords in zip(self.pages_analysis, site_keywords):
+            if 'error' not in analysis:
+                details = analysis['content_seo']['details']
+                details['top_keywords'] = keywords['top_keywords']
+                details['keyword_density'] = keywords['keyword_density']
+
+        return {
+            'pages': self.pages_analysis,
+            'summary': self.analyzer.generate_site_summary(self.pages_analysis, crawl_data),
+            'broken_links': crawl_data.get('broken_links', [])
+        }
@@ -1,95 +1,423 @@
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, request, jsonify, send_file
 from flask_cors import CORS
 from crawler import SEOCrawler
-from analyzer import SEOAnalyzer
-from report_generator import PDFReportGenerator, generate_csv_export
+from analyzer import SEOAnalyzer, StreamingSiteAnalysis, warm_up_analysis
+from jobs import AuditJobQueue, JobStore, QueueFullError
+from audit_store import AuditStore
+from page_cache import PageCache
+from checkpoints import CheckpointStore, CrawlCheckpointer, new_checkpoint_id
+from analysis_cache import analysis_cache
+from metrics import REGISTRY, AUDITS, AUDIT_SECONDS, QUICK_CHECK_SECONDS, CallbackMetric, StageTimings, timed
+from profiler import SamplingProfiler
+from contextlib import nullcontext
 from datetime import datetime
+import hmac
+import importlib
 import json
 import os
+import queue
 
 app = Flask(__name__)
 CORS(app)
 
-# Store recent audits in memory (in production, use a database)
-recent_audits = []
+# Persistent audit history (SQLite, shared by all worker processes)
+audit_store = AuditStore()
 
-@app.route('/api/audit', methods=['POST'])
-def audit():
-    """Main SEO audit endpoint"""
+# Conditional-request cache of crawled pages, so re-audits skip unchanged pages
+page_cache = PageCache() if os.environ.get('PAGE_CACHE', '1') != '0' else None
+
+# Periodic crawl checkpoints, so an interrupted audit can be resumed without refetching crawled pages
+checkpoint_store = CheckpointStore() if os.environ.get('CHECKPOINTS', '1') != '0' else None
+
+# A 'running' checkpoint not updated for this long is assumed to belong to a dead audit
+CHECKPOINT_STALE_SECONDS = int(os.environ.get('CHECKPOINT_STALE_SECONDS', '300'))
+
+# Quick checks fetch with this timeout (seconds), so a slow site cannot hold the request for long
+QUICK_CHECK_TIMEOUT = float(os.environ.get('QUICK_CHECK_TIMEOUT', '5'))
+
+# Token for admin-only diagnostics such as per-request profiling (sent as X-Admin-Token); unset disables them
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN', '')
+
+REGISTRY.register(CallbackMetric('seo_analysis_cache_hits_total', 'Page analyses served from the analysis cache',
+                                 lambda: analysis_cache.hits, kind='counter'))
+REGISTRY.register(CallbackMetric('seo_analysis_cache_misses_total', 'Page analyses computed on a cache miss',
+                                 lambda: analysis_cache.misses, kind='counter'))
+
+def parse_audit_request(data):
+    """Validate an audit request body; returns (params, error_message)"""
+    data = data or {}
+    url = data.get('url')
+    
+    if not url:
+        return None, "URL is required"
+    
+    # Validate URL format
+    if not url.startswith(('http://', 'https://')):
+        return None, "URL must start with http:// or https://"
+    
+    return {
+        'url': url,
+        'max_pages': data.get('max_pages', 5),
+        'max_depth': data.get('max_depth', 2)
+    }, None
+
+def warm_up():
+    """Import the lazily loaded analysis and report dependencies and prime their caches.
+    
+    Run by gunicorn.conf.py in the master process, so forked workers start warm and share those pages.
+    """
+    importlib.import_module('report_generator')
+    warm_up_analysis(SEOAnalyzer(cache=None))
+
+def is_admin():
+    token = request.headers.get('X-Admin-Token', '')
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(token, ADMIN_TOKEN)
+
+def profiling_requested(data=None):
+    """Whether the request asks to be profiled ("profile": true in the body, or an X-Profile: 1 header)"""
+    return bool((data or {}).get('profile')) or request.headers.get('X-Profile', '').lower() in ('1', 'true')
+
+def run_audit(url, max_pages=5, max_depth=2, progress_callback=None, checkpoint_id=None, resume=False,
+              profile=False):
+    """Run the full crawl -> analyze -> advice pipeline and return the audit response.
+    
+    With checkpoints enabled, progress is saved under checkpoint_id as the crawl goes;
+    resume=True continues that checkpoint instead of starting a new crawl. profile=True
+    runs the audit under the sampling profiler and stores the profile with the audit.
+    """
+    if profile:
+        profiler = SamplingProfiler()
+        with profiler:
+            response_data = run_audit(url, max_pages, max_depth, progress_callback, checkpoint_id, resume)
+        audit_store.save_profile(response_data['audit_id'], 'audit', profiler.summary(), profiler.folded())
+        response_data['profile_url'] = f"/api/audits/{response_data['audit_id']}/profile"
+        return response_data
+    
+    print(f"Starting audit for: {url}")
+    timings = StageTimings()
+    analyzer = SEOAnalyzer(timings=timings)
+    
+    # The process pool analyzes all pages at once, so it needs every page kept; otherwise each
+    # page is analyzed as soon as it is crawled and only a compact record of it is retained
+    streaming = analyzer.workers <= 1
+    if checkpoint_store and resume:
+        # A checkpoint holds either compact pages plus analyses or full pages; keep its mode
+        streaming = checkpoint_store.get(checkpoint_id)['params'].get('streaming', streaming)
+    crawler = SEOCrawler(url, max_pages=max_pages, max_depth=max_depth, progress_callback=progress_callback,
+                         page_cache=page_cache, keep_page_data=not streaming, timings=timings,
+                         analysis_version=analyzer.analysis_version())
+    site_analysis = StreamingSiteAnalysis(analyzer) if streaming else None
+    
+    if checkpoint_store:
+        if resume:
+            checkpoint_store.mark_running(checkpoint_id)
+        else:
+            checkpoint_id = checkpoint_store.create(
+                url, {'max_pages': max_pages, 'max_depth': max_depth, 'streaming': streaming}, checkpoint_id)
+        crawler.checkpointer = CrawlCheckpointer(checkpoint_store, checkpoint_id, site_analysis)
+        if resume:
+            crawler.checkpointer.restore(crawler)
+    
     try:
-        data = request.json
-        url = data.get('url')
-        max_pages = data.get('max_pages', 5)
-        max_depth = data.get('max_depth', 2)
-        
-        if not url:
-            return jsonify({"error": "URL is required"}), 400
-        
-        # Validate URL format
-        if not url.startswith(('http://', 'https://')):
-            return jsonify({"error": "URL must start with http:// or https://"}), 400
-        
-        print(f"Starting audit for: {url}")
-        
-        # Step 1: Crawl website
-        crawler = SEOCrawler(url, max_pages=max_pages, max_depth=max_depth)
-        crawl_data = crawler.crawl()
+        # Step 1: Crawl website (analyzing pages as they arrive when streaming)
+        if streaming:
+            for page_data in crawler.iter_crawl():
+                site_analysis.add_page(page_data)
+            crawler.check_broken_links()
+            crawl_data = crawler.crawl_result()
+        else:
+            crawl_data = crawler.crawl()
         
         print(f"Crawled {len(crawl_data['pages'])} pages")
         
         # Step 2: Analyze SEO
-        analyzer = SEOAnalyzer()
-        analysis = analyzer.analyze_all_pages(crawl_data)
+        if progress_callback:
+            progress_callback('analyze', 0, len(crawl_data['pages']))
+        if streaming:
+            analysis = site_analysis.finish(crawl_data)
+        else:
+            analysis = analyzer.analyze_all_pages(crawl_data)
+        crawler.cache_analyses(analysis['pages'])
         
         print(f"Analysis complete")
         
-        # Step 3: Generate AI advice
+        response_data = build_audit_response(url, crawl_data, analysis, timings)
+    except Exception as e:
+        record_audit(timings, 'error')
+        if checkpoint_store:
+            checkpoint_store.fail(checkpoint_id, str(e))
+        raise
+    
+    record_audit(timings, 'ok')
+    if checkpoint_store:
+        checkpoint_store.complete(checkpoint_id, response_data['audit_id'])
+    return response_data
+
+def record_audit(timings, outcome):
+    AUDITS.inc(outcome=outcome)
+    AUDIT_SECONDS.observe(timings.to_dict()['total_seconds'], outcome=outcome)
+
+def build_audit_response(url, crawl_data, analysis, timings=None):
+    """Add AI advice, crawl stats and stage timings to an analysis and save it to the audit store"""
+    # Generate AI advice
+    with timed('ai_advice', timings):
         ai_advice = generate_ai_advice(analysis)
-        
-        # Prepare response
-        response_data = {
-            "url": url,
-            "timestamp": datetime.now().isoformat(),
-            "analysis": analysis,
-            "ai_advice": ai_advice,
-            "crawl_stats": {
-                "pages_crawled": crawl_data['total_pages_crawled'],
-                "links_found": crawl_data['total_links_found'],
-                "broken_links": len(crawl_data.get('broken_links', []))
-            }
+    
+    # Prepare response
+    response_data = {
+        "url": url,
+        "timestamp": datetime.now().isoformat(),
+        "analysis": analysis,
+        "ai_advice": ai_advice,
+        "crawl_stats": {
+            "pages_crawled": crawl_data['total_pages_crawled'],
+            "links_found": crawl_data['total_links_found'],
+            "pages_not_modified": crawl_data.get('pages_not_modified', 0),
+            "sitemap_urls": crawl_data.get('sitemap_urls', 0),
+            "robots_disallowed": crawl_data.get('robots_disallowed', 0),
+            "broken_links": len(crawl_data.get('broken_links', []))
         }
-        
-        # Store in recent audits (limit to last 10)
-        recent_audits.insert(0, {
-            'url': url,
-            'timestamp': datetime.now().isoformat(),
-            'overall_score': analysis['summary'].get('average_scores', {}).get('overall', 0)
-        })
-        if len(recent_audits) > 10:
-            recent_audits.pop()
-        
-        return jsonify(response_data)
+    }
+    
+    # Where the audit's time went (stored with the audit, so the save itself is not included)
+    if timings is not None:
+        response_data['timings'] = timings.to_dict()
+    
+    # Persist the full result so history and exports can reference it by ID
+    with timed('store', timings):
+        response_data['audit_id'] = audit_store.save(response_data)
+    
+    return response_data
+
+def stream_audit_events(url, max_pages=5, max_depth=2):
+    """Queue an audit on the background job queue and return a generator of its Server-Sent Events.
+    
+    Raises QueueFullError when the queue has no room. Closing the generator (the client
+    went away) stops the crawl.
+    """
+    events = queue.Queue()
+    timings = StageTimings()
+    analyzer = SEOAnalyzer(timings=timings)
+    crawler = SEOCrawler(url, max_pages=max_pages, max_depth=max_depth, page_cache=page_cache,
+                         keep_page_data=False, timings=timings, analysis_version=analyzer.analysis_version())
+    
+    def emit(event, data):
+        events.put((event, data))
+    
+    def pipeline(url, max_pages, max_depth, progress_callback=None):
+        def on_progress(stage, done, total):
+            progress_callback(stage, done, total)
+            if stage == 'links':
+                emit('progress', {'stage': stage, 'links_checked': done, 'links_total': total})
+        
+        try:
+            if crawler.stop_requested:
+                raise RuntimeError("Audit stream closed before the audit started")
+            app.logger.info("Starting streaming audit for: %s", url)
+            crawler.progress_callback = on_progress
+            streaming = StreamingSiteAnalysis(analyzer)
+            
+            # Analyze each page as soon as it is crawled
+            for page_data in crawler.iter_crawl():
+                analysis = streaming.add_page(page_data)
+                emit('page', {
+                    'analysis': analysis,
+                    'pages_crawled': len(crawler.pages_data),
+                    'running_scores': streaming.running_scores()
+                })
+            
+            if crawler.stop_requested:
+                raise RuntimeError("Audit stream closed by the client")
+            
+            crawler.check_broken_links(on_broken=lambda link: emit('broken_link', link))
+            crawl_data = crawler.crawl_result()
+            analysis = streaming.finish(crawl_data)
+            crawler.cache_analyses(analysis['pages'])
+            response_data = build_audit_response(url, crawl_data, analysis, timings)
+            record_audit(timings, 'ok')
+            emit('summary', response_data)
+            return response_data
+        except Exception as e:
+            if not crawler.stop_requested:
+                record_audit(timings, 'error')
+                app.logger.exception("Error during streaming audit of %s", url)
+                emit('error', {'error': str(e)})
+            raise
+        finally:
+            events.put(None)
+    
+    job = audit_jobs.submit({'url': url, 'max_pages': max_pages, 'max_depth': max_depth}, run=pipeline)
+    
+    def stream():
+        try:
+            yield sse_event('start', {'url': url, 'max_pages': max_pages, 'max_depth': max_depth,
+                                      'job_id': job.id, 'status_url': f"/api/audit/jobs/{job.id}"})
+            while True:
+                item = events.get()
+                if item is None:
+                    break
+                yield sse_event(*item)
+        except GeneratorExit:
+            # Client went away: stop crawling further pages (or skip the audit if it is still queued)
+            crawler.stop_requested = True
+            raise
+    
+    return stream()
+
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+# Background audit jobs; worker count and queue size bound concurrent audits per process.
+# Their status, progress and results are shared through SQLite, so any worker process can report on them
+audit_jobs = AuditJobQueue(
+    run_audit,
+    workers=int(os.environ.get('AUDIT_WORKERS', '2')),
+    max_queued=int(os.environ.get('AUDIT_QUEUE_SIZE', '20')),
+    store=JobStore(kind='audit')
+)
+
+@app.route('/api/audit', methods=['POST'])
+def audit():
+    """Main SEO audit endpoint"""
+    params = None
+    try:
+        params, error = parse_audit_request(request.json)
+        if error:
+            return jsonify({"error": error}), 400
+        if profiling_requested(request.json):
+            if not is_admin():
+                return jsonify({"error": "Profiling requires a valid X-Admin-Token"}), 403
+            params['profile'] = True
+        if checkpoint_store:
+            params['checkpoint_id'] = new_checkpoint_id()
+        
+        return jsonify(run_audit(**params))
         
     except Exception as e:
         print(f"Error during audit: {str(e)}")
         import traceback
         traceback.print_exc()
-        return jsonify({"error": str(e)}), 500
+        error_response = {"error": str(e)}
+        if checkpoint_store and params:
+            # The crawl so far was checkpointed; the client can continue it instead of starting over
+            error_response['checkpoint_id'] = params['checkpoint_id']
+            error_response['resume_url'] = f"/api/audit/checkpoints/{params['checkpoint_id']}/resume"
+        return jsonify(error_response), 500
+
+@app.route('/api/audit/stream', methods=['GET', 'POST'])
+def audit_stream():
+    """Stream audit results as Server-Sent Events: start, page, progress, broken_link, summary | error"""
+    data = request.json if request.method == 'POST' else {
+        'url': request.args.get('url'),
+        'max_pages': request.args.get('max_pages', 5, type=int),
+        'max_depth': request.args.get('max_depth', 2, type=int)
+    }
+    params, error = parse_audit_request(data)
+    if error:
+        return jsonify({"error": error}), 400
+    try:
+        events = stream_audit_events(**params)
+    except QueueFullError as e:
+        return jsonify({"error": str(e)}), 503
+    
+    return Response(
+        events,
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/api/audit/jobs', methods=['POST'])
+def submit_audit_job():
+    """Queue an audit in the background and return its job ID immediately"""
+    params, error = parse_audit_request(request.json)
+    if error:
+        return jsonify({"error": error}), 400
+    if profiling_requested(request.json):
+        if not is_admin():
+            return jsonify({"error": "Profiling requires a valid X-Admin-Token"}), 403
+        params['profile'] = True
+    if checkpoint_store:
+        params['checkpoint_id'] = new_checkpoint_id()
+    return queue_audit_job(params)
+
+def queue_audit_job(params):
+    """Submit audit params to the job queue; returns the 202 response (or 503 when full)"""
+    try:
+        job = audit_jobs.submit(params)
+    except QueueFullError as e:
+        return jsonify({"error": str(e)}), 503
+    
+    response_data = {
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/api/audit/jobs/{job.id}",
+        "result_url": f"/api/audit/jobs/{job.id}/result"
+    }
+    if params.get('checkpoint_id'):
+        response_data['checkpoint_id'] = params['checkpoint_id']
+        response_data['resume_url'] = f"/api/audit/checkpoints/{params['checkpoint_id']}/resume"
+    return jsonify(response_data), 202
+
+@app.route('/api/audit/jobs/<job_id>', methods=['GET'])
+def get_audit_job(job_id):
+    """Get status and progress of a background audit"""
+    job = audit_jobs.get(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/api/audit/jobs/<job_id>/result', methods=['GET'])
+def get_audit_job_result(job_id):
+    """Get the result of a finished background audit"""
+    job = audit_jobs.get(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    if job.status == 'failed':
+        return jsonify({"error": job.error, "status": job.status}), 500
+    if job.status != 'completed':
+        return jsonify({"error": "Audit not finished yet", "status": job.status}), 409
+    return jsonify(job.result)
+
+def get_export_data(audit_id=None):
+    """Resolve the analysis to export, from a stored audit ID or the posted analysis; returns (analysis, url, error_response)"""
+    data = request.get_json(silent=True) or {}
+    audit_id = audit_id or data.get('audit_id')
+    
+    if audit_id:
+        result = audit_store.get(audit_id)
+        if not result:
+            return None, None, (jsonify({"error": "Audit not found"}), 404)
+        return result['analysis'], result['url'], None
+    
+    analysis_data = data.get('analysis')
+    if not analysis_data:
+        return None, None, (jsonify({"error": "Analysis data or audit_id is required"}), 400)
+    return analysis_data, data.get('url', 'Unknown'), None
 
 @app.route('/api/export/pdf', methods=['POST'])
-def export_pdf():
+@app.route('/api/audits/<audit_id>/export/pdf', methods=['GET'])
+def export_pdf(audit_id=None):
     """Export audit results as PDF"""
     try:
-        data = request.json
-        analysis_data = data.get('analysis')
-        url = data.get('url', 'Unknown')
-        
-        if not analysis_data:
-            return jsonify({"error": "Analysis data is required"}), 400
-        
-        # Generate PDF
+        analysis_data, url, error = get_export_data(audit_id)
+        if error:
+            return error
+        
+        # Profiling a stored audit's report keeps the profile with that audit
+        profiler = None
+        if audit_id and profiling_requested():
+            if not is_admin():
+                return jsonify({"error": "Profiling requires a valid X-Admin-Token"}), 403
+            profiler = SamplingProfiler()
+        
+        # Generate PDF (reportlab is only imported once a report is requested)
+        from report_generator import PDFReportGenerator
         pdf_generator = PDFReportGenerator()
-        pdf_buffer = pdf_generator.generate_pdf(analysis_data, url)
+        with profiler or nullcontext(), timed('export_pdf'):
+            pdf_buffer = pdf_generator.generate_pdf(analysis_data, url)
+        
+        if profiler:
+            audit_store.save_profile(audit_id, 'export_pdf', profiler.summary(), profiler.folded())
         
         # Create filename
         filename = f"seo_audit_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
@@ -105,6 +433,8 @@ def export_pdf():
         # Add explicit headers to force download
         response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
         response.headers['Content-Type'] = 'application/pdf'
+        if profiler:
+            response.headers['X-Profile-URL'] = f"/api/audits/{audit_id}/profile?target=export_pdf"
         
         return response
         
@@ -113,17 +443,18 @@ def export_pdf():
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/export/csv', methods=['POST'])
-def export_csv():
+@app.route('/api/audits/<audit_id>/export/csv', methods=['GET'])
+def export_csv(audit_id=None):
     """Export audit results as CSV"""
     try:
-        data = request.json
-        analysis_data = data.get('analysis')
-        
-        if not analysis_data:
-            return jsonify({"error": "Analysis data is required"}), 400
+        analysis_data, url, error = get_export_data(audit_id)
+        if error:
+            return error
         
         # Generate CSV
-        csv_data = generate_csv_export(analysis_data)
+        from report_generator import generate_csv_export
+        with timed('export_csv'):
+            csv_data = generate_csv_export(analysis_data)
         
         # Create filename
         filename = f"seo_audit_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
@@ -150,15 +481,13 @@ def export_csv():
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/export/json', methods=['POST'])
-def export_json():
+@app.route('/api/audits/<audit_id>/export/json', methods=['GET'])
+def export_json(audit_id=None):
     """Export audit results as JSON"""
     try:
-        data = request.json
-        analysis_data = data.get('analysis')
-        url = data.get('url', 'Unknown')
-        
-        if not analysis_data:
-            return jsonify({"error": "Analysis data is required"}), 400
+        analysis_data, url, error = get_export_data(audit_id)
+        if error:
+            return error
         
         # Create filename
         filename = f"seo_audit_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
@@ -171,7 +500,8 @@ def export_json():
         }
         
         from io import BytesIO
-        json_buffer = BytesIO(json.dumps(export_data, indent=2).encode('utf-8'))
+        with timed('export_json'):
+            json_buffer = BytesIO(json.dumps(export_data, indent=2).encode('utf-8'))
         json_buffer.seek(0)
         
         response = send_file(
@@ -193,12 +523,103 @@ def export_json():
 
 @app.route('/api/history', methods=['GET'])
 def get_history():
-    """Get recent audit history"""
-    return jsonify({"history": recent_audits})
+    """Get audit history, newest first (paginate with ?before=<next_before>; filter with ?url=)"""
+    limit = min(request.args.get('limit', 10, type=int), 100)
+    history = audit_store.history(
+        limit=limit,
+        before=request.args.get('before'),
+        url=request.args.get('url')
+    )
+    return jsonify({
+        "history": history,
+        "next_before": history[-1]['timestamp'] if len(history) == limit else None
+    })
+
+@app.route('/api/audit/checkpoints', methods=['GET'])
+def list_checkpoints():
+    """Audits that were interrupted or failed and can be resumed, newest first (filter with ?url=)"""
+    if not checkpoint_store:
+        return jsonify({"error": "Checkpoints are disabled"}), 404
+    limit = min(request.args.get('limit', 20, type=int), 100)
+    return jsonify({"checkpoints": checkpoint_store.resumable(limit=limit, url=request.args.get('url'))})
+
+@app.route('/api/audit/checkpoints/<checkpoint_id>', methods=['GET'])
+def get_checkpoint(checkpoint_id):
+    """Status and progress of an audit checkpoint"""
+    checkpoint = checkpoint_store.get(checkpoint_id) if checkpoint_store else None
+    if not checkpoint:
+        return jsonify({"error": "Checkpoint not found"}), 404
+    return jsonify(checkpoint)
+
+@app.route('/api/audit/checkpoints/<checkpoint_id>/resume', methods=['POST'])
+def resume_checkpoint(checkpoint_id):
+    """Continue an interrupted audit in the background, skipping the pages it already crawled"""
+    checkpoint = checkpoint_store.get(checkpoint_id) if checkpoint_store else None
+    if not checkpoint:
+        return jsonify({"error": "Checkpoint not found"}), 404
+    if checkpoint['status'] == 'completed':
+        return jsonify({
+            "status": "completed",
+            "audit_id": checkpoint['audit_id'],
+            "audit_url": f"/api/audits/{checkpoint['audit_id']}"
+        })
+    if any(job.params.get('checkpoint_id') == checkpoint_id for job in audit_jobs.active_jobs()):
+        return jsonify({"error": "Audit is already queued or running"}), 409
+    force = request.args.get('force') == '1'
+    if not force and checkpoint_store.is_active(checkpoint_id, CHECKPOINT_STALE_SECONDS):
+        return jsonify({"error": "Audit is still running (pass ?force=1 to resume anyway)"}), 409
+    
+    params = checkpoint['params']
+    return queue_audit_job({
+        'url': checkpoint['url'],
+        'max_pages': params['max_pages'],
+        'max_depth': params['max_depth'],
+        'checkpoint_id': checkpoint_id,
+        'resume': True
+    })
+
+@app.route('/api/audits/<audit_id>', methods=['GET'])
+def get_audit(audit_id):
+    """Get a stored audit result by ID"""
+    result = audit_store.get(audit_id)
+    if not result:
+        return jsonify({"error": "Audit not found"}), 404
+    return jsonify(result)
+
+@app.route('/api/audits/<audit_id>/profile', methods=['GET'])
+def get_audit_profile(audit_id):
+    """Sampling profile of an audit (?target=export_pdf for its PDF report); ?format=folded for flamegraph input"""
+    if not is_admin():
+        return jsonify({"error": "Profiles require a valid X-Admin-Token"}), 403
+    target = request.args.get('target', 'audit')
+    profile = audit_store.get_profile(audit_id, target)
+    if not profile:
+        return jsonify({"error": "Profile not found", "targets": audit_store.profile_targets(audit_id)}), 404
+    summary, folded = profile
+    if request.args.get('format') == 'folded':
+        return Response(folded, mimetype='text/plain')
+    return jsonify(dict(summary, audit_id=audit_id, target=target))
+
+def complete_quick_check(url, page_data, progress_callback=None):
+    """Background half of a quick check: the full page analysis, including the text metrics"""
+    analyzer = SEOAnalyzer()
+    analysis = analyzer.analyze_page(page_data)
+    if 'error' not in analysis:
+        analysis['overall_score'] = analyzer.calculate_overall_score(analysis)
+    return {"url": url, "analysis": analysis, "quick_check": True, "complete": True}
+
+# Deferred text metrics of quick checks, on their own workers so queued audits never delay them
+quick_check_jobs = AuditJobQueue(
+    complete_quick_check,
+    workers=int(os.environ.get('QUICK_CHECK_WORKERS', '1')),
+    max_queued=int(os.environ.get('QUICK_CHECK_QUEUE_SIZE', '50')),
+    store=JobStore(kind='quick_check')
+)
 
 @app.route('/api/quick-check', methods=['POST'])
 def quick_check():
-    """Quick single-page SEO check (faster than full audit)"""
+    """Quick single-page SEO check: one fetch, no link checks, text metrics in the background"""
+    timings = StageTimings()
     try:
         data = request.json
         url = data.get('url')
@@ -210,31 +631,62 @@ def quick_check():
         if not url.startswith(('http://', 'https://')):
             return jsonify({"error": "URL must start with http:// or https://"}), 400
         
-        # Crawl single page only
-        crawler = SEOCrawler(url, max_pages=1, max_depth=0)
-        crawl_data = crawler.crawl()
+        # Readability, sentiment and keywords: 'background' (default), 'inline' or 'skip'
+        content_metrics = data.get('content_metrics', 'background')
+        if content_metrics not in ('background', 'inline', 'skip'):
+            return jsonify({"error": "content_metrics must be 'background', 'inline' or 'skip'"}), 400
         
-        if not crawl_data['pages']:
-            return jsonify({"error": "Failed to crawl page"}), 500
+        # Fetch the page itself: no robots.txt, sitemaps, frontier or broken link checks
+        crawler = SEOCrawler(url, max_pages=1, max_depth=0, respect_robots=False, use_sitemaps=False,
+                             request_timeout=QUICK_CHECK_TIMEOUT, timings=timings)
+        page_data = crawler.fetch_page(url, 0)
         
-        # Analyze single page
-        analyzer = SEOAnalyzer()
-        page_data = crawl_data['pages'][0]
-        analysis = analyzer.analyze_page(page_data)
+        analyzer = SEOAnalyzer(timings=timings)
+        if content_metrics == 'inline':
+            analysis, complete = analyzer.analyze_page(page_data), True
+        else:
+            analysis, complete = analyzer.analyze_page_quick(page_data)
         
         if 'error' not in analysis:
             analysis['overall_score'] = analyzer.calculate_overall_score(analysis)
         
-        return jsonify({
+        response_data = {
             "url": url,
             "analysis": analysis,
-            "quick_check": True
-        })
+            "quick_check": True,
+            "complete": complete
+        }
+        
+        if not complete and content_metrics == 'background':
+            try:
+                job = quick_check_jobs.submit({'url': url, 'page_data': page_data})
+                response_data['check_id'] = job.id
+                response_data['result_url'] = f"/api/quick-check/{job.id}"
+            except QueueFullError:
+                print(f"Quick check queue full, skipping text metrics for {url}")
+        
+        response_data['timings'] = timings.to_dict()
+        QUICK_CHECK_SECONDS.observe(response_data['timings']['total_seconds'],
+                                    outcome='error' if 'error' in analysis else 'ok')
+        return jsonify(response_data)
         
     except Exception as e:
         print(f"Error during quick check: {str(e)}")
+        QUICK_CHECK_SECONDS.observe(timings.to_dict()['total_seconds'], outcome='error')
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/quick-check/<check_id>', methods=['GET'])
+def get_quick_check(check_id):
+    """Get the complete analysis of a quick check once its text metrics are done"""
+    job = quick_check_jobs.get(check_id)
+    if not job:
+        return jsonify({"error": "Quick check not found"}), 404
+    if job.status == 'failed':
+        return jsonify({"error": job.error, "status": job.status}), 500
+    if job.status != 'completed':
+        return jsonify({"error": "Text metrics not finished yet", "status": job.status}), 409
+    return jsonify(dict(job.result, check_id=check_id))
+
 def generate_ai_advice(analysis):
     """Generate AI-powered advice based on analysis"""
     advice = []
@@ -346,6 +798,11 @@ def generate_ai_advice(analysis):
     
     return advice
 
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Stage latency histograms and audit counters in the Prometheus text format (this process only)"""
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -0,0 +1,101 @@
+import json
+import os
+import uuid
+import zlib
+from datetime import datetime
+from sqlite_store import SQLiteStore, DATA_DIR
+
+DEFAULT_DB_PATH = os.path.join(DATA_DIR, 'audits.db')
+
+
+class AuditStore(SQLiteStore):
+    """Persistent audit results in SQLite (WAL mode), shared by every worker process"""
+
+    SCHEMA = """
+CREATE TABLE IF NOT EXISTS audits (
+    id TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    overall_score REAL,
+    result BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_audits_created_at ON audits (created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_audits_url_created_at ON audits (url, created_at DESC);
+CREATE TABLE IF NOT EXISTS audit_profiles (
+    audit_id TEXT NOT NULL,
+    target TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    summary BLOB NOT NULL,
+    folded BLOB NOT NULL,
+    PRIMARY KEY (audit_id, target)
+);
+"""
+
+    def __init__(self, path=None):
+        super().__init__(path or os.environ.get('AUDIT_DB_PATH', DEFAULT_DB_PATH))
+
+    def save(self, result):
+        """Store a full audit result; returns its audit ID"""
+        audit_id = uuid.uuid4().hex
+        overall = result.get('analysis', {}).get('summary', {}).get('average_scores', {}).get('overall', 0)
+        payload = zlib.compress(json.dumps(result).encode('utf-8'))
+        with self.connection() as conn:
+            conn.execute(
+                'INSERT INTO audits (id, url, created_at, overall_score, result) VALUES (?, ?, ?, ?, ?)',
+                (audit_id, result['url'], result['timestamp'], overall, payload)
+            )
+        return audit_id
+
+    def get(self, audit_id):
+        """Full audit result by ID, or None"""
+        row = self.connection().execute('SELECT result FROM audits WHERE id = ?', (audit_id,)).fetchone()
+        if row is None:
+            return None
+        return json.loads(zlib.decompress(row['result']).decode('utf-8'))
+
+    def history(self, limit=10, before=None, url=None):
+        """Audit summaries, newest first; pass the last entry's timestamp as `before` for the next page"""
+        query = 'SELECT id, url, created_at, overall_score FROM audits'
+        conditions, args = [], []
+        if url:
+            conditions.append('url = ?')
+            args.append(url)
+        if before:
+            conditions.append('created_at < ?')
+            args.append(before)
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += ' ORDER BY created_at DESC LIMIT ?'
+        args.append(limit)
+
+        return [{
+            'audit_id': row['id'],
+            'url': row['url'],
+            'timestamp': row['created_at'],
+            'overall_score': row['overall_score']
+        } for row in self.connection().execute(query, args)]
+
+    def save_profile(self, audit_id, target, summary, folded):
+        """Store the sampling profile of an audit (target 'audit') or of one of its exports (e.g. 'export_pdf')"""
+        with self.connection() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO audit_profiles (audit_id, target, created_at, summary, folded) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (audit_id, target, datetime.now().isoformat(),
+                 zlib.compress(json.dumps(summary).encode('utf-8')), zlib.compress(folded.encode('utf-8')))
+            )
+
+    def get_profile(self, audit_id, target='audit'):
+        """(summary, folded stacks) of a stored profile, or None"""
+        row = self.connection().execute(
+            'SELECT summary, folded FROM audit_profiles WHERE audit_id = ? AND target = ?', (audit_id, target)
+        ).fetchone()
+        if row is None:
+            return None
+        return (json.loads(zlib.decompress(row['summary']).decode('utf-8')),
+                zlib.decompress(row['folded']).decode('utf-8'))
+
+    def profile_targets(self, audit_id):
+        """Targets profiled for an audit"""
+        return [row['target'] for row in self.connection().execute(
+            'SELECT target FROM audit_profiles WHERE audit_id = ? ORDER BY created_at', (audit_id,))]
@@ -0,0 +1,51 @@
+"""Analysis memoization: template-heavy site, first audit vs re-audit.
+
+Usage (from backend/):  python -m benchmarks.analysis_cache [--pages 60] [--templates 6] [--words 1500]
+
+Pages share one of a few bodies (as listing/product templates do), so the
+first audit analyzes each distinct body once and a re-audit is all hits.
+Also checks that memoized results equal uncached ones.
+"""
+import argparse
+import json
+import time
+from analysis_cache import AnalysisCache
+from analyzer import SEOAnalyzer
+from crawler import SEOCrawler
+from benchmarks.extraction import synthetic_corpus
+
+
+def audit(analyzer, pages):
+    start = time.perf_counter()
+    result = analyzer.analyze_all_pages({'pages': pages, 'broken_links': [], 'total_pages_crawled': len(pages)})
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pages', type=int, default=60)
+    parser.add_argument('--templates', type=int, default=6)
+    parser.add_argument('--words', type=int, default=1500)
+    args = parser.parse_args()
+
+    crawler = SEOCrawler('https://example.com/')
+    bodies = synthetic_corpus(count=args.templates, words=args.words)
+    pages = [crawler.extract_page_data(f'https://example.com/item/{i}', bodies[i % args.templates])
+             for i in range(args.pages)]
+
+    uncached_time, uncached = audit(SEOAnalyzer(workers=0, cache=None), pages)
+    cache = AnalysisCache()
+    memoized = SEOAnalyzer(workers=0, cache=cache)
+    first_time, first = audit(memoized, pages)
+    again_time, again = audit(memoized, pages)
+
+    same = json.dumps(uncached, sort_keys=True) == json.dumps(first, sort_keys=True) == json.dumps(again, sort_keys=True)
+    print(f"{args.pages} pages, {args.templates} distinct bodies of ~{args.words} words")
+    print(f"  no cache:     {uncached_time:.3f}s")
+    print(f"  first audit:  {first_time:.3f}s")
+    print(f"  re-audit:     {again_time:.3f}s")
+    print(f"  cache hits/misses: {cache.hits}/{cache.misses}; results identical: {same}")
+
+
+if __name__ == '__main__':
+    main()
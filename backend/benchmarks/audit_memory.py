@@ -0,0 +1,62 @@
+"""Peak and retained memory of an audit: batch (keep every page, then analyze) vs streaming.
+
+Usage (from backend/):  python -m benchmarks.audit_memory [--pages 200] [--words 2000]
+
+Streaming is what run_audit does by default: each page is analyzed as soon as
+it is crawled and only a compact record of it is kept. The broken link check
+is skipped here since it does not depend on the mode.
+"""
+import argparse
+import gc
+import tracemalloc
+from analyzer import SEOAnalyzer, StreamingSiteAnalysis
+from crawler import SEOCrawler
+from benchmarks.stub_server import start_stub_server
+
+
+def batch_audit(base_url, pages):
+    crawler = SEOCrawler(base_url + 'p/0', max_pages=pages, max_depth=10, max_per_host=8, requests_per_second=0)
+    for _ in crawler.iter_crawl():
+        pass
+    crawl_data = crawler.crawl_result()
+    return crawler, SEOAnalyzer(workers=0, cache=None).analyze_all_pages(crawl_data)
+
+
+def streaming_audit(base_url, pages):
+    crawler = SEOCrawler(base_url + 'p/0', max_pages=pages, max_depth=10, max_per_host=8, requests_per_second=0,
+                         keep_page_data=False)
+    site_analysis = StreamingSiteAnalysis(SEOAnalyzer(workers=0, cache=None))
+    for page_data in crawler.iter_crawl():
+        site_analysis.add_page(page_data)
+    return crawler, site_analysis.finish(crawler.crawl_result())
+
+
+def measure(audit, base_url, pages):
+    gc.collect()
+    tracemalloc.start()
+    result = audit(base_url, pages)
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak / 2 ** 20, retained / 2 ** 20
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pages', type=int, default=200)
+    parser.add_argument('--words', type=int, default=2000)
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(total_pages=args.pages * 2, fanout=10, words=args.words)
+    streaming_audit(base_url, 8)  # warm imports and lexicons outside the measurements
+
+    print(f"{args.pages} pages of ~{args.words} words")
+    for name, audit in (('batch', batch_audit), ('streaming', streaming_audit)):
+        peak, retained = measure(audit, base_url, args.pages)
+        print(f"  {name:<10} peak {peak:7.1f} MB   retained with result {retained:7.1f} MB")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
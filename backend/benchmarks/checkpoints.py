@@ -0,0 +1,87 @@
+"""Cost of crawl checkpoints, and pages refetched when an interrupted audit is resumed.
+
+Usage (from backend/):  python -m benchmarks.checkpoints [--pages 300] [--every 25] [--interrupt-at 150]
+
+Runs a streaming audit of a synthetic site without checkpoints, with
+checkpoints every --every pages, and once more interrupted after
+--interrupt-at pages and resumed from its checkpoint (in a fresh crawler, as
+after a restart). Only the pages crawled since the last checkpoint are fetched
+twice; the resumed audit must match the uninterrupted one.
+"""
+import argparse
+import os
+import tempfile
+import time
+from crawler import SEOCrawler
+from analyzer import SEOAnalyzer, StreamingSiteAnalysis
+from checkpoints import CheckpointStore, CrawlCheckpointer
+from benchmarks.stub_server import start_stub_server
+
+
+class Interrupted(Exception):
+    pass
+
+
+def disk_size(path):
+    return sum(os.path.getsize(p) for p in (path, path + '-wal') if os.path.exists(p))
+
+
+def audit(base_url, pages, store=None, checkpoint_id=None, every=25, resume=False, interrupt_at=None):
+    """Streaming audit; returns (seconds, pages fetched, summary)"""
+    crawler = SEOCrawler(base_url, max_pages=pages, max_depth=20, max_per_host=8, requests_per_second=0,
+                         max_links_per_page=0, keep_page_data=False, use_sitemaps=False)
+    site = StreamingSiteAnalysis(SEOAnalyzer(workers=0, cache=None))
+    if store:
+        crawler.checkpointer = CrawlCheckpointer(store, checkpoint_id, site, every_pages=every, every_seconds=3600)
+        if resume:
+            crawler.checkpointer.restore(crawler)
+
+    fetched = 0
+    start = time.perf_counter()
+    for page_data in crawler.iter_crawl():
+        fetched += 1
+        if interrupt_at is not None and len(crawler.pages_data) > interrupt_at:
+            raise Interrupted(fetched)
+        site.add_page(page_data)
+    crawler.check_broken_links()
+    summary = site.finish(crawler.crawl_result())['summary']
+    return time.perf_counter() - start, fetched, summary
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pages', type=int, default=300)
+    parser.add_argument('--every', type=int, default=25)
+    parser.add_argument('--interrupt-at', type=int, default=150)
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(total_pages=args.pages, fanout=4, words=200)
+    base_url += 'p/0'
+    audit(base_url, 5)  # warm up the text libraries
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'checkpoints.db')
+        store = CheckpointStore(path)
+
+        elapsed, fetched, expected = audit(base_url, args.pages)
+        print(f"no checkpoints            {fetched} pages in {elapsed:.2f}s")
+
+        checkpoint_id = store.create(base_url, {})
+        elapsed, fetched, summary = audit(base_url, args.pages, store, checkpoint_id, args.every)
+        print(f"checkpoint every {args.every:<4}     {fetched} pages in {elapsed:.2f}s  "
+              f"({disk_size(path) / 1024:.0f} KB on disk, same result: {summary == expected})")
+
+        checkpoint_id = store.create(base_url, {})
+        try:
+            audit(base_url, args.pages, store, checkpoint_id, args.every, interrupt_at=args.interrupt_at)
+        except Interrupted as e:
+            before = e.args[0]
+        saved = store.get(checkpoint_id)['pages_crawled']
+        elapsed, fetched, summary = audit(base_url, args.pages, store, checkpoint_id, args.every, resume=True)
+        print(f"interrupted after {before}, resumed from {saved}: {fetched} more pages in {elapsed:.2f}s  "
+              f"({before + fetched - args.pages} refetched, same result: {summary == expected})")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Micro-benchmark of SEOCrawler.crawl loop overhead on a large synthetic site.
+
+Usage (from backend/):  python -m benchmarks.crawl_loop [--pages 10000]
+
+Crawls the stub site end to end, then replays the same crawl order through
+the frontier and through the old "rebuild a normalized list per dequeue"
+duplicate check to isolate the bookkeeping cost from network time.
+"""
+import argparse
+import contextlib
+import io
+import time
+from crawler import SEOCrawler, normalize_url
+from frontier import CrawlFrontier
+from benchmarks.stub_server import start_stub_server
+
+
+def legacy_duplicate_scan(urls):
+    pages = []
+    for url in urls:
+        normalized = normalize_url.__wrapped__(url)
+        if normalized in [normalize_url.__wrapped__(p['url']) for p in pages]:
+            continue
+        pages.append({'url': url})
+
+
+def frontier_duplicate_scan(urls):
+    frontier = CrawlFrontier(normalize_url)
+    for url in urls:
+        frontier.add(url, 0)
+    while frontier:
+        url, _ = frontier.pop()
+        frontier.claim(url)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pages', type=int, default=10000)
+    parser.add_argument('--fanout', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(args.pages, args.fanout)
+    crawler = SEOCrawler(base_url, max_pages=args.pages, max_depth=10, max_workers=args.workers,
+                         max_per_host=args.workers, requests_per_second=0)
+    crawler.check_broken_links = lambda: None
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = crawler.crawl()
+    crawl_time = time.perf_counter() - start
+    server.shutdown()
+
+    urls = [p['url'] for p in result['pages']]
+    print(f"Crawled {len(urls)} pages in {crawl_time:.2f}s ({len(urls) / crawl_time:.0f} pages/s)")
+
+    start = time.perf_counter()
+    frontier_duplicate_scan(urls)
+    print(f"Frontier bookkeeping:      {(time.perf_counter() - start) * 1000:9.1f} ms")
+
+    # The legacy scan is quadratic; cap it so the benchmark finishes
+    sample = urls[:min(len(urls), 1000)]
+    start = time.perf_counter()
+    legacy_duplicate_scan(sample)
+    legacy = time.perf_counter() - start
+    estimate = legacy * (len(urls) / len(sample)) ** 2
+    print(f"Legacy list scan ({len(sample)} pages): {legacy * 1000:9.1f} ms "
+          f"(~{estimate:.1f}s extrapolated to {len(urls)} pages)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""Single-process audit vs a distributed crawl with several local worker processes.
+
+Usage (from backend/):  python -m benchmarks.distributed_crawl [--pages 200] [--workers 1 2 4] [--latency 0.02]
+
+Each run crawls the same synthetic site; the distributed runs share a fresh
+SQLite frontier in a temporary directory and must crawl every page exactly
+once (checked against the single-process crawl) with the same site summary.
+"""
+import argparse
+import os
+import tempfile
+import time
+from crawler import SEOCrawler
+from analyzer import SEOAnalyzer, StreamingSiteAnalysis
+from distributed import run_distributed_crawl
+from benchmarks.stub_server import start_stub_server
+
+# No broken link check (max_links_per_page=0): it is rate limited and runs once at the end either way
+SETTINGS = dict(max_depth=10, max_workers=4, max_per_host=16, requests_per_second=0, use_sitemaps=False,
+                max_links_per_page=0)
+
+
+def single_process_audit(base_url, pages):
+    crawler = SEOCrawler(base_url, max_pages=pages, frontier_type='fifo', keep_page_data=False, **SETTINGS)
+    site = StreamingSiteAnalysis(SEOAnalyzer(workers=0))
+    start = time.perf_counter()
+    for page_data in crawler.iter_crawl():
+        site.add_page(page_data)
+    crawler.check_broken_links()
+    crawl_data = crawler.crawl_result()
+    analysis = site.finish(crawl_data)
+    return time.perf_counter() - start, crawl_data, analysis
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pages', type=int, default=200)
+    parser.add_argument('--fanout', type=int, default=4)
+    parser.add_argument('--words', type=int, default=300)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--latency', type=float, default=0.02)
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(total_pages=args.pages, fanout=args.fanout, words=args.words,
+                                         latency=args.latency)
+    base_url += 'p/0'
+
+    # First use of the text/NLP libraries is slow; keep it out of the timings (every worker process pays it too)
+    warmup_server, warmup_url = start_stub_server(total_pages=3, fanout=2, words=50)
+    single_process_audit(warmup_url + 'p/0', 3)
+    warmup_server.shutdown()
+    print(f"{args.pages}-page site, {args.words} words per page, {args.latency * 1000:.0f} ms per response")
+
+    elapsed, crawl_data, analysis = single_process_audit(base_url, args.pages)
+    expected_urls = sorted(page['url'] for page in crawl_data['pages'])
+    print(f"  single process      {crawl_data['total_pages_crawled']} pages in {elapsed:.2f}s")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for workers in args.workers:
+            start = time.perf_counter()
+            _, dist_crawl, dist_analysis = run_distributed_crawl(
+                base_url, workers=workers, db_path=os.path.join(tmp, f'crawl-{workers}.db'),
+                max_pages=args.pages, **SETTINGS
+            )
+            elapsed = time.perf_counter() - start
+            urls = sorted(page['url'] for page in dist_crawl['pages'])
+            same = urls == expected_urls and dist_analysis['summary'] == analysis['summary']
+            print(f"  {workers} worker processes  {dist_crawl['total_pages_crawled']} pages in {elapsed:.2f}s"
+                  f"  (matches single process: {same})")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
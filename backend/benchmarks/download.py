@@ -0,0 +1,68 @@
+"""Peak memory of fetching one oversized page: full response.text vs streamed, bounded read_html.
+
+Usage (from backend/):  python -m benchmarks.download [--mb 50] [--limit-mb 5]
+"""
+import argparse
+import threading
+import tracemalloc
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from download import read_html
+from transport import create_session
+
+
+def start_big_page_server(size):
+    body = (b'<html><head><title>Huge</title></head><body>'
+            + b'<p>lorem ipsum dolor sit amet</p>' * (size // 32) + b'</body></html>')
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except ConnectionError:
+                pass  # the bounded reader hangs up once it has enough
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/huge.html"
+
+
+def peak_mb(fetch):
+    tracemalloc.start()
+    fetch()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 2 ** 20
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--mb', type=int, default=50)
+    parser.add_argument('--limit-mb', type=int, default=5)
+    args = parser.parse_args()
+
+    server, url = start_big_page_server(args.mb * 2 ** 20)
+    session = create_session()
+
+    def full():
+        return session.get(url, timeout=30).text
+
+    def bounded():
+        with session.get(url, timeout=30, stream=True) as response:
+            return read_html(response, args.limit_mb * 2 ** 20)
+
+    print(f"{args.mb} MB page")
+    print(f"  response.text:           peak {peak_mb(full):7.1f} MB")
+    print(f"  read_html ({args.limit_mb} MB limit):  peak {peak_mb(bounded):7.1f} MB")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""Parity check and CPU benchmark for the HTML extraction backends.
+
+Usage (from backend/):
+    python -m benchmarks.extraction                      # built-in synthetic corpus
+    python -m benchmarks.extraction --corpus saved_pages/  # directory of saved .html files
+
+Every page is extracted with both the BeautifulSoup reference backend and
+the lxml backend; any field that differs is reported and the exit status is
+non-zero, so the script doubles as the parity suite.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from crawler import SEOCrawler
+
+EDGE_CASES = [
+    '<html><head><title>A &amp; B</title></head><body><p>x</p></body></html>',
+    '<title>  Spaced title  </title><h1>Top <script>var a = 1;</script>level</h1>',
+    '<meta name="description" content="  first  "><meta name="description" content="second">',
+    '<meta property="og:title" content="T"><meta property="og:title" content="T2"><meta name="twitter:card">',
+    '<link rel="alternate canonical" href="/canon"><link rel="canonical" href="/other">',
+    '<a href="">empty</a><a>no href</a><a href="/x"><img src="i.png" alt="">  text </a>',
+    '<body>line one\n\n   line   two&nbsp;&nbsp;three<noscript>hidden</noscript><style>p{}</style></body>',
+    '<ul><li><a href="/a">A<li><a href="/b">B</ul>',
+    '<!DOCTYPE html><html><body><!-- comment --><p>Visible</p><meta name="robots" content="noindex"></body></html>',
+    '<body><p>Visible</p><template><p>Inert <template>nested</template> words</p><a href="/t">T</a>'
+    '<img src="t.png"><h2>TH</h2><meta name="description" content="x"></template><a href="/v">After</a></body>',
+    '<a href="/first" href="/second">x</a><img src="a.png" alt="" ALT="Alt">'
+    '<meta name="description" content="one" content="two"><link rel="canonical" href="/a" href="/b">',
+    '<a class="x" class="y" href="/single">No duplicate extracted attribute</a>',
+    # Raw text to libxml2, markup to html.parser: extracted with BeautifulSoup
+    '<html><head><title>One <!-- c --> Two</title></head><body></body></html>',
+    '<title>A<b>B</b></title><p>Body</p>',
+    '<body><textarea><a href="/in">Link</a> <b>bold</b></textarea><p>Visible</p></body>',
+    '<body><iframe><h1>Fallback</h1><a href="/frame">Frame</a></iframe><p>Visible</p></body>',
+    '<title>Plain & simple</title><textarea>a &lt; b</textarea><iframe src="/f"></iframe>',
+]
+
+# Malformed markup where the two parsers legitimately build different trees.
+# Reported for information only; they do not count as parity failures.
+KNOWN_DIVERGENCES = [
+    # libxml2 closes an open heading at <p>; html.parser keeps nesting
+    '<h2>Unclosed heading<p>body text',
+    # libxml2 closes an open <a> at the next <a> (as browsers do); html.parser nests them, so the outer
+    # link's text differs. Links and page text are the same
+    '<body><a href="/outer">Outer <a href="/inner">Inner</a> tail</a> after</body>',
+]
+
+
+def synthetic_corpus(count=200, words=800):
+    vocabulary = ('search engine optimization content page quality ranking keyword '
+                  'structure heading image link crawl audit metadata').split()
+    pages = []
+    for n in range(count):
+        body = []
+        for section in range(8):
+            text = ' '.join(vocabulary[(n + section + i) % len(vocabulary)] for i in range(words // 8))
+            body.append(f'<h{section % 3 + 2}>Section {section}</h{section % 3 + 2}><p>{text}.</p>')
+            body.append(''.join(f'<a href="/page/{n}/{k}">Link {k}</a> ' for k in range(5)))
+            body.append(f'<img src="/img/{n}-{section}.png" alt="{"Image" if section % 2 else ""}">')
+        pages.append(
+            f'<!DOCTYPE html><html><head><title>Synthetic page {n}</title>'
+            f'<meta name="description" content="Description for page {n}">'
+            f'<meta property="og:title" content="Page {n}"><link rel="canonical" href="/page/{n}">'
+            f'<script>window.data = {{"n": {n}}};</script><style>body {{ color: red; }}</style></head>'
+            f'<body><nav><a href="/">Home</a> | <a href="/about">About</a></nav><h1>Page {n}</h1>'
+            f'{"".join(body)}<footer>&copy; Example</footer></body></html>'
+        )
+    return pages
+
+
+def load_corpus(path):
+    pages = []
+    for filename in sorted(glob.glob(os.path.join(path, '**', '*.htm*'), recursive=True)):
+        with open(filename, encoding='utf-8', errors='replace') as f:
+            pages.append(f.read())
+    return pages
+
+
+def time_backend(parser, pages, url):
+    crawler = SEOCrawler(url, parser=parser)
+    start = time.process_time()
+    results = [crawler.extract_page_data(url, html) for html in pages]
+    return results, time.process_time() - start
+
+
+def main():
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument('--corpus', help='directory of saved HTML pages')
+    args = argparser.parse_args()
+
+    url = 'https://example.com/page/'
+    pages = load_corpus(args.corpus) if args.corpus else synthetic_corpus()
+    pages = EDGE_CASES + pages
+
+    reference, bs4_time = time_backend('bs4', pages, url)
+    candidate, lxml_time = time_backend('lxml', pages, url)
+
+    mismatches = 0
+    for i, (expected, actual) in enumerate(zip(reference, candidate)):
+        fields = [key for key in expected if expected[key] != actual.get(key)]
+        if fields:
+            mismatches += 1
+            print(f"Page {i}: mismatched fields {fields}")
+
+    known, _ = time_backend('bs4', KNOWN_DIVERGENCES, url)
+    known_lxml, _ = time_backend('lxml', KNOWN_DIVERGENCES, url)
+    diverging = sum(1 for a, b in zip(known, known_lxml) if a != b)
+    print(f"Known divergences on malformed markup: {diverging}/{len(KNOWN_DIVERGENCES)}")
+
+    print(f"Pages: {len(pages)}  parity mismatches: {mismatches}")
+    print(f"bs4:  {bs4_time / len(pages) * 1000:7.2f} ms CPU/page")
+    print(f"lxml: {lxml_time / len(pages) * 1000:7.2f} ms CPU/page "
+          f"({bs4_time / max(lxml_time, 1e-9):.1f}x faster)")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""Synthetic fixture sites of configurable size and shape, served from a local HTTP server.
+
+Usage (from backend/):  python -m benchmarks.fixture_site [--pages 200] [--fanout 5] [--port 8800] ...
+
+Page /p/<n> links to its children n*fanout+1 .. n*fanout+fanout (a tree that
+BFS crawls level by level), to one pseudo-random earlier page, to dead internal
+(404) and external (connection refused) URLs, and to external links (served by
+the same server under the name localhost, so nothing leaves the machine).
+Pages carry `words` words of body text and `images` images (a `missing_alt`
+fraction without alt text); a `slow_fraction` of pages answers after
+`slow_latency` seconds.
+Everything is derived from the seed, so a spec always produces the same site.
+"""
+import argparse
+import random
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from benchmarks.stub_server import VOCABULARY
+
+# Nothing listens on the discard port, so links to it fail fast with "connection refused"
+DEAD_HOST = 'http://127.0.0.1:9'
+
+
+class SiteSpec:
+    """Shape of a synthetic site"""
+
+    def __init__(self, pages=100, fanout=5, words=400, images=4, missing_alt=0.25, dead_links=0,
+                 external_links=2, slow_fraction=0.0, slow_latency=0.5, latency=0.0, seed=1):
+        self.pages = pages
+        self.fanout = fanout
+        self.words = words
+        self.images = images
+        self.missing_alt = missing_alt
+        self.dead_links = dead_links          # per page, alternating internal 404s and unreachable hosts
+        self.external_links = external_links  # per page, to a handful of distinct external URLs
+        self.slow_fraction = slow_fraction
+        self.slow_latency = slow_latency
+        self.latency = latency                # added to every response
+        self.seed = seed
+
+    def to_dict(self):
+        return dict(vars(self))
+
+    def page_latency(self, n):
+        rng = random.Random(self.seed * 7919 + n)
+        return self.latency + (self.slow_latency if rng.random() < self.slow_fraction else 0)
+
+    def render_page(self, n, external_base):
+        """HTML of page n; external links point at external_base (another host name for the same server)"""
+        rng = random.Random(self.seed * 104729 + n)
+        title = ' '.join(rng.choice(VOCABULARY).title() for _ in range(rng.randint(2, 9)))
+        description = (' '.join(rng.choice(VOCABULARY) for _ in range(rng.randint(10, 28)))
+                       if rng.random() < 0.8 else '')
+
+        paragraphs = []
+        words = [rng.choice(VOCABULARY) for _ in range(self.words)]
+        for start in range(0, len(words), 60):
+            sentence_words = words[start:start + 60]
+            text = ' '.join(w + ('.' if i % 12 == 11 else '') for i, w in enumerate(sentence_words))
+            paragraphs.append(f'<p>{text.capitalize()}.</p>')
+            if start and start % 240 == 0:
+                paragraphs.append(f'<h2>{rng.choice(VOCABULARY).title()} {rng.choice(VOCABULARY)}</h2>')
+
+        images = []
+        for i in range(self.images):
+            alt = '' if rng.random() < self.missing_alt else f' alt="{rng.choice(VOCABULARY)}"'
+            images.append(f'<img src="/img/{n}-{i}.png"{alt}>')
+
+        links = [(f'/p/{c}', f'Page {c}') for c in range(n * self.fanout + 1, n * self.fanout + self.fanout + 1)
+                 if c < self.pages]
+        if n:
+            back = rng.randrange(n)
+            links.append((f'/p/{back}', f'Page {back}'))
+        for k in range(self.dead_links):
+            links.append((f'/missing/{n}-{k}' if k % 2 == 0 else f'{DEAD_HOST}/dead/{n}-{k}', 'Dead link'))
+        for k in range(self.external_links):
+            links.append((f'{external_base}/ref/{rng.randrange(20)}', 'Reference'))
+        anchors = ''.join(f'<a href="{href}">{text}</a> ' for href, text in links)
+
+        return (f'<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>{title}</title>'
+                + (f'<meta name="description" content="{description}">' if description else '')
+                + f'<link rel="canonical" href="/p/{n}"></head>'
+                f'<body><h1>{title}</h1>{"".join(paragraphs)}{"".join(images)}<nav>{anchors}</nav></body></html>')
+
+
+def make_handler(spec):
+    class FixtureHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            path = self.path.split('?', 1)[0].rstrip('/') or '/p/0'
+            if path.startswith('/p/'):
+                try:
+                    n = int(path[3:])
+                except ValueError:
+                    n = spec.pages
+                if n < spec.pages:
+                    delay = spec.page_latency(n)
+                    if delay:
+                        time.sleep(delay)
+                    body = spec.render_page(n, self.external_base()).encode('utf-8')
+                    return self.send_body(200, 'text/html; charset=utf-8', body)
+            elif path.startswith('/ref/'):
+                return self.send_body(200, 'text/html', b'<html><body>Reference</body></html>')
+            elif path.startswith('/img/'):
+                return self.send_body(200, 'image/png', b'\x89PNG\r\n\x1a\n')
+            elif path == '/robots.txt':
+                return self.send_body(200, 'text/plain', b'User-agent: *\nAllow: /\n')
+            self.send_body(404, 'text/html', b'<html><body>Not found</body></html>')
+
+        do_HEAD = do_GET
+
+        def external_base(self):
+            # "localhost" is a different host to the crawler than 127.0.0.1, but stays on this machine
+            return f"http://localhost:{self.server.server_address[1]}"
+
+        def send_body(self, status, content_type, body):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            if self.command != 'HEAD':
+                self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return FixtureHandler
+
+
+def start_fixture_server(spec, port=0):
+    """Serve a SiteSpec on 127.0.0.1 (a free port by default); returns (server, start_url)"""
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(spec))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/p/0"
+
+
+def add_spec_arguments(parser):
+    """Command-line options for every SiteSpec field (unset options keep the spec's defaults)"""
+    for name, value in SiteSpec().to_dict().items():
+        parser.add_argument('--' + name.replace('_', '-'), type=type(value), default=None,
+                            help=f'default: {value}')
+
+
+def spec_overrides(args):
+    return {name: value for name, value in vars(args).items()
+            if name in SiteSpec().to_dict() and value is not None}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a synthetic fixture site')
+    parser.add_argument('--port', type=int, default=8800)
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+
+    server, start_url = start_fixture_server(SiteSpec(**spec_overrides(args)), port=args.port)
+    print(f"Serving fixture site at {start_url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
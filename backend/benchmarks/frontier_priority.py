@@ -0,0 +1,76 @@
+"""FIFO vs priority frontier: what a small page budget covers on a template-heavy shop site.
+
+Usage (from backend/):  python -m benchmarks.frontier_priority [--budget 25]
+
+Every page carries the same footer links; categories link to long paginated
+listings and to hundreds of product pages. Reports how many distinct URL
+patterns (templates) the budget reaches and how much of it goes to the
+single most repeated pattern.
+"""
+import argparse
+import threading
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from crawler import SEOCrawler
+from frontier import url_pattern
+
+CATEGORIES = ['shoes', 'shirts', 'bags', 'hats', 'socks']
+FOOTER = ['/about', '/contact', '/terms', '/privacy', '/shipping', '/returns']
+
+
+def page_links(path):
+    """Links on each page of the fixture shop (footer first, as in most templates)"""
+    links = list(FOOTER)
+    if path == '/':
+        links += [f'/category/{c}' for c in CATEGORIES] + ['/blog']
+    elif path.startswith('/category/'):
+        category = path.split('/')[2]
+        links += [f'/category/{category}/page/{n}' for n in range(2, 40)]
+        links += [f'/product/{CATEGORIES.index(category) * 100 + n}' for n in range(100)]
+    elif path == '/blog':
+        links += [f'/blog/post-{n}' for n in range(20)]
+    return links
+
+
+def start_shop_server():
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            links = ''.join(f'<a href="{link}">{link}</a>' for link in page_links(self.path))
+            body = f'<html><head><title>{self.path}</title></head><body><h1>{self.path}</h1>{links}</body></html>'
+            body = body.encode('utf-8')
+            self.send_response(200 if self.path != '/robots.txt' and self.path != '/sitemap.xml' else 404)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--budget', type=int, default=25)
+    args = parser.parse_args()
+
+    server, base_url = start_shop_server()
+
+    print(f"Page budget: {args.budget}")
+    for frontier_type in ('fifo', 'priority'):
+        crawler = SEOCrawler(base_url, max_pages=args.budget, max_depth=3, requests_per_second=0,
+                             max_per_host=4, frontier_type=frontier_type)
+        paths = ['/' + page['url'].split('/', 3)[3] for page in crawler.iter_crawl()]
+        patterns = Counter(url_pattern(base_url + path.lstrip('/')) for path in paths)
+        pattern, repeats = patterns.most_common(1)[0]
+        print(f"  {frontier_type:<9} {len(patterns):>3} distinct URL patterns; "
+              f"most repeated: {repeats} pages of {pattern.split('/', 1)[1]}")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Overhead of profiling an audit with the sampling profiler.
+
+Usage (from backend/):  python -m benchmarks.profiler [--pages 100] [--repeat 3] [--interval-ms 5]
+
+Audits a fixture site through /api/audit with and without profiling
+("profile": true) and reports the median audit time of each, the number of
+stack samples taken and the hottest functions of the profiled run.
+"""
+import argparse
+import os
+import statistics
+import time
+from benchmarks.fixture_site import SiteSpec, start_fixture_server
+from benchmarks.suite import configure_environment, clear_caches
+
+
+def audit(client, start_url, pages, profile):
+    clear_caches()
+    start = time.perf_counter()
+    response = client.post('/api/audit', json={'url': start_url, 'max_pages': pages, 'max_depth': 10,
+                                                'profile': profile},
+                           headers={'X-Admin-Token': os.environ['ADMIN_TOKEN']})
+    if response.status_code != 200:
+        raise RuntimeError(f"Audit failed: {response.get_json()}")
+    return time.perf_counter() - start, response.get_json()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pages', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--interval-ms', type=float, default=5)
+    args = parser.parse_args()
+
+    configure_environment(polite=False)
+    os.environ['ADMIN_TOKEN'] = 'benchmark'
+    os.environ['PROFILE_INTERVAL_MS'] = str(args.interval_ms)
+    import app
+    client = app.app.test_client()
+
+    server, start_url = start_fixture_server(SiteSpec(pages=args.pages, fanout=5, words=600))
+    audit(client, start_url, 5, False)  # warm up the text libraries
+
+    plain, profiled = [], []
+    for _ in range(args.repeat):
+        plain.append(audit(client, start_url, args.pages, False)[0])
+        elapsed, result = audit(client, start_url, args.pages, True)
+        profiled.append(elapsed)
+    server.shutdown()
+
+    summary = client.get(result['profile_url'], headers={'X-Admin-Token': 'benchmark'}).get_json()
+    base, with_profiler = statistics.median(plain), statistics.median(profiled)
+    print(f"without profiler  {base:.2f}s")
+    print(f"with profiler     {with_profiler:.2f}s  ({(with_profiler - base) / base:+.1%}, "
+          f"{summary['samples']} samples over {summary['ticks']} ticks of {args.interval_ms} ms)")
+    print("hottest functions (inclusive seconds, summed over threads):")
+    for function in summary['functions'][:10]:
+        print(f"  {function['total_seconds']:7.3f}s  {function['function']} (line {function['line']})")
+
+
+if __name__ == '__main__':
+    main()
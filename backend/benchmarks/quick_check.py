@@ -0,0 +1,93 @@
+"""Quick-check latency: the full single-page crawl against the fast path.
+
+Usage (from backend/):  python -m benchmarks.quick_check [--requests 40] [--words 1500] [--latency-ms 20]
+
+Checks different pages of a fixture site (each with dead links) and reports
+p50/p95 response times of:
+
+    fetch only    a bare GET of the page: the round-trip floor
+    full crawl    what /api/quick-check used to do (SEOCrawler.crawl with its
+                  link checks, then the full analyze_page)
+    fast path     /api/quick-check, text metrics in the background
+    inline        /api/quick-check with "content_metrics": "inline"
+
+For the fast path it also reports how long until the deferred text metrics
+are available from /api/quick-check/<check_id>. Caches are cleared before
+every check.
+"""
+import argparse
+import statistics
+import time
+from benchmarks.fixture_site import SiteSpec, start_fixture_server
+from benchmarks.suite import configure_environment, clear_caches
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    return statistics.median(ordered), ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=40)
+    parser.add_argument('--words', type=int, default=1500)
+    parser.add_argument('--latency-ms', type=float, default=20)
+    args = parser.parse_args()
+
+    configure_environment(polite=False)
+    import app
+    from analyzer import SEOAnalyzer, warm_up_analysis
+    from crawler import SEOCrawler
+    from transport import get_session
+    client = app.app.test_client()
+
+    spec = SiteSpec(pages=args.requests, fanout=8, words=args.words, dead_links=4, latency=args.latency_ms / 1000)
+    server, start_url = start_fixture_server(spec)
+    base = start_url.rsplit('/', 1)[0]
+    urls = [f'{base}/{n}' for n in range(args.requests)]
+    warm_up_analysis(SEOAnalyzer(cache=None))
+
+    def fetch_only(url):
+        get_session().get(url, timeout=10).content
+
+    def full_crawl(url):
+        crawl_data = SEOCrawler(url, max_pages=1, max_depth=0).crawl()
+        analyzer = SEOAnalyzer()
+        analysis = analyzer.analyze_page(crawl_data['pages'][0])
+        analysis['overall_score'] = analyzer.calculate_overall_score(analysis)
+
+    completion = []
+
+    def fast_path(url, content_metrics='background'):
+        start = time.perf_counter()
+        result = client.post('/api/quick-check', json={'url': url, 'content_metrics': content_metrics}).get_json()
+        elapsed = time.perf_counter() - start
+        if 'result_url' in result:
+            # Let the background analysis finish so it does not overlap the next check
+            while client.get(result['result_url']).status_code == 409:
+                time.sleep(0.002)
+            completion.append(time.perf_counter() - start)
+        return elapsed
+
+    modes = [
+        ('fetch only', fetch_only),
+        ('full crawl', full_crawl),
+        ('fast path', fast_path),
+        ('inline', lambda url: fast_path(url, 'inline')),
+    ]
+    for name, check in modes:
+        samples = []
+        for url in urls:
+            clear_caches()
+            start = time.perf_counter()
+            elapsed = check(url)
+            samples.append(elapsed if elapsed is not None else time.perf_counter() - start)
+        p50, p95 = percentiles(samples)
+        print(f"{name:<12} p50 {p50 * 1000:8.1f} ms   p95 {p95 * 1000:8.1f} ms")
+    p50, p95 = percentiles(completion)
+    print(f"{'  metrics':<12} p50 {p50 * 1000:8.1f} ms   p95 {p95 * 1000:8.1f} ms   (fast path until text metrics are ready)")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Speed and parity of the lexicon sentiment backend against TextBlob.
+
+Usage (from backend/):  python -m benchmarks.sentiment [--pages 300] [--long-words 50000]
+
+Scores synthetic pages (lexicon words mixed with negations, intensifiers,
+contractions, quotes, punctuation and emoticons) with TextBlob and with the
+lexicon backend, and reports time per page and how many polarities differ.
+Then compares a very long page scored in full with the sampled score used
+above SENTIMENT_MAX_WORDS, and times a cache hit.
+"""
+import argparse
+import random
+import time
+from sentiment import LexiconSentiment, TextBlobSentiment, SentimentAnalyzer, SentimentCache, get_lexicon
+
+FILLER = ("the a of to and is it was this that site page our we you they content with for on very really "
+          "not no never don't isn't can't won't (!) :) :-( XD ! ... e.g. Mr. U.S. \"quoted\" 'single' it's "
+          "we're I'd (great) [bad] good, bad. nice! 1998) <3 following: (a)").split()
+
+
+def make_page(words, rng, lexicon_words):
+    tokens = []
+    for _ in range(words):
+        word = rng.choice(lexicon_words) if rng.random() < 0.3 else rng.choice(FILLER)
+        if rng.random() < 0.1:
+            word = word.capitalize()
+        if rng.random() < 0.08:
+            word += rng.choice(['.', ',', '!', '?', '...', ')', '"', "'s", "n't"])
+        tokens.append(word)
+    return ' '.join(tokens)
+
+
+def tone(polarity):
+    return 'Positive' if polarity > 0.1 else 'Negative' if polarity < -0.1 else 'Neutral'
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pages', type=int, default=300)
+    parser.add_argument('--long-words', type=int, default=50000)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    lexicon_words = sorted(get_lexicon())
+    pages = [make_page(rng.choice([30, 300, 1000, 3000]), rng, lexicon_words) for _ in range(args.pages)]
+    textblob, lexicon = TextBlobSentiment(), LexiconSentiment()
+    textblob.polarity('Warm up the sentiment lexicon.')
+    lexicon.polarity('Warm up the sentiment lexicon.')
+
+    timings, scores = {}, {}
+    for backend in (textblob, lexicon):
+        start = time.perf_counter()
+        scores[backend.name] = [backend.polarity(page) for page in pages]
+        timings[backend.name] = (time.perf_counter() - start) / len(pages)
+    differ = sum(abs(a - b) > 1e-9 for a, b in zip(scores['textblob'], scores['lexicon']))
+    tones = sum(tone(a) != tone(b) for a, b in zip(scores['textblob'], scores['lexicon']))
+    print(f"{len(pages)} pages, {sum(len(p.split()) for p in pages) // len(pages)} words on average")
+    print(f"  textblob  {timings['textblob'] * 1000:8.2f} ms/page")
+    print(f"  lexicon   {timings['lexicon'] * 1000:8.2f} ms/page  ({timings['textblob'] / timings['lexicon']:.1f}x faster, "
+          f"{differ} polarities and {tones} tones differ)")
+
+    page = make_page(args.long_words, rng, lexicon_words)
+    for name, max_words in (('full', 0), ('sampled', None)):
+        analyzer = SentimentAnalyzer('lexicon', max_words=max_words, cache=None)
+        start = time.perf_counter()
+        polarity = analyzer.polarity(page)
+        print(f"{args.long_words}-word page, {name:<8} {(time.perf_counter() - start) * 1000:8.1f} ms  "
+              f"polarity {polarity:+.4f}")
+
+    analyzer = SentimentAnalyzer('lexicon', cache=SentimentCache())
+    analyzer.polarity(pages[0])
+    start = time.perf_counter()
+    for _ in range(100):
+        analyzer.polarity(pages[0])
+    print(f"cache hit ({len(pages[0].split())} words) {(time.perf_counter() - start) * 10:8.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""Server start-up time: process start to the first /health and the first /api/quick-check.
+
+Usage (from backend/):  python -m benchmarks.startup [--runs 3] [--modes eager lazy gunicorn gunicorn-cold]
+
+    eager          Flask dev server, importing up front what the app used to import eagerly
+                   (scikit-learn, textstat, textblob, reportlab, bs4), as before lazy imports
+    lazy           Flask dev server, heavy dependencies imported on first use
+    gunicorn       gunicorn.conf.py: app preloaded and warmed up in the master, workers forked from it
+    gunicorn-cold  the same without the warm-up (WARM_UP=0)
+
+For the gunicorn modes the worker is then killed and the time for the master
+to fork a replacement and serve /health and /api/quick-check again is reported
+(the case warm-up in the master speeds up). The quick check audits a page of a
+local fixture site. Each mode runs in fresh processes with temporary stores.
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from benchmarks.fixture_site import SiteSpec, start_fixture_server
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+EAGER_IMPORTS = ('import sklearn.feature_extraction.text, textstat, textblob, reportlab.platypus, bs4; '
+                 'from textblob import TextBlob; import pyphen; pyphen.Pyphen(lang="en_US")')
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def command(mode, port):
+    if mode.startswith('gunicorn'):
+        return [sys.executable, '-m', 'gunicorn', 'app:app', '--config', 'gunicorn.conf.py',
+                '--bind', f'127.0.0.1:{port}', '--log-level', 'warning']
+    preload = EAGER_IMPORTS + '; ' if mode == 'eager' else ''
+    return [sys.executable, '-c', f'{preload}import app; app.app.run(port={port}, threaded=True)']
+
+
+def request(url, data=None, timeout=120):
+    body = json.dumps(data).encode('utf-8') if data is not None else None
+    req = urllib.request.Request(url, data=body, headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(req, timeout=timeout) as response:
+        response.read()
+        return response.status
+
+
+def wait_for_health(base, deadline=120):
+    start = time.perf_counter()
+    while time.perf_counter() - start < deadline:
+        try:
+            if request(base + '/health', timeout=deadline) == 200:
+                return
+        except OSError:
+            time.sleep(0.01)
+    raise RuntimeError('server did not become healthy')
+
+
+def worker_pids(master_pid):
+    pids = []
+    for entry in os.listdir('/proc'):
+        if entry.isdigit():
+            try:
+                with open(f'/proc/{entry}/stat') as f:
+                    if int(f.read().rsplit(')', 1)[1].split()[1]) == master_pid:
+                        pids.append(int(entry))
+            except (OSError, IndexError, ValueError):
+                pass
+    return pids
+
+
+def run(mode, target_url):
+    port = free_port()
+    base = f'http://127.0.0.1:{port}'
+    data_dir = tempfile.mkdtemp(prefix='seo-startup-')
+    env = dict(os.environ, AUDIT_DB_PATH=os.path.join(data_dir, 'audits.db'),
+               JOB_DB_PATH=os.path.join(data_dir, 'jobs.db'), PAGE_CACHE='0', CHECKPOINTS='0',
+               WARM_UP='0' if mode == 'gunicorn-cold' else '1')
+    timings = {}
+    start = time.perf_counter()
+    process = subprocess.Popen(command(mode, port), cwd=BACKEND_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_health(base)
+        timings['health'] = time.perf_counter() - start
+        request(base + '/api/quick-check', {'url': target_url})
+        timings['quick_check'] = time.perf_counter() - start
+
+        if mode.startswith('gunicorn') and os.path.isdir('/proc'):
+            # A replacement worker: forked from the (warm or cold) master
+            for pid in worker_pids(process.pid):
+                os.kill(pid, signal.SIGKILL)
+            restart = time.perf_counter()
+            wait_for_health(base)
+            timings['respawn_health'] = time.perf_counter() - restart
+            request(base + '/api/quick-check', {'url': target_url})
+            timings['respawn_quick_check'] = time.perf_counter() - restart
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--modes', nargs='+', default=['eager', 'lazy', 'gunicorn', 'gunicorn-cold'])
+    args = parser.parse_args()
+
+    server, start_url = start_fixture_server(SiteSpec(pages=5, words=400))
+    columns = ('health', 'quick_check', 'respawn_health', 'respawn_quick_check')
+    print(f"{'mode':<14}" + ''.join(f'{c:>21}' for c in columns) + '   (median seconds)')
+    for mode in args.modes:
+        runs = [run(mode, start_url) for _ in range(args.runs)]
+        cells = [statistics.median(r[c] for r in runs) if c in runs[0] else None for c in columns]
+        print(f'{mode:<14}' + ''.join(f'{c:21.2f}' if c is not None else f"{'-':>21}" for c in cells))
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Tiny in-process HTTP server that serves a synthetic site for benchmarks.
+
+Page /p/<n> links to pages n*fanout+1 .. n*fanout+fanout, so the site forms a
+tree that BFS crawls level by level. With words > 0 each page also carries
+that many words of body text; with sitemap=True the site also serves a
+/sitemap.xml listing every page; latency (seconds) delays every response.
+"""
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+VOCABULARY = ('search engine optimization content page quality ranking keyword structure heading '
+              'image link crawl audit metadata sitemap robots canonical snippet schema').split()
+
+
+def page_text(n, words):
+    return ' '.join(VOCABULARY[(n * 7 + i * (n % 5 + 1)) % len(VOCABULARY)] + ('.' if i % 12 == 11 else '')
+                    for i in range(words))
+
+
+def make_handler(total_pages, fanout, words=0, sitemap=False, latency=0):
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # keep-alive, so connection pooling is measurable
+        disable_nagle_algorithm = True  # headers and body are separate writes
+
+        def do_GET(self):
+            if latency:
+                time.sleep(latency)
+            if sitemap and self.path == '/sitemap.xml':
+                return self.send_sitemap()
+            try:
+                n = int(self.path.rstrip('/').rsplit('/', 1)[-1]) if self.path.startswith('/p/') else 0
+            except ValueError:
+                n = total_pages
+            if n >= total_pages:
+                self.send_response(404)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            children = [c for c in range(n * fanout + 1, n * fanout + fanout + 1) if c < total_pages]
+            links = ''.join(f'<a href="/p/{c}">Page {c}</a>' for c in children)
+            body = (f'<html><head><title>Page {n}</title></head>'
+                    f'<body><h1>Page {n}</h1><p>Synthetic content for page {n}.</p>'
+                    f'<p>{page_text(n, words)}</p>{links}'
+                    f'<a href="/p/{n}/">self</a></body></html>').encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            if self.command != 'HEAD':
+                self.wfile.write(body)
+
+        do_HEAD = do_GET
+
+        def send_sitemap(self):
+            host = self.headers.get('Host')
+            urls = ''.join(f'<url><loc>http://{host}/p/{n}</loc></url>' for n in range(total_pages))
+            body = ('<?xml version="1.0" encoding="UTF-8"?>'
+                    f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>').encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/xml')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            if self.command != 'HEAD':
+                self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+
+def start_stub_server(total_pages=10000, fanout=10, words=0, sitemap=False, latency=0):
+    """Start the stub site on a free port; returns (server, base_url)"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(total_pages, fanout, words, sitemap, latency))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
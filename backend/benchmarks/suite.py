@@ -0,0 +1,237 @@
+"""End-to-end audit benchmark suite over generated fixture sites, with per-stage timings.
+
+Usage (from backend/):
+    python -m benchmarks.suite [--scenario small medium ...] [--repeat 3] [--compare latest] [--threshold 0.15]
+    python -m benchmarks.suite --scenario custom --pages 500 --words 1200 --dead-links 4   # any SiteSpec field
+
+Each scenario serves a fixture site (benchmarks/fixture_site.py), runs
+POST /api/audit against it through the Flask test client, then exports the
+stored audit as PDF, CSV and JSON. Reported per scenario (median of --repeat runs),
+taken from the audit response's stage timings (metrics.py):
+
+    audit       wall time of the whole /api/audit request
+    fetch       page downloads (network, decoding)
+    parse       extract_page_data (HTML extraction)
+    analyze     analyze_page (per-page metrics)
+    keywords    site-wide TF-IDF keyword extraction
+    link_check  check_broken_links
+    summary     generate_site_summary plus AI advice
+    export_*    each export endpoint
+
+fetch, parse and analyze are summed over calls (fetches overlap on worker
+threads, so they can exceed the audit's wall time). Process-wide caches are
+cleared before every run and stores live in a temporary directory. The
+crawler's and link checker's politeness rate limits are lifted (--polite keeps
+them), so timings reflect the code rather than the throttle.
+
+Results are written to benchmarks/results/<timestamp>.json. --compare takes a
+results file (or "latest" for the newest one before this run) and flags every
+timing that got slower by more than --threshold; --fail-on-regression then
+exits with status 1.
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from benchmarks.fixture_site import SiteSpec, start_fixture_server, add_spec_arguments, spec_overrides
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+SCENARIOS = {
+    'small': dict(pages=20, fanout=4, words=300, images=3),
+    'medium': dict(pages=100, fanout=6, words=600, images=5, dead_links=1),
+    'large': dict(pages=300, fanout=8, words=900, images=8, dead_links=1),
+    'long-pages': dict(pages=40, fanout=4, words=5000, images=20),
+    'dead-links': dict(pages=60, fanout=5, words=300, dead_links=6),
+    'slow': dict(pages=60, fanout=5, words=300, slow_fraction=0.2, slow_latency=0.3),
+}
+
+# Audit stage timings (see metrics.StageTimings) summed into each reported stage
+STAGE_SOURCES = {
+    'fetch': ('fetch',),
+    'parse': ('parse',),
+    'analyze': ('analyze_page',),
+    'keywords': ('site_keywords',),
+    'link_check': ('link_check',),
+    'summary': ('summary', 'ai_advice'),
+}
+
+STAGES = ('audit', 'fetch', 'parse', 'analyze', 'keywords', 'link_check', 'summary',
+          'export_pdf', 'export_csv', 'export_json')
+
+
+def configure_environment(polite):
+    """Isolated stores (and no rate limits) for the app, set before it is imported"""
+    data_dir = tempfile.mkdtemp(prefix='seo-benchmark-')
+    os.environ['AUDIT_DB_PATH'] = os.path.join(data_dir, 'audits.db')
+    os.environ['CHECKPOINT_PATH'] = os.path.join(data_dir, 'checkpoints.db')
+    os.environ['JOB_DB_PATH'] = os.path.join(data_dir, 'jobs.db')
+    os.environ['PAGE_CACHE'] = '0'
+    if not polite:
+        os.environ.setdefault('CRAWL_REQUESTS_PER_SECOND', '0')
+        os.environ.setdefault('LINK_CHECK_REQUESTS_PER_SECOND', '0')
+
+
+def clear_caches():
+    from analysis_cache import analysis_cache
+    from link_checker import status_cache
+    from robots import robots_cache
+    from sentiment import sentiment_cache
+    analysis_cache.clear()
+    status_cache.clear()
+    robots_cache.clear()
+    sentiment_cache.clear()
+
+
+def run_once(client, start_url, spec):
+    """One audit plus exports; returns (stage timings, audit response)"""
+    clear_caches()
+
+    start = time.perf_counter()
+    response = client.post('/api/audit', json={'url': start_url, 'max_pages': spec.pages, 'max_depth': 10})
+    audit_seconds = time.perf_counter() - start
+    if response.status_code != 200:
+        raise RuntimeError(f"Audit failed: {response.get_json()}")
+    result = response.get_json()
+
+    stages = result['timings']['stages']
+    timings = {stage: sum(stages.get(source, {}).get('seconds', 0.0) for source in sources)
+               for stage, sources in STAGE_SOURCES.items()}
+    timings['audit'] = audit_seconds
+
+    for fmt in ('pdf', 'csv', 'json'):
+        start = time.perf_counter()
+        export = client.get(f"/api/audits/{result['audit_id']}/export/{fmt}")
+        if export.status_code != 200:
+            raise RuntimeError(f"{fmt} export failed with status {export.status_code}")
+        timings[f'export_{fmt}'] = time.perf_counter() - start
+    return timings, result
+
+
+def run_scenario(client, name, spec, repeat):
+    server, start_url = start_fixture_server(spec)
+    try:
+        runs = [run_once(client, start_url, spec) for _ in range(repeat)]
+    finally:
+        server.shutdown()
+
+    result = runs[-1][1]
+    return {
+        'spec': spec.to_dict(),
+        'repeat': repeat,
+        'pages_crawled': result['crawl_stats']['pages_crawled'],
+        'broken_links': result['crawl_stats']['broken_links'],
+        'timings': {stage: round(statistics.median(run[0].get(stage, 0.0) for run in runs), 4)
+                    for stage in STAGES}
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(RESULTS_DIR), timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def save_results(results):
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, datetime.now().strftime('%Y%m%d-%H%M%S') + '.json')
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+    return path
+
+
+def load_baseline(compare, exclude=None):
+    """Results to compare against: a path, or 'latest' for the newest stored run (other than exclude)"""
+    if compare != 'latest':
+        with open(compare) as f:
+            return compare, json.load(f)
+    paths = sorted(p for p in glob.glob(os.path.join(RESULTS_DIR, '*.json')) if p != exclude)
+    if not paths:
+        return None, None
+    with open(paths[-1]) as f:
+        return paths[-1], json.load(f)
+
+
+def print_report(results, baseline=None, threshold=0.15):
+    """Print timings (with the change against a baseline); returns the regressions found"""
+    regressions = []
+    for name, scenario in results['scenarios'].items():
+        print(f"\n{name}: {scenario['pages_crawled']} pages, {scenario['broken_links']} broken links")
+        before = ((baseline or {}).get('scenarios', {}).get(name) or {}).get('timings', {})
+        for stage in STAGES:
+            seconds = scenario['timings'][stage]
+            line = f"  {stage:<12} {seconds * 1000:10.1f} ms"
+            previous = before.get(stage)
+            if previous:
+                change = (seconds - previous) / previous
+                line += f"   {change:+7.1%} vs {previous * 1000:.1f} ms"
+                # Ignore noise on stages too short to measure reliably
+                if change > threshold and seconds - previous > 0.005:
+                    line += '   REGRESSION'
+                    regressions.append((name, stage, previous, seconds))
+            print(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Audit benchmark suite over synthetic fixture sites')
+    parser.add_argument('--scenario', nargs='+', default=['small', 'medium', 'dead-links', 'slow'],
+                        help=f"any of: {', '.join(SCENARIOS)}, custom (built from the site options)")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--compare', help='results file to compare with, or "latest"')
+    parser.add_argument('--threshold', type=float, default=0.15, help='slowdown flagged as a regression')
+    parser.add_argument('--fail-on-regression', action='store_true')
+    parser.add_argument('--no-save', action='store_true', help='do not store the results')
+    parser.add_argument('--polite', action='store_true', help='keep the crawl and link check rate limits')
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+
+    configure_environment(args.polite)
+    import app
+
+    client = app.app.test_client()
+
+    # The first audit pays one-off library start-up costs; keep it out of the numbers
+    warmup_server, warmup_url = start_fixture_server(SiteSpec(pages=3, words=50))
+    client.post('/api/audit', json={'url': warmup_url, 'max_pages': 3})
+    warmup_server.shutdown()
+
+    results = {
+        'timestamp': datetime.now().isoformat(),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'machine': f"{platform.system()} {platform.machine()}, {os.cpu_count()} CPUs",
+        'scenarios': {}
+    }
+    overrides = spec_overrides(args)
+    for name in args.scenario:
+        if name == 'custom':
+            spec = SiteSpec(**overrides)
+        else:
+            spec = SiteSpec(**dict(SCENARIOS[name], **overrides))
+        print(f"Running {name} ({spec.pages} pages, {args.repeat} runs)...")
+        results['scenarios'][name] = run_scenario(client, name, spec, args.repeat)
+
+    path = None if args.no_save else save_results(results)
+    baseline_path, baseline = load_baseline(args.compare, exclude=path) if args.compare else (None, None)
+    if args.compare:
+        print(f"\nCompared with {baseline_path}" if baseline else "\nNo earlier results to compare with")
+    regressions = print_report(results, baseline, args.threshold)
+    if path:
+        print(f"\nResults saved to {path}")
+    if regressions:
+        print(f"{len(regressions)} timings regressed by more than {args.threshold:.0%}")
+        if args.fail_on_regression:
+            raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
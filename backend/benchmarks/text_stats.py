@@ -0,0 +1,89 @@
+"""Time and peak memory of content-metric tokenization on long pages.
+
+Usage (from backend/):  python -m benchmarks.text_stats [--words 50000]
+
+"legacy" reproduces the previous per-metric passes (split for word count,
+two regex scans for keywords, a per-page TfidfVectorizer, textstat's
+readability functions); "textstats" is the single-pass TextStats object plus
+the metrics derived from it. Sentiment is unchanged by TextStats and excluded.
+"""
+import argparse
+import random
+import re
+import time
+import tracemalloc
+from collections import Counter
+import textstat
+from sklearn.feature_extraction.text import TfidfVectorizer
+from text_stats import TextStats
+from keywords import SiteKeywordEngine
+
+
+def ensure_textstat_offline():
+    """textstat needs the NLTK CMU dictionary; without it, use its own pyphen fallback for every word"""
+    try:
+        textstat.syllable_count('benchmark')
+    except LookupError:
+        import textstat.backend.counts._count_syllables as count_syllables
+        count_syllables.get_cmudict = lambda lang: {}
+
+
+def make_text(words, seed):
+    rng = random.Random(seed)
+    vocabulary = [''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(2, 11)))
+                  for _ in range(5000)]
+    out = []
+    for i in range(words):
+        word = rng.choice(vocabulary)
+        out.append(word + ('.' if rng.random() < 0.07 else ''))
+    return ' '.join(out)
+
+
+def legacy(text):
+    len(text.split())
+    textstat.flesch_reading_ease(text)
+    textstat.flesch_kincaid_grade(text)
+    words = re.findall(r'\b[a-zA-Z]{4,}\b', text.lower())
+    vectorizer = TfidfVectorizer(max_features=20, stop_words='english')
+    vectorizer.fit_transform([text])
+    Counter(words)
+
+
+def single_pass(text):
+    stats = TextStats(text)
+    stats.flesch_reading_ease()
+    stats.flesch_kincaid_grade()
+    engine = SiteKeywordEngine()
+    engine.add_document(0, stats)
+    engine.extract(1)
+
+
+def measure(fn, text):
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn(text)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--words', type=int, default=50000)
+    parser.add_argument('--pages', type=int, default=3)
+    args = parser.parse_args()
+
+    ensure_textstat_offline()
+    single_pass(make_text(1000, -1))  # warm imports and per-token caches' cold start separately
+
+    print(f"{'page':>5} {'legacy s':>9} {'legacy MB':>10} {'single s':>9} {'single MB':>10}")
+    for page in range(args.pages):
+        # Distinct texts per mode so neither benefits from textstat's whole-text caches
+        legacy_time, legacy_peak = measure(legacy, make_text(args.words, page))
+        new_time, new_peak = measure(single_pass, make_text(args.words, page) + ' ')
+        print(f"{page:>5} {legacy_time:>9.3f} {legacy_peak / 1e6:>10.1f} {new_time:>9.3f} {new_peak / 1e6:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""Per-request latency: a fresh connection per request vs the shared pooled session.
+
+Usage (from backend/):  python -m benchmarks.transport [--requests 500]
+
+Runs against the local keep-alive stub server. Over loopback and plain HTTP
+this only shows TCP setup; on real HTTPS sites each avoided handshake also
+saves the TLS round trips.
+"""
+import argparse
+import time
+import requests
+from transport import create_session
+from benchmarks.stub_server import start_stub_server
+
+
+def timed(get, urls):
+    start = time.perf_counter()
+    for url in urls:
+        get(url).close()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=500)
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(total_pages=args.requests)
+    urls = [f"{base_url}p/{i}" for i in range(args.requests)]
+
+    fresh = timed(lambda url: requests.get(url, timeout=10), urls)
+    session = create_session()
+    pooled = timed(lambda url: session.get(url, timeout=10), urls)
+    server.shutdown()
+
+    print(f"{args.requests} sequential GETs")
+    print(f"  requests.get (new connection each): {fresh:.3f}s  ({fresh / args.requests * 1000:.2f} ms/request)")
+    print(f"  pooled session (keep-alive):        {pooled:.3f}s  ({pooled / args.requests * 1000:.2f} ms/request)")
+
+
+if __name__ == '__main__':
+    main()
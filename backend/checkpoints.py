@@ -0,0 +1,212 @@
+import json
+import os
+import time
+import uuid
+import zlib
+from datetime import datetime
+from sqlite_store import SQLiteStore, DATA_DIR
+from text_stats import TextStats
+
+DEFAULT_CHECKPOINT_PATH = os.path.join(DATA_DIR, 'checkpoints.db')
+
+# A checkpoint is saved once this many new pages were crawled, or this many seconds passed with new pages
+CHECKPOINT_PAGES = int(os.environ.get('CHECKPOINT_PAGES', '25'))
+CHECKPOINT_SECONDS = float(os.environ.get('CHECKPOINT_SECONDS', '30'))
+
+
+def _pack(value):
+    return zlib.compress(json.dumps(value).encode('utf-8'))
+
+
+def _unpack(blob):
+    return json.loads(zlib.decompress(blob).decode('utf-8')) if blob is not None else None
+
+
+def new_checkpoint_id():
+    return uuid.uuid4().hex
+
+
+class CheckpointStore(SQLiteStore):
+    """Saved progress of audits, so an interrupted audit can continue instead of starting over.
+
+    A checkpoint holds the crawler's state (frontier, visited set, link sources)
+    and, appended as the crawl goes, every crawled page with its analysis. Its
+    status is 'running' while the audit runs (or after its process died),
+    'failed' after an error and 'completed' once the audit was saved, at which
+    point the bulky state is dropped and only the audit ID is kept.
+    """
+
+    SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    id TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL,
+    pages_crawled INTEGER NOT NULL DEFAULT 0,
+    state BLOB,
+    audit_id TEXT,
+    error TEXT,
+    created_at TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS checkpoints_status ON checkpoints (status, updated_at);
+CREATE TABLE IF NOT EXISTS checkpoint_pages (
+    checkpoint_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    page BLOB NOT NULL,
+    analysis BLOB,
+    stats BLOB,
+    PRIMARY KEY (checkpoint_id, seq)
+);
+"""
+
+    def __init__(self, path=None):
+        super().__init__(path or os.environ.get('CHECKPOINT_PATH', DEFAULT_CHECKPOINT_PATH))
+
+    def create(self, url, params, checkpoint_id=None):
+        """Start a checkpoint for a new audit; returns its ID"""
+        checkpoint_id = checkpoint_id or new_checkpoint_id()
+        with self.connection() as conn:
+            conn.execute(
+                "INSERT INTO checkpoints (id, url, params, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, 'running', ?, ?)",
+                (checkpoint_id, url, json.dumps(params), datetime.now().isoformat(), time.time())
+            )
+        return checkpoint_id
+
+    def get(self, checkpoint_id):
+        """Checkpoint metadata (without its state), or None"""
+        row = self.connection().execute(
+            'SELECT id, url, params, status, pages_crawled, audit_id, error, created_at, updated_at '
+            'FROM checkpoints WHERE id = ?', (checkpoint_id,)
+        ).fetchone()
+        return self._to_dict(row) if row is not None else None
+
+    def _to_dict(self, row):
+        return {
+            'checkpoint_id': row['id'],
+            'url': row['url'],
+            'params': json.loads(row['params']),
+            'status': row['status'],
+            'pages_crawled': row['pages_crawled'],
+            'audit_id': row['audit_id'],
+            'error': row['error'],
+            'created_at': row['created_at'],
+            'updated_at': datetime.fromtimestamp(row['updated_at']).isoformat()
+        }
+
+    def resumable(self, limit=20, url=None):
+        """Most recently updated checkpoints that never completed"""
+        query = ("SELECT id, url, params, status, pages_crawled, audit_id, error, created_at, updated_at "
+                 "FROM checkpoints WHERE status != 'completed'")
+        args = []
+        if url:
+            query += ' AND url = ?'
+            args.append(url)
+        query += ' ORDER BY updated_at DESC LIMIT ?'
+        args.append(limit)
+        return [self._to_dict(row) for row in self.connection().execute(query, args)]
+
+    def is_active(self, checkpoint_id, stale_after):
+        """True if the checkpoint's audit saved progress within stale_after seconds (probably still running)"""
+        row = self.connection().execute(
+            "SELECT updated_at FROM checkpoints WHERE id = ? AND status = 'running'", (checkpoint_id,)
+        ).fetchone()
+        return row is not None and time.time() - row['updated_at'] < stale_after
+
+    def save(self, checkpoint_id, state, first_seq, pages):
+        """Replace the crawl state and append new pages as (page, analysis, stats) rows, atomically"""
+        with self.connection() as conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO checkpoint_pages (checkpoint_id, seq, page, analysis, stats) '
+                'VALUES (?, ?, ?, ?, ?)',
+                [(checkpoint_id, first_seq + i, _pack(page), _pack(analysis), _pack(stats))
+                 for i, (page, analysis, stats) in enumerate(pages)]
+            )
+            conn.execute(
+                "UPDATE checkpoints SET state = ?, pages_crawled = ?, status = 'running', updated_at = ? "
+                "WHERE id = ?",
+                (_pack(state), first_seq + len(pages), time.time(), checkpoint_id)
+            )
+
+    def load(self, checkpoint_id):
+        """(state, pages, analyses, stats) saved for a checkpoint; state is None if nothing was saved yet"""
+        conn = self.connection()
+        row = conn.execute(
+            'SELECT state, pages_crawled FROM checkpoints WHERE id = ?', (checkpoint_id,)
+        ).fetchone()
+        if row is None or row['state'] is None:
+            return None, [], [], []
+        rows = conn.execute(
+            'SELECT page, analysis, stats FROM checkpoint_pages WHERE checkpoint_id = ? AND seq < ? ORDER BY seq',
+            (checkpoint_id, row['pages_crawled'])
+        ).fetchall()
+        return (_unpack(row['state']), [_unpack(r['page']) for r in rows],
+                [_unpack(r['analysis']) for r in rows], [_unpack(r['stats']) for r in rows])
+
+    def mark_running(self, checkpoint_id):
+        with self.connection() as conn:
+            conn.execute("UPDATE checkpoints SET status = 'running', error = NULL, updated_at = ? WHERE id = ?",
+                         (time.time(), checkpoint_id))
+
+    def fail(self, checkpoint_id, error):
+        with self.connection() as conn:
+            conn.execute("UPDATE checkpoints SET status = 'failed', error = ?, updated_at = ? WHERE id = ?",
+                         (error, time.time(), checkpoint_id))
+
+    def complete(self, checkpoint_id, audit_id):
+        """Mark a checkpoint's audit as saved and drop its resume state"""
+        with self.connection() as conn:
+            conn.execute('DELETE FROM checkpoint_pages WHERE checkpoint_id = ?', (checkpoint_id,))
+            conn.execute(
+                "UPDATE checkpoints SET status = 'completed', state = NULL, audit_id = ?, error = NULL, "
+                "updated_at = ? WHERE id = ?",
+                (audit_id, time.time(), checkpoint_id)
+            )
+
+
+class CrawlCheckpointer:
+    """Saves a crawl's progress (and its streaming analysis, if any) to a CheckpointStore.
+
+    The crawler calls maybe_save() between batches and save() when crawling
+    ends; only pages crawled since the previous save are written each time.
+    """
+
+    def __init__(self, store, checkpoint_id, site_analysis=None, every_pages=None, every_seconds=None):
+        self.store = store
+        self.checkpoint_id = checkpoint_id
+        self.site_analysis = site_analysis
+        self.every_pages = CHECKPOINT_PAGES if every_pages is None else every_pages
+        self.every_seconds = CHECKPOINT_SECONDS if every_seconds is None else every_seconds
+        self.saved_pages = 0
+        self.last_save = time.monotonic()
+
+    def restore(self, crawler):
+        """Load the saved progress into a fresh crawler (and site analysis); returns the pages restored"""
+        state, pages, analyses, stats = self.store.load(self.checkpoint_id)
+        if state is None:
+            return 0
+        crawler.restore_checkpoint(state, pages)
+        if self.site_analysis is not None:
+            for analysis, counts in zip(analyses, stats):
+                self.site_analysis.add_result(analysis, TextStats.from_counts(counts) if counts else None)
+        self.saved_pages = len(pages)
+        print(f"Resuming checkpoint {self.checkpoint_id} with {len(pages)} pages already crawled")
+        return len(pages)
+
+    def maybe_save(self, crawler):
+        new_pages = len(crawler.pages_data) - self.saved_pages
+        if new_pages >= self.every_pages or (new_pages and time.monotonic() - self.last_save >= self.every_seconds):
+            self.save(crawler)
+
+    def save(self, crawler):
+        start = self.saved_pages
+        pages = crawler.pages_data[start:]
+        if self.site_analysis is not None:
+            analyses = self.site_analysis.pages_analysis[start:]
+            stats = [s.to_counts() if s is not None else None for s in self.site_analysis.page_stats[start:]]
+        else:
+            analyses = stats = [None] * len(pages)
+        self.store.save(self.checkpoint_id, crawler.checkpoint_state(), start, list(zip(pages, analyses, stats)))
+        self.saved_pages += len(pages)
+        self.last_save = time.monotonic()
@@ -1,19 +1,81 @@
-import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
-from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from throttle import HostLimiter
+from link_checker import LinkChecker
+from frontier import CrawlFrontier, PriorityFrontier, CANDIDATES_PER_PAGE
+from transport import get_session
+from download import read_html, NotHTMLError
+from robots import robots_cache
+from sitemaps import iter_sitemap_urls
+from metrics import timed, record, PAGES_CRAWLED, LINKS_CHECKED, BROKEN_LINKS
+from profiler import profiled_thread_initializer
+import lxml_extractor
+import os
+import sys
 import time
 
+@lru_cache(maxsize=65536)
+def normalize_url(url):
+    """Normalize URL by removing fragments and trailing slashes (memoized)"""
+    parsed = urlparse(url)
+    # Remove query parameters and fragments for normalization
+    path = parsed.path
+    # Always remove trailing slash except for root path
+    if path.endswith('/') and path != '/':
+        path = path[:-1]
+    # If path is empty, make it root
+    if not path:
+        path = '/'
+    normalized = f"{parsed.scheme}://{parsed.netloc}{path}"
+    return normalized
+
 class SEOCrawler:
-    def __init__(self, base_url, max_pages=10, max_depth=2):
+    def __init__(self, base_url, max_pages=10, max_depth=2, max_workers=4,
+                 max_per_host=2, requests_per_second=None, max_links_per_page=None, parser=None,
+                 progress_callback=None, page_cache=None, session=None, max_page_bytes=None,
+                 keep_page_data=True, respect_robots=True, use_sitemaps=True, frontier_type=None,
+                 checkpointer=None, timings=None, request_timeout=10, analysis_version=None):
         self.base_url = base_url
         self.max_pages = max_pages
         self.max_depth = max_depth
-        self.visited = set()
+        self.max_workers = max(1, max_workers)
+        
+        # HTML extraction backend: 'lxml' (single streaming pass) or 'bs4' (BeautifulSoup reference)
+        self.parser = parser or os.environ.get('SEO_HTML_PARSER', 'lxml')
+        
+        # Politeness: per-host concurrency cap plus token-bucket rate limit (0 = unlimited)
+        if requests_per_second is None:
+            requests_per_second = float(os.environ.get('CRAWL_REQUESTS_PER_SECOND', '4.0'))
+        self.host_limiter = HostLimiter(max_per_host=max_per_host, requests_per_second=requests_per_second)
+        
+        # Seconds to wait for a page to connect or send data
+        self.request_timeout = request_timeout
+        
+        # Page bodies are streamed and cut off beyond this many bytes (0 = no limit)
+        if max_page_bytes is None:
+            max_page_bytes = int(os.environ.get('MAX_PAGE_BYTES', str(5 * 1024 * 1024)))
+        self.max_page_bytes = max_page_bytes
+        
+        # Links checked per page (None = all links)
+        self.max_links_per_page = max_links_per_page
+        
+        # Frontier tracks enqueued (visited) and crawled URLs by normalized form. 'priority' (default)
+        # crawls the best-linked, shallowest and most distinct pages first; 'fifo' is plain BFS order
+        self.frontier_type = frontier_type or os.environ.get('CRAWL_FRONTIER', 'fifo')
+        self.frontier = self.create_frontier(self.frontier_type)
+        self.visited = self.frontier.seen
         self.pages_data = []
         self.broken_links = []
         self.all_links = set()
         
+        # Links to verify: url -> (found_on, link_text) where first seen, recorded as pages are crawled
+        self.link_sources = {}
+        
+        # False keeps only a compact record per page (see compact_page_record); the full page_data
+        # is only yielded by iter_crawl, so it can be freed as soon as the caller has analyzed it
+        self.keep_page_data = keep_page_data
+        
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         }
@@ -21,6 +83,51 @@ class SEOCrawler:
         # Get base domain for internal link filtering
         parsed = urlparse(base_url)
         self.base_domain = f"{parsed.scheme}://{parsed.netloc}"
+        
+        # Pooled keep-alive connections, shared with other audits; link checks use their own
+        # pool without retries unless a session is passed in
+        self.session = session or get_session()
+        # Links on the audited site share the crawl's rate limit (and robots.txt Crawl-delay)
+        self.link_checker = LinkChecker(headers=self.headers, session=session,
+                                        limiters={self.host_limiter.host(base_url): self.host_limiter})
+        
+        # Called as progress_callback(stage, done, total) while crawling and checking links
+        self.progress_callback = progress_callback
+        
+        # Optional PageCache: revalidate pages with conditional requests and reuse unchanged ones
+        self.page_cache = page_cache
+        self.pages_not_modified = 0
+        
+        # SEOAnalyzer.analysis_version() of the audit: cached analyses made by any other version or
+        # settings are not reused (None reuses cached page data only)
+        self.analysis_version = analysis_version
+        
+        # robots.txt rules (Disallow, Crawl-delay) and sitemap seeding of the frontier
+        self.respect_robots = respect_robots
+        self.use_sitemaps = use_sitemaps
+        self.robots = None
+        self.disallowed = set()  # normalized URLs skipped because of robots.txt
+        self.sitemap_urls = 0
+        
+        # Set to stop crawling early (e.g. when a streaming client disconnects)
+        self.stop_requested = False
+        
+        # Optional CrawlCheckpointer: saves progress between batches so an interrupted crawl can resume
+        self.checkpointer = checkpointer
+        self.resumed = False
+        
+        # Optional metrics.StageTimings collecting this crawl's per-stage times (fetch, parse, link_check, ...)
+        self.timings = timings
+    
+    def create_frontier(self, frontier_type):
+        if frontier_type == 'fifo':
+            return CrawlFrontier(self.normalize_url, max_size=self.max_pages)
+        return PriorityFrontier(self.normalize_url, max_size=self.max_pages * CANDIDATES_PER_PAGE)
+    
+    def report_progress(self, stage, done, total=None):
+        """Notify the progress callback, if any"""
+        if self.progress_callback:
+            self.progress_callback(stage, done, total)
     
     def is_valid_url(self, url):
         """Check if URL is valid and belongs to same domain"""
@@ -33,43 +140,11 @@ class SEOCrawler:
     
     def normalize_url(self, url):
         """Normalize URL by removing fragments and trailing slashes"""
-        parsed = urlparse(url)
-        # Remove query parameters and fragments for normalization
-        path = parsed.path
-        # Always remove trailing slash except for root path
-        if path.endswith('/') and path != '/':
-            path = path[:-1]
-        # If path is empty, make it root
-        if not path:
-            path = '/'
-        normalized = f"{parsed.scheme}://{parsed.netloc}{path}"
-        return normalized
+        return normalize_url(url)
     
     def check_link_status(self, url):
         """Check if a link is truly broken (not just bot-protected)"""
-        try:
-            # Try HEAD request first (faster)
-            response = requests.head(url, headers=self.headers, timeout=5, allow_redirects=True)
-            status = response.status_code
-            
-            # If HEAD fails with 405 (Method Not Allowed), try GET
-            if status == 405:
-                response = requests.get(url, headers=self.headers, timeout=5, allow_redirects=True)
-                status = response.status_code
-            
-            return status
-            
-        except requests.exceptions.Timeout:
-            return 0  # Timeout
-        except requests.exceptions.ConnectionError:
-            return 0  # Connection failed
-        except:
-            # Try GET as fallback
-            try:
-                response = requests.get(url, headers=self.headers, timeout=5, allow_redirects=True)
-                return response.status_code
-            except:
-                return 0  # Connection failed
+        return self.link_checker.check_status(url)
     
     def is_truly_broken(self, status_code, url=""):
         """Determine if a status code indicates a truly broken link"""
@@ -119,10 +194,15 @@ class SEOCrawler:
         
         return False
     
-    def extract_page_data(self, url, html_content):
-        """Extract comprehensive SEO data from a page"""
+    def extract_fields_bs4(self, html_content):
+        """Extract raw SEO fields using BeautifulSoup (reference implementation)"""
+        from bs4 import BeautifulSoup  # only needed when lxml is not the parser (or fails)
         soup = BeautifulSoup(html_content, 'html.parser')
         
+        # <template> content is inert (never rendered), so none of it counts
+        for template in soup.find_all('template'):
+            template.decompose()
+        
         # Extract all headings with hierarchy
         headings = {
             'h1': [h.get_text().strip() for h in soup.find_all('h1')],
@@ -165,16 +245,7 @@ class SEOCrawler:
             canonical = canonical_tag.get("href", "")
         
         # Extract all links
-        links = []
-        for a in soup.find_all('a', href=True):
-            href = a.get('href')
-            full_url = urljoin(url, href)
-            links.append({
-                'url': full_url,
-                'text': a.get_text().strip(),
-                'is_internal': self.is_valid_url(full_url)
-            })
-            self.all_links.add(full_url)
+        anchors = [(a.get('href'), a.get_text().strip()) for a in soup.find_all('a', href=True)]
         
         # Extract images with alt text analysis
         images = []
@@ -192,10 +263,6 @@ class SEOCrawler:
             script.decompose()
         
         full_text = soup.get_text()
-        # Clean up whitespace
-        lines = (line.strip() for line in full_text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        full_text = ' '.join(chunk for chunk in chunks if chunk)
         
         # Check for robots meta tag
         robots_meta = ""
@@ -204,17 +271,66 @@ class SEOCrawler:
             robots_meta = robots_tag.get("content", "")
         
         return {
-            'url': url,
             'title': title,
-            'title_length': len(title),
             'meta_description': meta_desc,
-            'meta_description_length': len(meta_desc),
             'meta_keywords': meta_keywords,
             'canonical': canonical,
             'og_tags': og_tags,
             'twitter_tags': twitter_tags,
             'robots_meta': robots_meta,
             'headings': headings,
+            'anchors': anchors,
+            'images': images,
+            'text': full_text
+        }
+    
+    def extract_fields(self, html_content):
+        """Extract raw SEO fields with the configured parser backend"""
+        if self.parser == 'lxml':
+            try:
+                return lxml_extractor.extract_fields(html_content)
+            except lxml_extractor.UnsupportedMarkupError:
+                pass  # markup the parsers disagree on: BeautifulSoup's tree is the reference
+            except Exception as e:
+                print(f"lxml extraction failed, falling back to BeautifulSoup: {str(e)}")
+        return self.extract_fields_bs4(html_content)
+    
+    def extract_page_data(self, url, html_content):
+        """Extract comprehensive SEO data from a page"""
+        fields = self.extract_fields(html_content)
+        
+        # Resolve links
+        links = []
+        for href, text in fields['anchors']:
+            full_url = urljoin(url, href)
+            links.append({
+                'url': full_url,
+                'text': text,
+                'is_internal': self.is_valid_url(full_url)
+            })
+            self.all_links.add(full_url)
+        
+        # Clean up whitespace in visible text
+        lines = (line.strip() for line in fields['text'].splitlines())
+        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+        full_text = ' '.join(chunk for chunk in chunks if chunk)
+        
+        title = fields['title']
+        meta_desc = fields['meta_description']
+        images = fields['images']
+        
+        return {
+            'url': url,
+            'title': title,
+            'title_length': len(title),
+            'meta_description': meta_desc,
+            'meta_description_length': len(meta_desc),
+            'meta_keywords': fields['meta_keywords'],
+            'canonical': fields['canonical'],
+            'og_tags': fields['og_tags'],
+            'twitter_tags': fields['twitter_tags'],
+            'robots_meta': fields['robots_meta'],
+            'headings': fields['headings'],
             'links': links,
             'internal_links_count': sum(1 for l in links if l['is_internal']),
             'external_links_count': sum(1 for l in links if not l['is_internal']),
@@ -225,103 +341,317 @@ class SEOCrawler:
             'word_count': len(full_text.split())
         }
     
-    def crawl(self):
-        """Crawl website with BFS approach"""
-        queue = deque([(self.base_url, 0)])  # (url, depth)
-        self.visited.add(self.normalize_url(self.base_url))
-        
-        while queue and len(self.pages_data) < self.max_pages:
-            current_url, depth = queue.popleft()
+    def fetch_page(self, url, depth):
+        """Fetch and extract a single page, returning its page_data (or an error record)"""
+        try:
+            print(f"Crawling: {url} (depth: {depth})")
+            headers = self.headers
+            cached = None
+            if self.page_cache:
+                cached = self.page_cache.get(self.normalize_url(url))
+                if cached:
+                    headers = dict(self.headers, **self.page_cache.conditional_headers(cached))
             
-            if depth > self.max_depth:
-                continue
+            fetch_started = time.perf_counter()
+            with self.host_limiter.slot(url):
+                # Stream the body: non-HTML is rejected from its headers and oversized pages are cut off
+                with self.session.get(url, headers=headers, timeout=self.request_timeout, stream=True) as response:
+                    if cached and response.status_code == 304:
+                        return self.reuse_cached_page(url, depth, cached)
+                    
+                    try:
+                        html, truncated = read_html(response, self.max_page_bytes)
+                        record('fetch', time.perf_counter() - fetch_started, self.timings)
+                    except NotHTMLError as e:
+                        print(f"Skipping {url}: {str(e)}")
+                        return {
+                            'url': url,
+                            'error': str(e),
+                            'status_code': response.status_code,
+                            'depth': depth
+                        }
             
-            # Normalize current URL to check for duplicates
-            normalized_current = self.normalize_url(current_url)
+            if truncated:
+                print(f"Truncated {url} at {self.max_page_bytes} bytes")
             
-            # Skip if we've already crawled this normalized URL
-            if normalized_current in [self.normalize_url(p.get('url', '')) for p in self.pages_data if 'url' in p]:
-                print(f"Skipping duplicate: {current_url} (already crawled as {normalized_current})")
-                continue
+            # Extract page data
+            with timed('parse', self.timings):
+                page_data = self.extract_page_data(url, html)
+            PAGES_CRAWLED.inc(result='ok')
+            page_data['status_code'] = response.status_code
+            if truncated:
+                page_data['truncated'] = True
             
-            try:
-                print(f"Crawling: {current_url} (depth: {depth})")
-                response = requests.get(current_url, headers=self.headers, timeout=10)
-                
-                # Extract page data
-                page_data = self.extract_page_data(current_url, response.text)
-                page_data['status_code'] = response.status_code
-                page_data['depth'] = depth
-                self.pages_data.append(page_data)
+            if self.page_cache and response.status_code == 200:
+                self.page_cache.store_page(self.normalize_url(url), response.headers.get('ETag'),
+                                           response.headers.get('Last-Modified'), page_data)
+            
+            page_data['depth'] = depth
+            return page_data
+            
+        except Exception as e:
+            print(f"Error crawling {url}: {str(e)}")
+            return {
+                'url': url,
+                'error': str(e),
+                'status_code': 0,
+                'depth': depth
+            }
+    
+    def reuse_cached_page(self, url, depth, cached):
+        """Page data for a 304 Not Modified response, taken from the page cache"""
+        page_data = cached['page_data']
+        page_data['url'] = url
+        page_data['depth'] = depth
+        for link in page_data['links']:
+            self.all_links.add(link['url'])
+        # The analyzer reuses this instead of re-analyzing the unchanged page
+        if cached['analysis'] is not None and self.analysis_version is not None \
+                and cached['analysis_version'] == self.analysis_version:
+            page_data['cached_analysis'] = cached['analysis']
+        self.pages_not_modified += 1
+        PAGES_CRAWLED.inc(result='not_modified')
+        return page_data
+    
+    def cache_analyses(self, pages_analysis):
+        """Store page analyses with their cached pages so the next audit can reuse them"""
+        if self.page_cache:
+            keys = [self.normalize_url(page['url']) for page in self.pages_data]
+            self.page_cache.store_analyses(keys, pages_analysis, self.analysis_version)
+    
+    def is_allowed(self, url):
+        """Check a URL against the site's robots.txt (always allowed when robots are not respected)"""
+        return self.robots is None or self.robots.can_fetch(self.headers['User-Agent'], url)
+    
+    def enqueue(self, url, depth, priority=None):
+        """Add a URL to the frontier unless robots.txt disallows it (priority: sitemap <priority>)"""
+        if not self.is_allowed(url):
+            self.disallowed.add(self.normalize_url(url))
+            return False
+        return self.frontier.add(url, depth, priority=priority)
+    
+    def prepare_crawl(self):
+        """Load robots.txt, then seed the frontier with the base URL and the site's sitemap URLs"""
+        self.load_robots()
+        
+        # The base URL is what the user asked to audit, so it is fetched even if disallowed
+        self.frontier.add(self.base_url, 0, force=True)
+        
+        if self.use_sitemaps and self.max_pages > 1 and self.max_depth > 0:
+            self.seed_from_sitemaps()
+    
+    def load_robots(self):
+        """Fetch (or reuse) the site's robots.txt rules and apply its Crawl-delay to our rate limit"""
+        if not self.respect_robots:
+            return
+        self.robots = robots_cache.get(self.base_domain, self.session, headers=self.headers)
+        delay = self.robots.crawl_delay(self.headers['User-Agent'])
+        if delay:
+            # Honour Crawl-delay by slowing the site's token bucket (never speeding it up)
+            bucket = self.host_limiter.bucket(self.base_url)
+            delay_rate = 1.0 / float(delay)
+            if bucket.rate <= 0 or bucket.rate > delay_rate:
+                bucket.set_rate(delay_rate)
+    
+    def seed_from_sitemaps(self):
+        """Queue the site's sitemap URLs (highest priority first) as if linked from the base URL"""
+        sitemaps = (self.robots.site_maps() if self.robots else None) or [self.base_domain + '/sitemap.xml']
+        entries = [(url, priority) for url, priority in
+                   iter_sitemap_urls(sitemaps, self.session, headers=self.headers, limiter=self.host_limiter)
+                   if self.is_valid_url(url)]
+        
+        # Missing priorities default to 0.5 (sitemap protocol); the sort is stable, so file order breaks ties
+        entries.sort(key=lambda entry: -(entry[1] if entry[1] is not None else 0.5))
+        for url, priority in entries:
+            if self.enqueue(url, 1, priority=priority):
+                self.sitemap_urls += 1
+        if entries:
+            print(f"Seeded {self.sitemap_urls} URLs from sitemaps")
+    
+    def iter_crawl(self):
+        """Crawl website in frontier order, yielding each page's data as soon as it is crawled"""
+        # Time spent crawling, excluding the time the caller spends on each yielded page
+        crawl_seconds = 0.0
+        resumed_at = time.perf_counter()
+        
+        if self.resumed:
+            self.load_robots()  # the frontier was restored from a checkpoint; do not seed it again
+        else:
+            self.prepare_crawl()
+        frontier = self.frontier
+        
+        # Bounded batches keep few fetched-but-unconsumed pages in memory (with the FIFO frontier BFS
+        # order is unaffected, since links found are queued behind the current level)
+        batch_size = self.max_workers * 4
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers, initializer=profiled_thread_initializer()) as executor:
+            while frontier and len(self.pages_data) < self.max_pages and not self.stop_requested:
+                # Between batches every crawled page has been consumed, so crawl state is consistent
+                if self.checkpointer:
+                    self.checkpointer.maybe_save(self)
                 
-                # Add internal links to queue if not at max depth
-                if depth < self.max_depth:
-                    for link in page_data['links']:
-                        if link['is_internal']:
-                            normalized = self.normalize_url(link['url'])
-                            if normalized not in self.visited and len(self.visited) < self.max_pages:
-                                self.visited.add(normalized)
-                                queue.append((link['url'], depth + 1))
+                # Take the next batch of URLs from the frontier, never more than the page budget allows
+                batch = []
+                while frontier and len(batch) < min(batch_size, self.max_pages - len(self.pages_data)):
+                    current_url, depth = frontier.pop()
+                    
+                    if depth > self.max_depth:
+                        continue
+                    
+                    # Skip if we've already crawled this normalized URL
+                    if not frontier.claim(current_url):
+                        print(f"Skipping duplicate: {current_url} (already crawled as {self.normalize_url(current_url)})")
+                        continue
+                    
+                    batch.append((current_url, depth))
                 
-                # Small delay to be polite
-                time.sleep(0.5)
+                # Fetch concurrently; results come back in frontier order
+                results = executor.map(lambda item: self.fetch_page(*item), batch)
                 
-            except Exception as e:
-                print(f"Error crawling {current_url}: {str(e)}")
-                self.pages_data.append({
-                    'url': current_url,
-                    'error': str(e),
-                    'status_code': 0,
-                    'depth': depth
-                })
+                for page_data in results:
+                    self.pages_data.append(page_data if self.keep_page_data else self.compact_page_record(page_data))
+                    self.report_progress('crawl', len(self.pages_data), self.max_pages)
+                    depth = page_data['depth']
+                    
+                    if 'error' in page_data:
+                        PAGES_CRAWLED.inc(result='error')
+                    else:
+                        self.record_link_sources(page_data)
+                        
+                        # Add internal links to queue if not at max depth
+                        if depth < self.max_depth:
+                            for link in page_data['links']:
+                                if link['is_internal']:
+                                    self.enqueue(link['url'], depth + 1)
+                    
+                    crawl_seconds += time.perf_counter() - resumed_at
+                    yield page_data
+                    resumed_at = time.perf_counter()
+        
+        if self.checkpointer and not self.stop_requested:
+            self.checkpointer.save(self)
+        record('crawl', crawl_seconds + time.perf_counter() - resumed_at, self.timings)
+    
+    def checkpoint_state(self):
+        """Crawl state needed to resume this crawl, apart from the crawled pages themselves"""
+        return {
+            'frontier_type': self.frontier_type,
+            'frontier': self.frontier.to_state(),
+            'link_sources': [[url, found_on, text] for url, (found_on, text) in self.link_sources.items()],
+            'all_links': list(self.all_links),
+            'disallowed': list(self.disallowed),
+            'sitemap_urls': self.sitemap_urls,
+            'pages_not_modified': self.pages_not_modified
+        }
+    
+    def restore_checkpoint(self, state, pages):
+        """Continue from a checkpoint: already crawled pages are kept and never refetched"""
+        self.frontier_type = state['frontier_type']
+        self.frontier = self.create_frontier(self.frontier_type)
+        self.frontier.load_state(state['frontier'])
+        self.visited = self.frontier.seen
+        self.link_sources = {url: (sys.intern(found_on), text) for url, found_on, text in state['link_sources']}
+        self.all_links = set(state['all_links'])
+        self.disallowed = set(state['disallowed'])
+        self.sitemap_urls = state['sitemap_urls']
+        self.pages_not_modified = state['pages_not_modified']
+        self.pages_data = pages
+        self.resumed = True
+    
+    def compact_page_record(self, page_data):
+        """What is kept of a page once it has been handed out for analysis"""
+        record = {
+            'url': page_data['url'],
+            'status_code': page_data.get('status_code', 0),
+            'depth': page_data['depth']
+        }
+        if 'error' in page_data:
+            record['error'] = page_data['error']
+        return record
+    
+    def record_link_sources(self, page_data):
+        """Remember where each checkable link was first found, for the broken link check"""
+        # Special URI schemes that should not be checked
+        skip_schemes = ['mailto:', 'tel:', 'javascript:', 'data:', 'ftp:', 'file:', '#']
+        
+        found_on = sys.intern(page_data['url'])
+        for link in page_data['links'][:self.max_links_per_page]:
+            url = link['url']
+            
+            # Skip special URI schemes
+            if any(url.lower().startswith(scheme) for scheme in skip_schemes):
+                continue
+            
+            # Skip anchor links
+            if url.startswith('#'):
+                continue
+            
+            # Only check HTTP/HTTPS links
+            if not url.startswith(('http://', 'https://')):
+                continue
+            
+            if url not in self.link_sources:
+                self.link_sources[url] = (found_on, link['text'])
+    
+    def crawl(self):
+        """Crawl website, fetching pages from the frontier concurrently"""
+        for _ in self.iter_crawl():
+            pass
         
         # Check for broken links
         self.check_broken_links()
         
+        return self.crawl_result()
+    
+    def crawl_result(self):
+        """Crawl results in the shape the analyzer expects"""
         return {
             'pages': self.pages_data,
             'broken_links': self.broken_links,
             'total_pages_crawled': len(self.pages_data),
-            'total_links_found': len(self.all_links)
+            'total_links_found': len(self.all_links),
+            'pages_not_modified': self.pages_not_modified,
+            'sitemap_urls': self.sitemap_urls,
+            'robots_disallowed': len(self.disallowed)
         }
     
-    def check_broken_links(self):
-        """Check all discovered links for broken ones"""
+    def check_broken_links(self, on_broken=None):
+        """Check all discovered links for broken ones (on_broken(link) is called as each is found)"""
         print("Checking for broken links...")
-        checked = set()
+        started = time.perf_counter()
+        if self.robots is None:
+            self.load_robots()
         
-        # Special URI schemes that should not be checked
-        skip_schemes = ['mailto:', 'tel:', 'javascript:', 'data:', 'ftp:', 'file:', '#']
+        # Links on this site that robots.txt disallows are not requested, so not checked either
+        first_seen = {url: source for url, source in self.link_sources.items()  # url -> (found_on, link_text)
+                      if not self.is_valid_url(url) or self.is_allowed(url)}
         
-        for page in self.pages_data:
-            if 'links' in page:
-                for link in page['links'][:20]:  # Limit to first 20 links per page
-                    url = link['url']
-                    
-                    # Skip special URI schemes
-                    if any(url.lower().startswith(scheme) for scheme in skip_schemes):
-                        continue
-                    
-                    # Skip anchor links
-                    if url.startswith('#'):
-                        continue
-                    
-                    # Only check HTTP/HTTPS links
-                    if not url.startswith(('http://', 'https://')):
-                        continue
-                    
-                    if url not in checked:
-                        checked.add(url)
-                        status = self.check_link_status(url)
-                        
-                        # Only report truly broken links (not bot protection)
-                        if self.is_truly_broken(status, url):
-                            self.broken_links.append({
-                                'url': url,
-                                'status_code': status,
-                                'found_on': page['url'],
-                                'link_text': link['text']
-                            })
-
-
-
+        # Verify all unique links in one concurrent batch
+        total = len(first_seen)
+        self.report_progress('links', 0, total)
+        
+        def on_checked(url, status, done):
+            self.report_progress('links', done, total)
+            if on_broken and self.is_truly_broken(status, url):
+                on_broken(self.broken_link_record(url, status, *first_seen[url]))
+        
+        statuses = self.link_checker.check_all(first_seen.keys(), on_checked=on_checked)
+        
+        for url, (found_on, link_text) in first_seen.items():
+            status = statuses[url]
+            
+            # Only report truly broken links (not bot protection)
+            if self.is_truly_broken(status, url):
+                self.broken_links.append(self.broken_link_record(url, status, found_on, link_text))
+        
+        LINKS_CHECKED.inc(total)
+        BROKEN_LINKS.inc(len(self.broken_links))
+        record('link_check', time.perf_counter() - started, self.timings)
+    
+    def broken_link_record(self, url, status, found_on, link_text):
+        return {
+            'url': url,
+            'status_code': status,
+            'found_on': found_on,
+            'link_text': link_text
+        }
@@ -0,0 +1,421 @@
+"""Distributed crawl: a coordinator seeds a shared frontier, worker processes crawl and analyze from it.
+
+Usage (from backend/):
+    python -m distributed [--db data/distributed.db] crawl https://example.com --workers 4 [--output result.json]
+    python -m distributed [--db data/distributed.db] worker CRAWL_ID
+
+`crawl` seeds the frontier (robots.txt, sitemaps), starts local worker processes,
+waits for them and prints the finished audit. Workers on other machines can
+join a crawl with `worker` as long as they share the database file.
+
+The frontier, visited set and per-page results live in one SQLite database
+(WAL mode, so several processes can read and write it). Workers lease URLs in
+batches; a lease that is not completed in time (the worker died) goes back to
+the queue, and only the current lease holder can store a page's result, so
+every URL is crawled and analyzed exactly once. Site-wide keywords, the broken
+link check and the site summary run once, in the coordinator, at the end.
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import uuid
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from sqlite_store import SQLiteStore, DATA_DIR
+from crawler import SEOCrawler, normalize_url
+from analyzer import SEOAnalyzer, StreamingSiteAnalysis
+from text_stats import TextStats
+from keywords import pending_keywords
+
+DEFAULT_DB_PATH = os.path.join(DATA_DIR, 'distributed.db')
+
+# Seconds a worker may hold leased URLs before they are handed to another worker
+LEASE_SECONDS = float(os.environ.get('DISTRIBUTED_LEASE_SECONDS', '120'))
+
+# SEOCrawler settings a crawl is created with (and every worker rebuilds its crawler from)
+CRAWL_SETTINGS = ('max_pages', 'max_depth', 'max_workers', 'max_per_host', 'requests_per_second',
+                  'max_links_per_page', 'max_page_bytes', 'respect_robots', 'use_sitemaps')
+
+
+def _pack(value):
+    return zlib.compress(json.dumps(value).encode('utf-8'))
+
+
+def _unpack(blob):
+    return json.loads(zlib.decompress(blob).decode('utf-8')) if blob is not None else None
+
+
+class DistributedCrawlStore(SQLiteStore):
+    """Shared crawl state: the frontier (and visited set), page results and discovered links.
+
+    A frontier row is 'queued', 'leased' (being crawled by lease_owner until
+    lease_expires), 'done', or 'disallowed' (kept out by robots.txt). Rows are
+    never deleted, so the (crawl_id, normalized) key doubles as the visited set.
+    """
+
+    SCHEMA = """
+CREATE TABLE IF NOT EXISTS crawls (
+    id TEXT PRIMARY KEY,
+    base_url TEXT NOT NULL,
+    settings TEXT NOT NULL,
+    workers INTEGER NOT NULL,
+    sitemap_urls INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS frontier (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    crawl_id TEXT NOT NULL,
+    normalized TEXT NOT NULL,
+    url TEXT NOT NULL,
+    depth INTEGER NOT NULL,
+    state TEXT NOT NULL DEFAULT 'queued',
+    lease_owner TEXT,
+    lease_expires REAL,
+    UNIQUE (crawl_id, normalized)
+);
+CREATE INDEX IF NOT EXISTS frontier_state ON frontier (crawl_id, state, depth, id);
+CREATE TABLE IF NOT EXISTS results (
+    frontier_id INTEGER PRIMARY KEY,
+    crawl_id TEXT NOT NULL,
+    page_record TEXT NOT NULL,
+    analysis BLOB NOT NULL,
+    stats BLOB
+);
+CREATE INDEX IF NOT EXISTS results_crawl ON results (crawl_id, frontier_id);
+CREATE TABLE IF NOT EXISTS links (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    crawl_id TEXT NOT NULL,
+    url TEXT NOT NULL,
+    found_on TEXT NOT NULL,
+    link_text TEXT NOT NULL,
+    checkable INTEGER NOT NULL,
+    UNIQUE (crawl_id, url)
+);
+"""
+
+    def __init__(self, path=None):
+        super().__init__(path or os.environ.get('DISTRIBUTED_DB_PATH', DEFAULT_DB_PATH))
+
+    def create_crawl(self, base_url, settings, workers):
+        """Register a crawl and return its id"""
+        crawl_id = uuid.uuid4().hex
+        with self.connection() as conn:
+            conn.execute(
+                'INSERT INTO crawls (id, base_url, settings, workers, created_at) VALUES (?, ?, ?, ?, ?)',
+                (crawl_id, base_url, json.dumps(settings), workers, datetime.now().isoformat())
+            )
+        return crawl_id
+
+    def get_crawl(self, crawl_id):
+        row = self.connection().execute(
+            'SELECT base_url, settings, workers, sitemap_urls FROM crawls WHERE id = ?', (crawl_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            'id': crawl_id,
+            'base_url': row['base_url'],
+            'settings': json.loads(row['settings']),
+            'workers': row['workers'],
+            'sitemap_urls': row['sitemap_urls']
+        }
+
+    def set_sitemap_urls(self, crawl_id, count):
+        with self.connection() as conn:
+            conn.execute('UPDATE crawls SET sitemap_urls = ? WHERE id = ?', (count, crawl_id))
+
+    def _add_urls(self, conn, crawl_id, urls, max_pages):
+        """Insert (url, depth, state) rows not seen before, keeping crawlable rows within the page budget"""
+        queued = conn.execute(
+            "SELECT COUNT(*) FROM frontier WHERE crawl_id = ? AND state != 'disallowed'", (crawl_id,)
+        ).fetchone()[0]
+        for url, depth, state in urls:
+            if state != 'disallowed' and queued >= max_pages:
+                continue
+            cursor = conn.execute(
+                'INSERT OR IGNORE INTO frontier (crawl_id, normalized, url, depth, state) VALUES (?, ?, ?, ?, ?)',
+                (crawl_id, normalize_url(url), url, depth, state)
+            )
+            if cursor.rowcount and state != 'disallowed':
+                queued += 1
+
+    def add_urls(self, crawl_id, urls, max_pages):
+        """Add (url, depth, state) rows to the frontier in order"""
+        with self.connection() as conn:
+            self._add_urls(conn, crawl_id, urls, max_pages)
+
+    def claim(self, crawl_id, owner, limit, lease_seconds=LEASE_SECONDS):
+        """Lease up to limit URLs (shallowest first, then in discovery order); returns [(id, url, depth)]"""
+        conn = self.connection()
+        now = time.time()
+        # BEGIN IMMEDIATE takes the write lock up front, so two workers never lease the same rows
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            rows = conn.execute(
+                "SELECT id, url, depth FROM frontier WHERE crawl_id = ? "
+                "AND (state = 'queued' OR (state = 'leased' AND lease_expires < ?)) "
+                "ORDER BY depth, id LIMIT ?",
+                (crawl_id, now, limit)
+            ).fetchall()
+            conn.executemany(
+                "UPDATE frontier SET state = 'leased', lease_owner = ?, lease_expires = ? WHERE id = ?",
+                [(owner, now + lease_seconds, row['id']) for row in rows]
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return [(row['id'], row['url'], row['depth']) for row in rows]
+
+    def complete(self, crawl_id, frontier_id, owner, page_record, analysis, stats, links, new_urls, max_pages):
+        """Store a crawled page's result and what it discovered; False if the lease was lost meanwhile"""
+        conn = self.connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            cursor = conn.execute(
+                "UPDATE frontier SET state = 'done', lease_owner = NULL, lease_expires = NULL "
+                "WHERE id = ? AND state = 'leased' AND lease_owner = ?",
+                (frontier_id, owner)
+            )
+            if not cursor.rowcount:
+                # Lease expired and another worker took the URL over; its result wins
+                conn.rollback()
+                return False
+            conn.execute(
+                'INSERT INTO results (frontier_id, crawl_id, page_record, analysis, stats) VALUES (?, ?, ?, ?, ?)',
+                (frontier_id, crawl_id, json.dumps(page_record), _pack(analysis),
+                 _pack(stats) if stats is not None else None)
+            )
+            conn.executemany(
+                'INSERT OR IGNORE INTO links (crawl_id, url, found_on, link_text, checkable) VALUES (?, ?, ?, ?, ?)',
+                [(crawl_id,) + link for link in links]
+            )
+            self._add_urls(conn, crawl_id, new_urls, max_pages)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return True
+
+    def is_finished(self, crawl_id):
+        """True once no URL of the crawl is queued or being crawled"""
+        row = self.connection().execute(
+            "SELECT 1 FROM frontier WHERE crawl_id = ? AND state IN ('queued', 'leased') LIMIT 1", (crawl_id,)
+        ).fetchone()
+        return row is None
+
+    def progress(self, crawl_id):
+        """Frontier row counts by state"""
+        rows = self.connection().execute(
+            'SELECT state, COUNT(*) AS count FROM frontier WHERE crawl_id = ? GROUP BY state', (crawl_id,)
+        ).fetchall()
+        return {row['state']: row['count'] for row in rows}
+
+    def results(self, crawl_id):
+        """(page_record, analysis, stats counts) per crawled page, in frontier order"""
+        rows = self.connection().execute(
+            'SELECT page_record, analysis, stats FROM results WHERE crawl_id = ? ORDER BY frontier_id', (crawl_id,)
+        )
+        for row in rows:
+            yield json.loads(row['page_record']), _unpack(row['analysis']), _unpack(row['stats'])
+
+    def links(self, crawl_id):
+        """(url, found_on, link_text, checkable) per distinct link, in discovery order"""
+        rows = self.connection().execute(
+            'SELECT url, found_on, link_text, checkable FROM links WHERE crawl_id = ? ORDER BY id', (crawl_id,)
+        )
+        return [(row['url'], row['found_on'], row['link_text'], bool(row['checkable'])) for row in rows]
+
+    def disallowed(self, crawl_id):
+        rows = self.connection().execute(
+            "SELECT normalized FROM frontier WHERE crawl_id = ? AND state = 'disallowed'", (crawl_id,)
+        )
+        return {row['normalized'] for row in rows}
+
+
+def build_crawler(crawl, share=1):
+    """SEOCrawler with the crawl's settings; share divides the site's politeness limits between workers"""
+    settings = dict(crawl['settings'])
+    if share > 1:
+        settings['max_per_host'] = max(1, settings.get('max_per_host', 2) // share)
+    # FIFO frontier: only used by the coordinator to collect seed URLs in BFS order
+    return SEOCrawler(crawl['base_url'], frontier_type='fifo', keep_page_data=False, **settings)
+
+
+def start_crawl(store, base_url, workers=1, **settings):
+    """Create a crawl and seed its shared frontier with the base URL and sitemap URLs; returns the crawl id"""
+    settings = {name: value for name, value in settings.items() if name in CRAWL_SETTINGS}
+    crawl_id = store.create_crawl(base_url, settings, workers)
+    crawler = build_crawler(store.get_crawl(crawl_id))
+    crawler.prepare_crawl()
+
+    seeds = []
+    while crawler.frontier:
+        url, depth = crawler.frontier.pop()
+        seeds.append((url, depth, 'queued'))
+    seeds.extend((url, 1, 'disallowed') for url in crawler.disallowed)
+    store.add_urls(crawl_id, seeds, crawler.max_pages)
+    store.set_sitemap_urls(crawl_id, crawler.sitemap_urls)
+    return crawl_id
+
+
+def process_page(crawler, analyzer, page_data):
+    """Analyze a fetched page; returns (page_record, analysis, stats counts, links, new frontier URLs)"""
+    stats = None if 'error' in page_data else TextStats(page_data.get('full_text', ''))
+    keywords = pending_keywords(stats) if stats is not None else None
+    analysis = analyzer.analyze_page(page_data, keywords=keywords, stats=stats)
+    if 'error' not in analysis:
+        analysis['overall_score'] = analyzer.calculate_overall_score(analysis)
+
+    links = []
+    new_urls = []
+    if 'error' not in page_data:
+        crawler.link_sources = {}
+        crawler.record_link_sources(page_data)
+        links = [(link['url'], page_data['url'], link['text'], int(link['url'] in crawler.link_sources))
+                 for link in page_data['links']]
+
+        depth = page_data['depth']
+        if depth < crawler.max_depth:
+            for link in page_data['links']:
+                if link['is_internal']:
+                    state = 'queued' if crawler.is_allowed(link['url']) else 'disallowed'
+                    new_urls.append((link['url'], depth + 1, state))
+
+    stats_counts = stats.to_counts() if stats is not None else None
+    return crawler.compact_page_record(page_data), analysis, stats_counts, links, new_urls
+
+
+def run_worker(store, crawl_id, worker_id=None, batch_size=None, poll_interval=0.2):
+    """Crawl and analyze leased URLs until the crawl's frontier is exhausted; returns pages processed"""
+    crawl = store.get_crawl(crawl_id)
+    if crawl is None:
+        raise ValueError(f"Unknown crawl: {crawl_id}")
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    share = max(1, crawl['workers'])
+
+    crawler = build_crawler(crawl, share=share)
+    crawler.load_robots()
+    # All workers crawl the same site, so they split its request rate (and Crawl-delay) between them
+    bucket = crawler.host_limiter.bucket(crawler.base_url)
+    if bucket.rate > 0 and share > 1:
+        bucket.set_rate(bucket.rate / share)
+
+    analyzer = SEOAnalyzer(workers=0)
+    batch_size = batch_size or crawler.max_workers * 2
+    processed = 0
+
+    with ThreadPoolExecutor(max_workers=crawler.max_workers) as executor:
+        while True:
+            batch = store.claim(crawl_id, worker_id, batch_size)
+            if not batch:
+                if store.is_finished(crawl_id):
+                    break
+                # Other workers still hold leases and may yet discover more URLs
+                time.sleep(poll_interval)
+                continue
+
+            pages = executor.map(lambda item: crawler.fetch_page(item[1], item[2]), batch)
+            for (frontier_id, _, _), page_data in zip(batch, pages):
+                page_record, analysis, stats, links, new_urls = process_page(crawler, analyzer, page_data)
+                if store.complete(crawl_id, frontier_id, worker_id, page_record, analysis, stats,
+                                  links, new_urls, crawler.max_pages):
+                    processed += 1
+
+    print(f"Worker {worker_id} processed {processed} pages")
+    return processed
+
+
+def finish_crawl(store, crawl_id, analyzer=None):
+    """Check links, rank site keywords and summarize once all pages are in; same shape as run_audit's"""
+    crawl = store.get_crawl(crawl_id)
+    crawler = build_crawler(crawl)
+    site = StreamingSiteAnalysis(analyzer or SEOAnalyzer(workers=0))
+
+    for page_record, analysis, stats in store.results(crawl_id):
+        crawler.pages_data.append(page_record)
+        site.add_result(analysis, TextStats.from_counts(stats) if stats is not None else None)
+
+    for url, found_on, link_text, checkable in store.links(crawl_id):
+        crawler.all_links.add(url)
+        if checkable:
+            crawler.link_sources[url] = (found_on, link_text)
+    crawler.disallowed = store.disallowed(crawl_id)
+    crawler.sitemap_urls = crawl['sitemap_urls']
+
+    crawler.check_broken_links()
+    crawl_data = crawler.crawl_result()
+    return crawl_data, site.finish(crawl_data)
+
+
+def spawn_workers(db_path, crawl_id, count):
+    """Start count local worker processes for a crawl"""
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+    return [
+        subprocess.Popen([sys.executable, '-m', 'distributed', '--db', db_path, 'worker', crawl_id,
+                          '--worker-id', f"{socket.gethostname()}-{i}"], cwd=backend_dir)
+        for i in range(count)
+    ]
+
+
+def run_distributed_crawl(base_url, workers=2, db_path=None, **settings):
+    """Seed a crawl, run it on local worker processes and return (crawl_id, crawl_data, analysis)"""
+    store = DistributedCrawlStore(db_path)
+    crawl_id = start_crawl(store, base_url, workers=workers, **settings)
+    print(f"Crawl {crawl_id}: {workers} workers")
+
+    processes = spawn_workers(os.path.abspath(store.path), crawl_id, workers)
+    failed = [process.args for process in processes if process.wait() != 0]
+    if failed or not store.is_finished(crawl_id):
+        raise RuntimeError(f"Crawl {crawl_id} did not finish ({len(failed)} workers failed): "
+                           f"{store.progress(crawl_id)}")
+
+    crawl_data, analysis = finish_crawl(store, crawl_id)
+    return crawl_id, crawl_data, analysis
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Distributed SEO crawl over a shared SQLite frontier')
+    parser.add_argument('--db', default=None, help='shared database path (default: $DISTRIBUTED_DB_PATH)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    crawl = commands.add_parser('crawl', help='seed a crawl, run local workers and print the audit')
+    crawl.add_argument('url')
+    crawl.add_argument('--workers', type=int, default=2)
+    crawl.add_argument('--max-pages', type=int, default=10)
+    crawl.add_argument('--max-depth', type=int, default=2)
+    crawl.add_argument('--threads', type=int, default=4, help='concurrent fetches per worker')
+    crawl.add_argument('--requests-per-second', type=float, default=4.0, help='site-wide, shared by all workers')
+    crawl.add_argument('--output', help='write the full audit JSON here instead of printing a summary')
+
+    worker = commands.add_parser('worker', help='join a crawl as a worker')
+    worker.add_argument('crawl_id')
+    worker.add_argument('--worker-id', default=None)
+
+    args = parser.parse_args()
+    if args.command == 'worker':
+        run_worker(DistributedCrawlStore(args.db), args.crawl_id, worker_id=args.worker_id)
+        return
+
+    crawl_id, crawl_data, analysis = run_distributed_crawl(
+        args.url, workers=args.workers, db_path=args.db, max_pages=args.max_pages, max_depth=args.max_depth,
+        max_workers=args.threads, requests_per_second=args.requests_per_second
+    )
+    result = {'crawl_id': crawl_id, 'crawl_stats': {key: value for key, value in crawl_data.items() if key != 'pages'},
+              'analysis': analysis}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"Wrote {args.output}")
+    else:
+        print(json.dumps({'crawl_id': crawl_id, 'pages': crawl_data['total_pages_crawled'],
+                          'summary': analysis['summary']}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+import codecs
+import re
+
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+CHUNK_SIZE = 64 * 1024
+META_CHARSET = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.IGNORECASE)
+
+
+class NotHTMLError(Exception):
+    """Raised when a response turns out not to be an HTML page"""
+
+
+def media_type(response):
+    return response.headers.get('Content-Type', '').split(';', 1)[0].strip().lower()
+
+
+def is_html_response(response):
+    """True when the Content-Type says HTML, or is missing (the body is sniffed instead)"""
+    content_type = media_type(response)
+    return not content_type or content_type in HTML_CONTENT_TYPES
+
+
+def response_encoding(response, first_chunk):
+    """Charset from the Content-Type header, else a <meta charset> near the top, else requests' default"""
+    if 'charset=' in response.headers.get('Content-Type', '').lower():
+        encoding = response.encoding
+    else:
+        match = META_CHARSET.search(first_chunk[:2048])
+        encoding = match.group(1).decode('ascii') if match else response.encoding
+    try:
+        return codecs.lookup(encoding or 'utf-8').name
+    except LookupError:
+        return 'utf-8'
+
+
+def read_html(response, max_bytes):
+    """Stream and incrementally decode an HTML body, stopping after max_bytes.
+
+    The response must have been requested with stream=True. Returns (html, truncated);
+    raises NotHTMLError for non-HTML content before the body is downloaded (or, when
+    the Content-Type is missing, after its first chunk has been sniffed).
+    """
+    if not is_html_response(response):
+        raise NotHTMLError(f"Not an HTML page ({media_type(response)})")
+
+    decoder = None
+    parts = []
+    received = 0
+    truncated = False
+    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+        if decoder is None:
+            if not media_type(response) and chunk.lstrip()[:1] != b'<':
+                raise NotHTMLError("Not an HTML page (no Content-Type, body is not markup)")
+            decoder = codecs.getincrementaldecoder(response_encoding(response, chunk))(errors='replace')
+        if max_bytes and received + len(chunk) > max_bytes:
+            chunk = chunk[:max_bytes - received]
+            truncated = True
+        received += len(chunk)
+        parts.append(decoder.decode(chunk))
+        if truncated:
+            break  # early abort: the rest of the body is never downloaded
+
+    if decoder is not None:
+        parts.append(decoder.decode(b'', final=True))
+    return ''.join(parts), truncated
@@ -0,0 +1,204 @@
+import heapq
+import math
+import re
+from collections import deque, Counter
+from urllib.parse import urlparse
+
+NUMBER = re.compile(r'\d+')
+
+# Candidate URLs a priority frontier holds per page of crawl budget, so it has more to choose from than it crawls
+CANDIDATES_PER_PAGE = 20
+
+
+class CrawlFrontier:
+    """FIFO crawl frontier with O(1) duplicate detection on normalized URLs"""
+
+    def __init__(self, normalize, max_size=None):
+        self.normalize = normalize
+        self.max_size = max_size
+        self.queue = deque()  # (url, depth)
+        self.seen = set()     # normalized URLs ever enqueued
+        self.crawled = set()  # normalized URLs already fetched (or claimed for fetching)
+
+    def add(self, url, depth, force=False, priority=None):
+        """Enqueue a URL unless it was already seen or the frontier is full; returns True if added"""
+        normalized = self.normalize(url)
+        if normalized in self.seen:
+            return False
+        if not force and self.max_size is not None and len(self.seen) >= self.max_size:
+            return False
+        self.seen.add(normalized)
+        self.queue.append((url, depth))
+        return True
+
+    def pop(self):
+        return self.queue.popleft()
+
+    def to_state(self):
+        """JSON-serializable snapshot, for crawl checkpoints"""
+        return {'queue': list(self.queue), 'seen': list(self.seen), 'crawled': list(self.crawled)}
+
+    def load_state(self, state):
+        """Restore a snapshot taken with to_state()"""
+        self.queue = deque((url, depth) for url, depth in state['queue'])
+        self.seen = set(state['seen'])
+        self.crawled = set(state['crawled'])
+
+    def claim(self, url):
+        """Mark a URL as crawled; returns False if its normalized form was already crawled"""
+        normalized = self.normalize(url)
+        if normalized in self.crawled:
+            return False
+        self.crawled.add(normalized)
+        return True
+
+    def __len__(self):
+        return len(self.queue)
+
+    def __bool__(self):
+        return bool(self.queue)
+
+
+def url_pattern(normalized):
+    """URL with numbers masked, so /products/17 and /products/42 (or /page/2, /page/3) share a pattern"""
+    parsed = urlparse(normalized)
+    return parsed.netloc + NUMBER.sub('{n}', parsed.path)
+
+
+class PriorityFrontier:
+    """Heap-backed crawl frontier that pops the most valuable URL first instead of the oldest.
+
+    A URL's score rises with the number of pages linking to it and its sitemap
+    <priority>, and falls with crawl depth. Among equally scored URLs, those whose
+    pattern (pagination, product/facet IDs) was scheduled fewer times go first, so
+    a small page budget is spent on important pages and, between those, on distinct
+    ones. Novelty only breaks ties: it never outranks a better-linked page.
+
+    URLs are kept in one heap per pattern, ordered by their own score; a top-level
+    heap orders the patterns by their best URL, then by how often the pattern was
+    scheduled. Only the popped pattern's count changes on pop, so every operation
+    stays O(log n).
+    """
+
+    def __init__(self, normalize, max_size=None, depth_weight=1.0, inbound_weight=0.5, sitemap_weight=1.0):
+        self.normalize = normalize
+        self.max_size = max_size
+        self.depth_weight = depth_weight
+        self.inbound_weight = inbound_weight
+        self.sitemap_weight = sitemap_weight
+
+        self.pending = {}          # normalized -> [url, depth, sitemap priority, inbound links]
+        self.pattern_heaps = {}    # pattern -> heap of (-score, sequence, normalized); may hold stale entries
+        self.patterns = []         # heap of (-best score, times scheduled, sequence, pattern, version)
+        self.pattern_versions = Counter()
+        self.scheduled_patterns = Counter()
+        self.sequence = 0          # tie-breaker: equal scores pop in discovery order
+        self.seen = set()
+        self.crawled = set()
+
+    def score(self, normalized):
+        """Score of a waiting URL"""
+        url, depth, priority, inbound = self.pending[normalized]
+        return (self.inbound_weight * math.log1p(inbound)
+                + self.sitemap_weight * (priority if priority is not None else 0.5)
+                - self.depth_weight * depth)
+
+    def next_sequence(self):
+        self.sequence += 1
+        return self.sequence
+
+    def push(self, normalized):
+        """(Re)insert a URL at its current score and re-rank its pattern"""
+        pattern = url_pattern(normalized)
+        heap = self.pattern_heaps.setdefault(pattern, [])
+        heapq.heappush(heap, (-self.score(normalized), self.next_sequence(), normalized))
+        self.refresh(pattern)
+
+    def refresh(self, pattern):
+        """Drop stale entries from the top of a pattern's heap and re-rank the pattern"""
+        heap = self.pattern_heaps.get(pattern)
+        while heap and (heap[0][2] not in self.pending or -heap[0][0] != self.score(heap[0][2])):
+            heapq.heappop(heap)  # already popped, or superseded by a re-scored entry
+        self.pattern_versions[pattern] += 1
+        if not heap:
+            self.pattern_heaps.pop(pattern, None)
+            return
+        heapq.heappush(self.patterns, (heap[0][0], self.scheduled_patterns[pattern], self.next_sequence(),
+                                       pattern, self.pattern_versions[pattern]))
+
+    def add(self, url, depth, force=False, priority=None):
+        """Enqueue a URL, or record another inbound link to one still waiting; returns True if newly added"""
+        normalized = self.normalize(url)
+        if normalized in self.seen:
+            entry = self.pending.get(normalized)
+            if entry is not None:
+                # Another page links here: count it, and keep the shallowest depth it was found at
+                entry[1] = min(entry[1], depth)
+                if priority is not None:
+                    entry[2] = priority
+                entry[3] += 1
+                self.push(normalized)
+            return False
+        if not force and self.max_size is not None and len(self.seen) >= self.max_size:
+            return False
+        self.seen.add(normalized)
+        self.pending[normalized] = [url, depth, priority, 1]
+        self.push(normalized)
+        return True
+
+    def pop(self):
+        while self.patterns:
+            _, _, _, pattern, version = heapq.heappop(self.patterns)
+            if version != self.pattern_versions[pattern]:
+                continue  # the pattern was re-ranked since this entry was pushed
+            _, _, normalized = heapq.heappop(self.pattern_heaps[pattern])
+            url, depth, _, _ = self.pending.pop(normalized)
+            self.scheduled_patterns[pattern] += 1
+            self.refresh(pattern)
+            return url, depth
+        raise IndexError('pop from an empty frontier')
+
+    def claim(self, url):
+        """Mark a URL as crawled; returns False if its normalized form was already crawled"""
+        normalized = self.normalize(url)
+        if normalized in self.crawled:
+            return False
+        self.crawled.add(normalized)
+        return True
+
+    def to_state(self):
+        """JSON-serializable snapshot, for crawl checkpoints"""
+        return {
+            'pending': self.pending,
+            'pattern_heaps': self.pattern_heaps,
+            'patterns': self.patterns,
+            'pattern_versions': dict(self.pattern_versions),
+            'scheduled_patterns': dict(self.scheduled_patterns),
+            'sequence': self.sequence,
+            'seen': list(self.seen),
+            'crawled': list(self.crawled)
+        }
+
+    def load_state(self, state):
+        """Restore a snapshot taken with to_state(); pops continue in exactly the same order"""
+        self.pending = state['pending']
+        # JSON turns heap entries into lists; they must be tuples again to compare with new entries
+        self.pattern_heaps = {pattern: [tuple(entry) for entry in heap]
+                              for pattern, heap in state['pattern_heaps'].items()}
+        self.patterns = [tuple(entry) for entry in state['patterns']]
+        self.pattern_versions = Counter(state['pattern_versions'])
+        self.scheduled_patterns = Counter(state['scheduled_patterns'])
+        self.sequence = state['sequence']
+        self.seen = set(state['seen'])
+        self.crawled = set(state['crawled'])
+        if any(len(entry) != 5 for entry in self.patterns):
+            # Checkpoint taken when patterns were ranked by a penalized score: re-rank them
+            self.patterns = []
+            for pattern in list(self.pattern_heaps):
+                self.refresh(pattern)
+
+    def __len__(self):
+        return len(self.pending)
+
+    def __bool__(self):
+        return bool(self.pending)
@@ -0,0 +1,23 @@
+"""Gunicorn settings (read automatically from the working directory; Procfile flags override them).
+
+The app is imported once in the master and warmed up there, so workers fork with
+scikit-learn, reportlab and the text statistics already loaded: a new or restarted
+worker serves its first request immediately and shares those pages copy-on-write.
+Nothing the app creates at import time is fork-sensitive (background job threads
+start on first use, SQLite connections are opened per process). Background jobs
+run in the worker that accepted them, but their status and results live in the
+shared job store, so any number of workers can serve them.
+"""
+import os
+
+preload_app = True
+workers = int(os.environ.get('WEB_CONCURRENCY', '1'))
+threads = int(os.environ.get('GUNICORN_THREADS', '8'))
+
+
+def when_ready(server):
+    # Runs in the master after the app is loaded and before any worker is forked
+    if os.environ.get('WARM_UP', '1') != '0':
+        import app
+        app.warm_up()
+        server.log.info("Analysis and report dependencies loaded")
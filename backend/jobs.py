@@ -0,0 +1,251 @@
+import json
+import os
+import queue
+import threading
+import time
+import traceback
+import uuid
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+from sqlite_store import SQLiteStore, DATA_DIR
+
+DEFAULT_JOB_DB_PATH = os.path.join(DATA_DIR, 'jobs.db')
+
+# Progress is written to the job store on every stage change and otherwise at most this often (seconds)
+PROGRESS_SAVE_INTERVAL = 0.5
+
+
+class QueueFullError(Exception):
+    """Raised when the audit queue has no room for another job"""
+
+
+class AuditJob:
+    """State of one background audit"""
+
+    def __init__(self, params, job_id=None, store=None, run=None):
+        self.id = job_id or uuid.uuid4().hex
+        self.params = params
+        self.run = run  # runs the job instead of the queue's run_audit, if set
+        self.status = 'queued'  # queued -> running -> completed | failed
+        self.progress = {'stage': 'queued', 'pages_crawled': 0, 'links_checked': 0, 'links_total': 0}
+        self.result = None
+        self.error = None
+        self.created_at = datetime.now().isoformat()
+        self.started_at = None
+        self.finished_at = None
+        self.lock = threading.Lock()
+        self.store = store  # JobStore shared by all worker processes, or None
+        self.saved_at = 0.0
+
+    def update_progress(self, stage, done, total=None):
+        """Progress callback passed to the audit pipeline"""
+        with self.lock:
+            stage_changed = self.progress['stage'] != stage
+            self.progress['stage'] = stage
+            if stage == 'crawl':
+                self.progress['pages_crawled'] = done
+            elif stage == 'links':
+                self.progress['links_checked'] = done
+                if total is not None:
+                    self.progress['links_total'] = total
+            if self.store is not None and (stage_changed or time.monotonic() - self.saved_at >= PROGRESS_SAVE_INTERVAL):
+                self._save()
+
+    def save(self):
+        """Write the job's current state to its store, if it has one"""
+        with self.lock:
+            if self.store is not None:
+                self._save()
+
+    def _save(self):
+        # Called with self.lock held, so a stale snapshot can never overwrite a newer one
+        self.store.save(self)
+        self.saved_at = time.monotonic()
+
+    def to_dict(self):
+        with self.lock:
+            return {
+                'job_id': self.id,
+                'status': self.status,
+                'url': self.params.get('url'),
+                'progress': dict(self.progress),
+                'error': self.error,
+                'created_at': self.created_at,
+                'started_at': self.started_at,
+                'finished_at': self.finished_at
+            }
+
+
+class JobStore(SQLiteStore):
+    """Status, progress and results of background jobs in SQLite (WAL mode).
+
+    Jobs run in the process that accepted them, but every state change is written
+    here, so any worker process can answer status and result requests for any job.
+    """
+
+    SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    url TEXT,
+    status TEXT NOT NULL,
+    progress TEXT NOT NULL,
+    error TEXT,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT,
+    result BLOB
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_kind_created_at ON jobs (kind, created_at DESC);
+"""
+
+    def __init__(self, path=None, kind='audit'):
+        self.kind = kind  # jobs of different queues share the table, told apart by kind
+        super().__init__(path or os.environ.get('JOB_DB_PATH', DEFAULT_JOB_DB_PATH))
+
+    def save(self, job):
+        """Insert or update a job (the caller holds job.lock)"""
+        result = zlib.compress(json.dumps(job.result).encode('utf-8')) if job.result is not None else None
+        with self.connection() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO jobs (id, kind, url, status, progress, error, created_at, started_at, '
+                'finished_at, result) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (job.id, self.kind, job.params.get('url'), job.status, json.dumps(job.progress), job.error,
+                 job.created_at, job.started_at, job.finished_at, result)
+            )
+
+    def get(self, job_id):
+        """A job as last saved by whichever process runs it, or None"""
+        row = self.connection().execute('SELECT * FROM jobs WHERE id = ? AND kind = ?',
+                                        (job_id, self.kind)).fetchone()
+        if row is None:
+            return None
+        job = AuditJob({'url': row['url']}, job_id=row['id'])
+        job.status = row['status']
+        job.progress = json.loads(row['progress'])
+        job.error = row['error']
+        job.created_at = row['created_at']
+        job.started_at = row['started_at']
+        job.finished_at = row['finished_at']
+        if row['result'] is not None:
+            job.result = json.loads(zlib.decompress(row['result']).decode('utf-8'))
+        return job
+
+    def delete(self, job_id):
+        with self.connection() as conn:
+            conn.execute('DELETE FROM jobs WHERE id = ?', (job_id,))
+
+    def prune(self, keep):
+        """Forget all but the newest `keep` finished jobs of this kind"""
+        with self.connection() as conn:
+            conn.execute(
+                "DELETE FROM jobs WHERE kind = ? AND status IN ('completed', 'failed') AND id NOT IN "
+                "(SELECT id FROM jobs WHERE kind = ? ORDER BY created_at DESC LIMIT ?)",
+                (self.kind, self.kind, keep)
+            )
+
+
+class AuditJobQueue:
+    """Bounded queue of audits executed by a fixed pool of background worker threads.
+
+    The queue and its workers are per process. With a JobStore, job state is also
+    written to SQLite, and get() finds jobs run by other processes there.
+    """
+
+    def __init__(self, run_audit, workers=2, max_queued=20, max_retained=200, store=None):
+        self.run_audit = run_audit  # run_audit(progress_callback=..., **params) -> result dict
+        self.store = store
+        self.workers = max(1, workers)
+        self.queue = queue.Queue(maxsize=max_queued)
+        self.jobs = OrderedDict()
+        self.max_retained = max_retained
+        self.lock = threading.Lock()
+        self.threads = []
+
+    def _ensure_workers(self):
+        # Started lazily so importing the app (e.g. in a pre-forking server) does not spawn threads
+        with self.lock:
+            if self.threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker, name=f"audit-worker-{i}", daemon=True)
+                thread.start()
+                self.threads.append(thread)
+
+    def submit(self, params, run=None):
+        """Queue an audit (run with `run` instead of run_audit, if given); returns the job or raises QueueFullError"""
+        self._ensure_workers()
+        job = AuditJob(params, store=self.store, run=run)
+        # Stored before it is queued, so a worker's first update cannot be overwritten by this one
+        job.save()
+        with self.lock:
+            self.jobs[job.id] = job
+            # Forget the oldest finished jobs beyond the retention limit
+            while len(self.jobs) > self.max_retained:
+                oldest_id, oldest = next(iter(self.jobs.items()))
+                if oldest.status not in ('completed', 'failed'):
+                    break
+                del self.jobs[oldest_id]
+        try:
+            self.queue.put_nowait(job)
+        except queue.Full:
+            with self.lock:
+                del self.jobs[job.id]
+            if self.store is not None:
+                self.store.delete(job.id)
+            raise QueueFullError("Audit queue is full, try again later")
+        if self.store is not None:
+            self.store.prune(self.max_retained)
+        return job
+
+    def get(self, job_id):
+        """A job of this process, or (with a store) of any other; None if unknown"""
+        with self.lock:
+            job = self.jobs.get(job_id)
+        if job is None and self.store is not None:
+            job = self.store.get(job_id)
+        return job
+
+    def active_jobs(self):
+        """Jobs still queued or running"""
+        with self.lock:
+            return [job for job in self.jobs.values() if job.status in ('queued', 'running')]
+
+    def stats(self):
+        with self.lock:
+            statuses = [job.status for job in self.jobs.values()]
+        return {
+            'workers': self.workers,
+            'queued': statuses.count('queued'),
+            'running': statuses.count('running'),
+            'capacity': self.queue.maxsize
+        }
+
+    def _worker(self):
+        while True:
+            job = self.queue.get()
+            with job.lock:
+                job.status = 'running'
+                job.started_at = datetime.now().isoformat()
+            job.save()
+            try:
+                result = (job.run or self.run_audit)(progress_callback=job.update_progress, **job.params)
+                with job.lock:
+                    job.result = result
+                    job.status = 'completed'
+                    job.progress['stage'] = 'done'
+            except Exception as e:
+                print(f"Error during background audit {job.id}: {str(e)}")
+                traceback.print_exc()
+                with job.lock:
+                    job.error = str(e)
+                    job.status = 'failed'
+            finally:
+                with job.lock:
+                    job.finished_at = datetime.now().isoformat()
+                try:
+                    job.save()
+                except Exception as e:
+                    print(f"Error saving background job {job.id}: {str(e)}")
+                self.queue.task_done()
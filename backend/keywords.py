@@ -0,0 +1,101 @@
+TOP_KEYWORDS = 10
+MIN_WORDS = 10
+
+
+class SiteKeywordEngine:
+    """Site-level TF-IDF: one model fitted across every page of an audit.
+
+    IDF is computed over the whole site, so a page's top keywords are the terms
+    that distinguish it from the rest of the site rather than merely frequent ones.
+    Pages are added as TextStats, so the term counts come from the page's single
+    tokenization pass instead of a vectorizer re-tokenizing the text.
+    """
+
+    def __init__(self, top_n=TOP_KEYWORDS):
+        self.top_n = top_n
+        self.documents = []  # (index, TextStats) for pages with enough text to score
+
+    def add_document(self, index, stats):
+        if stats.word_count >= MIN_WORDS and stats.keyword_word_count >= MIN_WORDS:
+            self.documents.append((index, stats))
+
+    def extract(self, total):
+        """Fit once over all documents; returns a keyword analysis per index (None if not scored)"""
+        results = [None] * total
+        if not self.documents:
+            return results
+
+        term_counts = [stats.term_freq for _, stats in self.documents]
+        if not any(term_counts):
+            # Every page was stop words only - fall back to plain frequency
+            for index, stats in self.documents:
+                results[index] = frequency_keywords(stats)
+            return results
+
+        # scikit-learn is imported on first use so that starting the app does not load it
+        from sklearn.feature_extraction import DictVectorizer
+        from sklearn.feature_extraction.text import TfidfTransformer
+
+        # Sparse term-count matrix for the whole site, then one IDF fit
+        vectorizer = DictVectorizer()
+        counts = vectorizer.fit_transform(term_counts)
+        matrix = TfidfTransformer().fit_transform(counts).tocsr()
+        feature_names = vectorizer.get_feature_names_out()
+
+        for row, (index, stats) in enumerate(self.documents):
+            start, end = matrix.indptr[row], matrix.indptr[row + 1]
+            terms = matrix.indices[start:end]
+            scores = matrix.data[start:end]
+            ranked = sorted(zip(terms, scores), key=lambda x: (-x[1], x[0]))[:self.top_n]
+            results[index] = build_keywords([(feature_names[term], score) for term, score in ranked], stats)
+        return results
+
+
+def empty_keywords():
+    return {'top_keywords': [], 'keyword_density': {}}
+
+
+def pending_keywords(stats, top_n=TOP_KEYWORDS):
+    """Placeholder for a page scored before the site-wide fit: no keywords yet, only how many
+    a single-page fit would give it (the keyword score depends on nothing else)"""
+    if stats.word_count < MIN_WORDS or stats.keyword_word_count < MIN_WORDS:
+        count = 0
+    elif stats.term_freq:
+        count = min(top_n, len(stats.term_freq))
+    else:
+        count = min(top_n, len(stats.keyword_freq))
+    return dict(empty_keywords(), keyword_count=count)
+
+
+def build_keywords(keyword_scores, stats):
+    """Attach counts and densities (from the page's own words) to scored keywords"""
+    word_count = stats.keyword_word_count
+    word_freq = stats.keyword_freq
+
+    top_keywords = []
+    keyword_density = {}
+
+    for keyword, score in keyword_scores:
+        count = word_freq.get(keyword, 0)
+        density = round((count / word_count) * 100, 2)
+        top_keywords.append({
+            'keyword': keyword,
+            'tfidf_score': round(float(score), 3),
+            'count': count,
+            'density': density
+        })
+        keyword_density[keyword] = density
+
+    return {
+        'top_keywords': top_keywords,
+        'keyword_density': keyword_density
+    }
+
+
+def frequency_keywords(stats):
+    """Fallback: rank by simple frequency"""
+    top_words = stats.keyword_freq.most_common(TOP_KEYWORDS)
+    return {
+        'top_keywords': [{'keyword': w, 'count': c, 'density': 0} for w, c in top_words],
+        'keyword_density': {}
+    }
@@ -0,0 +1,143 @@
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import requests
+from throttle import HostLimiter
+from transport import get_probe_session
+from profiler import profiled_thread_initializer
+
+
+class LinkStatusCache:
+    """Thread-safe TTL cache of link status codes, shared across audits in the same process.
+
+    Failures that may be transient (0 = timeout/connection error, and 5xx) are kept only
+    for failure_ttl, so one network hiccup does not mark a link broken for the full ttl.
+    """
+
+    def __init__(self, ttl=3600, max_entries=50000, failure_ttl=60):
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, url):
+        with self.lock:
+            entry = self.entries.get(url)
+            if entry is None:
+                return None
+            status, expires = entry
+            if expires < time.monotonic():
+                del self.entries[url]
+                return None
+            self.entries.move_to_end(url)
+            return status
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def set(self, url, status):
+        ttl = self.failure_ttl if status == 0 or status >= 500 else self.ttl
+        if ttl <= 0:
+            return
+        with self.lock:
+            self.entries[url] = (status, time.monotonic() + ttl)
+            self.entries.move_to_end(url)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+
+# Process-wide cache so popular external URLs are not re-probed on every audit
+status_cache = LinkStatusCache()
+
+
+class LinkChecker:
+    """Checks many links concurrently over pooled keep-alive connections"""
+
+    def __init__(self, headers=None, max_workers=16, max_per_host=4, requests_per_second=None,
+                 timeout=5, cache=status_cache, session=None, limiters=None):
+        self.headers = headers or {}
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.cache = cache
+        if requests_per_second is None:
+            requests_per_second = float(os.environ.get('LINK_CHECK_REQUESTS_PER_SECOND', '10.0'))
+        self.host_limiter = HostLimiter(max_per_host=max_per_host, requests_per_second=requests_per_second)
+        # host -> HostLimiter used instead of our own, e.g. the crawler's for the audited site
+        self.limiters = limiters or {}
+        self.session = session or get_probe_session()
+
+    def check_status(self, url):
+        """Get the HTTP status for a link (0 if unreachable), served from the cache when fresh"""
+        if self.cache is not None:
+            cached = self.cache.get(url)
+            if cached is not None:
+                return cached
+
+        limiter = self.limiters.get(self.host_limiter.host(url), self.host_limiter)
+        with limiter.slot(url):
+            status = self._probe(url)
+
+        if self.cache is not None:
+            self.cache.set(url, status)
+        return status
+
+    def _probe(self, url):
+        try:
+            # Try HEAD request first (faster)
+            response = self.session.head(url, headers=self.headers, timeout=self.timeout, allow_redirects=True)
+            status = response.status_code
+
+            # If HEAD fails with 405 (Method Not Allowed), try GET
+            if status == 405:
+                response = self.session.get(url, headers=self.headers, timeout=self.timeout,
+                                            allow_redirects=True, stream=True)
+                status = response.status_code
+                response.close()
+
+            return status
+
+        except requests.exceptions.Timeout:
+            return 0  # Timeout
+        except requests.exceptions.ConnectionError:
+            return 0  # Connection failed
+        except:
+            # Try GET as fallback
+            try:
+                response = self.session.get(url, headers=self.headers, timeout=self.timeout,
+                                            allow_redirects=True, stream=True)
+                response.close()
+                return response.status_code
+            except:
+                return 0  # Connection failed
+
+    def check_all(self, urls, on_checked=None):
+        """Check a batch of URLs concurrently, returning {url: status_code}
+
+        on_checked(url, status, done) is called as each URL finishes, with the number checked so far.
+        """
+        urls = list(dict.fromkeys(urls))
+
+        # Interleave hosts so a single slow host does not occupy every worker
+        by_host = OrderedDict()
+        for url in urls:
+            by_host.setdefault(self.host_limiter.host(url), deque()).append(url)
+        ordered = []
+        host_queues = list(by_host.values())
+        while host_queues:
+            for queue in host_queues:
+                ordered.append(queue.popleft())
+            host_queues = [q for q in host_queues if q]
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers, initializer=profiled_thread_initializer()) as executor:
+            futures = {executor.submit(self.check_status, url): url for url in ordered}
+            for future in as_completed(futures):
+                url = futures[future]
+                results[url] = future.result()
+                if on_checked:
+                    on_checked(url, results[url], len(results))
+        return {url: results[url] for url in ordered}
@@ -0,0 +1,199 @@
+import re
+from lxml import etree
+
+HEADING_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+HIDDEN_TEXT_TAGS = ('script', 'style', 'noscript')
+# BeautifulSoup's get_text() skips script/style strings, so captured heading/link text does too
+NON_TEXT_TAGS = ('script', 'style')
+
+# An element whose attributes are extracted, repeating one of those attributes. libxml2 keeps the
+# first value and BeautifulSoup the last, so such pages are left to the BeautifulSoup backend
+DUPLICATE_ATTRIBUTE = re.compile(
+    r'<(?:a|img|meta|link)\b[^>]*?[\s"\'/](href|src|alt|title|name|property|content|rel)\s*=[^>]*?[\s"\'/]\1\s*=',
+    re.IGNORECASE)
+
+
+# Elements libxml2 parses as raw text, where html.parser (and so BeautifulSoup) still parses tags
+RAW_TEXT_ELEMENT = re.compile(r'<(title|textarea|iframe|xmp|plaintext|noembed|noframes)\b[^>]*>', re.IGNORECASE)
+RAW_TEXT_END = {tag: re.compile(rf'</{tag}', re.IGNORECASE) for tag in
+                ('title', 'textarea', 'iframe', 'xmp', 'plaintext', 'noembed', 'noframes')}
+MARKUP = re.compile(r'<[a-zA-Z!/?]')
+
+
+class UnsupportedMarkupError(ValueError):
+    """The two parsers would build different trees for this page: extract it with BeautifulSoup"""
+
+
+class DuplicateAttributeError(UnsupportedMarkupError):
+    """The page repeats an attribute the extractor reads (see DUPLICATE_ATTRIBUTE)"""
+
+
+class RawTextMarkupError(UnsupportedMarkupError):
+    """Markup (tags or comments) inside an element libxml2 reads as raw text (see RAW_TEXT_ELEMENT)"""
+
+
+def raw_text_markup(html_content):
+    """True if a raw-text element (<title>, <textarea>, <iframe>, ...) contains markup"""
+    for match in RAW_TEXT_ELEMENT.finditer(html_content):
+        end = RAW_TEXT_END[match.group(1).lower()].search(html_content, match.end())
+        if MARKUP.search(html_content, match.end(), end.start() if end else len(html_content)):
+            return True
+    return False
+
+
+class _Capture:
+    """Text being collected for an open element (heading, link or title)"""
+
+    def __init__(self, tag, target):
+        self.tag = tag
+        self.target = target  # dict that receives the text on close
+        self.parts = []
+        self.children = 0     # child nodes, to mirror BeautifulSoup's `.string` rule for <title>
+        self.in_string = False
+
+
+class _ExtractionTarget:
+    """lxml parser target that gathers every SEO field in a single streaming pass"""
+
+    def __init__(self):
+        self.title = None
+        self.title_seen = False
+        self.meta_description = None
+        self.meta_keywords = None
+        self.robots_meta = None
+        self.canonical = None
+        self.og_tags = {}
+        self.twitter_tags = {}
+        self.headings = {tag: [] for tag in HEADING_TAGS}
+        self.anchors = []
+        self.images = []
+        self.text_parts = []
+        self.hidden_depth = 0
+        self.non_text_depth = 0
+        self.template_depth = 0  # <template> content is inert: no text, links, images or metadata
+        self.captures = []
+
+    def start(self, tag, attrib):
+        if not isinstance(tag, str):
+            return
+        if tag == 'template' or self.template_depth:
+            self.template_depth += tag == 'template'
+            return
+        for capture in self.captures:
+            capture.children += 1
+            capture.in_string = False
+
+        if tag in HIDDEN_TEXT_TAGS:
+            self.hidden_depth += 1
+            if tag in NON_TEXT_TAGS:
+                self.non_text_depth += 1
+        elif tag == 'meta':
+            self._meta(attrib)
+        elif tag == 'link':
+            if self.canonical is None and 'canonical' in attrib.get('rel', '').split():
+                self.canonical = attrib.get('href', '')
+        elif tag == 'img':
+            alt = attrib.get('alt', '')
+            self.images.append({
+                'src': attrib.get('src', ''),
+                'alt': alt,
+                'has_alt': bool(alt),
+                'title': attrib.get('title', '')
+            })
+        elif tag == 'a' and 'href' in attrib:
+            anchor = {'href': attrib['href'], 'text': ''}
+            self.anchors.append(anchor)
+            self.captures.append(_Capture(tag, anchor))
+        elif tag in HEADING_TAGS:
+            heading = {'text': ''}
+            self.headings[tag].append(heading)
+            self.captures.append(_Capture(tag, heading))
+        elif tag == 'title' and not self.title_seen:
+            self.title_seen = True
+            self.captures.append(_Capture(tag, None))
+
+    def _meta(self, attrib):
+        name = attrib.get('name')
+        prop = attrib.get('property')
+        if name == 'description' and self.meta_description is None:
+            self.meta_description = attrib.get('content', '').strip()
+        elif name == 'keywords' and self.meta_keywords is None:
+            self.meta_keywords = attrib.get('content', '').strip()
+        elif name == 'robots' and self.robots_meta is None:
+            self.robots_meta = attrib.get('content', '')
+        if prop and prop.startswith('og:'):
+            self.og_tags[prop] = attrib.get('content', '')
+        if name and name.startswith('twitter:'):
+            self.twitter_tags[name] = attrib.get('content', '')
+
+    def end(self, tag):
+        if not isinstance(tag, str):
+            return
+        if self.template_depth:
+            self.template_depth -= tag == 'template'
+            return
+        if tag in HIDDEN_TEXT_TAGS:
+            self.hidden_depth = max(0, self.hidden_depth - 1)
+            if tag in NON_TEXT_TAGS:
+                self.non_text_depth = max(0, self.non_text_depth - 1)
+        # Close the innermost open capture for this tag
+        for i in range(len(self.captures) - 1, -1, -1):
+            capture = self.captures[i]
+            if capture.tag == tag:
+                del self.captures[i]
+                text = ''.join(capture.parts)
+                if tag == 'title':
+                    # BeautifulSoup's `.string` is only set when the title has a single child string
+                    self.title = text.strip() if capture.children == 1 else ''
+                else:
+                    capture.target['text'] = text.strip()
+                break
+
+    def data(self, data):
+        if self.template_depth:
+            return
+        for capture in self.captures:
+            if not self.non_text_depth:
+                capture.parts.append(data)
+            if not capture.in_string:
+                capture.children += 1
+                capture.in_string = True
+        if not self.hidden_depth:
+            self.text_parts.append(data)
+
+    def comment(self, text):
+        if self.template_depth:
+            return
+        for capture in self.captures:
+            capture.children += 1
+            capture.in_string = False
+
+    def close(self):
+        # Flush captures for elements that were never closed
+        for capture in list(reversed(self.captures)):
+            self.end(capture.tag)
+
+        return {
+            'title': self.title or '',
+            'meta_description': self.meta_description or '',
+            'meta_keywords': self.meta_keywords or '',
+            'canonical': self.canonical or '',
+            'og_tags': self.og_tags,
+            'twitter_tags': self.twitter_tags,
+            'robots_meta': self.robots_meta or '',
+            'headings': {tag: [h['text'] for h in items] for tag, items in self.headings.items()},
+            'anchors': [(a['href'], a['text']) for a in self.anchors],
+            'images': self.images,
+            'text': ''.join(self.text_parts)
+        }
+
+
+def extract_fields(html_content):
+    """Extract raw SEO fields from HTML in one pass using lxml's event-driven parser"""
+    if DUPLICATE_ATTRIBUTE.search(html_content):
+        raise DuplicateAttributeError("duplicate attribute on an extracted element")
+    if raw_text_markup(html_content):
+        raise RawTextMarkupError("markup inside a raw-text element")
+    parser = etree.HTMLParser(target=_ExtractionTarget(), remove_comments=False)
+    parser.feed(html_content)
+    return parser.close()
@@ -0,0 +1,188 @@
+import threading
+import time
+from contextlib import contextmanager
+
+# Latency buckets in seconds: sub-millisecond analysis steps up to multi-minute audits
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    pairs = ','.join(f'{name}="{_escape(value)}"' for name, value in labels)
+    return '{' + pairs + '}'
+
+
+def _format_value(value):
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    """Monotonic counter, optionally split by labels"""
+
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def samples(self):
+        with self.lock:
+            values = dict(self.values)
+        for key, value in sorted(values.items()):
+            yield self.name, tuple(zip(self.labelnames, key)), value
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram (Prometheus semantics), optionally split by labels"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self.series = {}  # label values -> [per-bucket counts (+Inf last), sum, count]
+        self.lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        with self.lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            counts = series[0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+            series[1] += value
+            series[2] += 1
+
+    def samples(self):
+        with self.lock:
+            series = {key: ([list(s[0])] + s[1:]) for key, s in self.series.items()}
+        for key, (counts, total, count) in sorted(series.items()):
+            labels = tuple(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else _format_value(bound)
+                yield self.name + '_bucket', labels + (('le', le),), cumulative
+            yield self.name + '_sum', labels, total
+            yield self.name + '_count', labels, count
+
+
+class CallbackMetric:
+    """Counter or gauge whose value is read from elsewhere (e.g. a cache's hit count) when scraped"""
+
+    def __init__(self, name, documentation, callback, kind='gauge'):
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+        self.kind = kind
+
+    def samples(self):
+        yield self.name, (), self.callback()
+
+
+class Registry:
+    """The metrics exposed on /metrics"""
+
+    def __init__(self):
+        self.metrics = []
+        self.lock = threading.Lock()
+
+    def register(self, metric):
+        with self.lock:
+            self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        with self.lock:
+            metrics = list(self.metrics)
+        for metric in metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for name, labels, value in metric.samples():
+                lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    'seo_stage_duration_seconds', 'Time spent per call in each audit pipeline stage', ('stage',)))
+AUDIT_SECONDS = REGISTRY.register(Histogram(
+    'seo_audit_duration_seconds', 'End-to-end audit time', ('outcome',)))
+QUICK_CHECK_SECONDS = REGISTRY.register(Histogram(
+    'seo_quick_check_duration_seconds', 'Time to answer a quick check (deferred content metrics excluded)',
+    ('outcome',)))
+AUDITS = REGISTRY.register(Counter('seo_audits_total', 'Audits run, by outcome', ('outcome',)))
+PAGES_CRAWLED = REGISTRY.register(Counter(
+    'seo_pages_crawled_total', 'Pages crawled, by result (ok, not_modified, error)', ('result',)))
+LINKS_CHECKED = REGISTRY.register(Counter('seo_links_checked_total', 'Links checked for the broken link report'))
+BROKEN_LINKS = REGISTRY.register(Counter('seo_broken_links_total', 'Broken links found'))
+
+
+class StageTimings:
+    """Per-audit totals of the time spent in each stage.
+
+    Stages nest (content_seo includes sentiment and readability, analyze_page
+    includes content_seo), and fetch/parse run on several threads at once, so
+    the stage totals can add up to more than the audit's wall time.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages = {}  # stage -> [seconds, calls]
+        self.lock = threading.Lock()
+
+    def add(self, stage, seconds):
+        with self.lock:
+            entry = self.stages.get(stage)
+            if entry is None:
+                self.stages[stage] = [seconds, 1]
+            else:
+                entry[0] += seconds
+                entry[1] += 1
+
+    def to_dict(self):
+        with self.lock:
+            stages = {stage: {'seconds': round(seconds, 4), 'calls': calls}
+                      for stage, (seconds, calls) in self.stages.items()}
+        return {'total_seconds': round(time.perf_counter() - self.started, 3), 'stages': stages}
+
+
+def record(stage, seconds, timings=None):
+    """Record one call of a stage in the histogram (and in an audit's timings, if given)"""
+    STAGE_SECONDS.observe(seconds, stage=stage)
+    if timings is not None:
+        timings.add(stage, seconds)
+
+
+@contextmanager
+def timed(stage, timings=None):
+    """Time the enclosed block as one call of a stage"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - start, timings)
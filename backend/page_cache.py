@@ -0,0 +1,89 @@
+import json
+import os
+import zlib
+from datetime import datetime
+from sqlite_store import SQLiteStore, DATA_DIR
+
+DEFAULT_CACHE_PATH = os.path.join(DATA_DIR, 'page_cache.db')
+
+
+def _pack(value):
+    return zlib.compress(json.dumps(value).encode('utf-8'))
+
+
+def _unpack(blob):
+    return json.loads(zlib.decompress(blob).decode('utf-8')) if blob is not None else None
+
+
+class PageCache(SQLiteStore):
+    """On-disk HTTP cache for incremental re-audits.
+
+    Keyed by normalized URL, each entry keeps the page's ETag/Last-Modified
+    validators, its extracted page_data and (once analyzed) its page analysis
+    with the analyzer version and settings that produced it. The crawler sends
+    conditional requests from the validators; on a 304 the stored page_data is
+    reused instead of re-parsing the page, and the analysis too if it was made
+    by the same analyzer version and settings.
+    """
+
+    SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    page_data BLOB NOT NULL,
+    analysis BLOB,
+    analysis_version TEXT,
+    updated_at TEXT NOT NULL
+);
+"""
+
+    def __init__(self, path=None):
+        super().__init__(path or os.environ.get('PAGE_CACHE_PATH', DEFAULT_CACHE_PATH))
+        with self.connection() as conn:
+            columns = [row['name'] for row in conn.execute('PRAGMA table_info(pages)')]
+            if 'analysis_version' not in columns:
+                # Caches created before analyses were versioned: their analyses are never reused
+                conn.execute('ALTER TABLE pages ADD COLUMN analysis_version TEXT')
+
+    def get(self, key):
+        """Cached entry for a normalized URL, or None"""
+        row = self.connection().execute(
+            'SELECT etag, last_modified, page_data, analysis, analysis_version FROM pages WHERE url = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            'etag': row['etag'],
+            'last_modified': row['last_modified'],
+            'page_data': _unpack(row['page_data']),
+            'analysis': _unpack(row['analysis']),
+            'analysis_version': row['analysis_version']
+        }
+
+    def conditional_headers(self, entry):
+        """If-None-Match / If-Modified-Since headers for revalidating a cached entry"""
+        headers = {}
+        if entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store_page(self, key, etag, last_modified, page_data):
+        """Cache a freshly fetched page (replacing any previous entry and its analysis)"""
+        if not etag and not last_modified:
+            return  # nothing to revalidate with next time
+        with self.connection() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO pages (url, etag, last_modified, page_data, analysis, analysis_version, '
+                'updated_at) VALUES (?, ?, ?, ?, NULL, NULL, ?)',
+                (key, etag, last_modified, _pack(page_data), datetime.now().isoformat())
+            )
+
+    def store_analyses(self, keys, pages_analysis, version):
+        """Attach page analyses made by analyzer `version` to their cached pages (pages without a cache entry are ignored)"""
+        rows = [(_pack(analysis), version, key) for key, analysis in zip(keys, pages_analysis)
+                if 'error' not in analysis]
+        with self.connection() as conn:
+            conn.executemany('UPDATE pages SET analysis = ?, analysis_version = ? WHERE url = ?', rows)
@@ -0,0 +1,148 @@
+import os
+import sys
+import threading
+import time
+import weakref
+from collections import Counter
+
+# Sampling period; every thread's stack is captured once per interval
+DEFAULT_INTERVAL = float(os.environ.get('PROFILE_INTERVAL_MS', '5')) / 1000
+
+# Modules whose functions are broken out in the profile summary
+FOCUS_MODULES = ('crawler', 'analyzer', 'report_generator')
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# The profiler of the audit running in this thread, if any (set in pool threads it starts too)
+_local = threading.local()
+
+
+def current_profiler():
+    return getattr(_local, 'profiler', None)
+
+
+def profiled_thread_initializer():
+    """ThreadPoolExecutor initializer that adds the pool's threads to the current thread's profile (None when not profiling)"""
+    profiler = current_profiler()
+    return profiler.add_current_thread if profiler is not None else None
+
+
+class SamplingProfiler:
+    """Wall-clock sampling profiler for one audit (or export), run as a context manager.
+
+    A background thread snapshots stacks with sys._current_frames() each interval,
+    so the profiled code runs unmodified and the cost is one stack walk per thread
+    per sample. Only the thread that started the profiler and the pool threads
+    started under it (see profiled_thread_initializer) are sampled, so concurrent
+    requests stay out of the profile, and only stacks passing through this app's
+    own code are kept, which drops idle pool threads.
+    """
+
+    def __init__(self, interval=DEFAULT_INTERVAL, max_depth=128):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks = Counter()  # (root frame, ..., leaf frame) -> samples
+        self.ticks = 0
+        self.started = None
+        self.elapsed = 0.0
+        self.labels = {}  # code object -> (label, module, first line, is app code)
+        self.stop_event = threading.Event()
+        self.thread = None
+        # Threads belonging to the profiled work, kept as objects: a dead thread's ident can be
+        # reused by an unrelated thread, but a Thread object is never alive again
+        self.threads = weakref.WeakSet()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def add_current_thread(self):
+        """Sample the calling thread, and the pool threads it starts, from now on"""
+        self.threads.add(threading.current_thread())
+        _local.profiler = self
+
+    def start(self):
+        self.add_current_thread()
+        self.started = time.perf_counter()
+        self.thread = threading.Thread(target=self.run, name='audit-profiler', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join()
+        self.elapsed = time.perf_counter() - self.started
+        _local.profiler = None
+
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            self.ticks += 1
+            frames = sys._current_frames()
+            for thread in list(self.threads):
+                frame = frames.get(thread.ident) if thread.is_alive() else None
+                if frame is not None:
+                    self.sample(frame)
+
+    def sample(self, frame):
+        stack = []
+        in_app = False
+        while frame is not None and len(stack) < self.max_depth:
+            code = frame.f_code
+            info = self.labels.get(code)
+            if info is None:
+                info = self.labels[code] = self.describe(code)
+            stack.append(info)
+            in_app = in_app or info[3]
+            frame = frame.f_back
+        if in_app:
+            self.stacks[tuple(reversed(stack))] += 1
+
+    def describe(self, code):
+        filename = os.path.abspath(code.co_filename)
+        module = os.path.splitext(os.path.basename(filename))[0]
+        return f'{module}:{code.co_name}', module, code.co_firstlineno, filename.startswith(APP_DIR + os.sep)
+
+    def folded(self):
+        """Collapsed stacks ("root;...;leaf count" per line), the input format of flamegraph.pl and speedscope"""
+        return ''.join(f"{';'.join(info[0] for info in stack)} {count}\n"
+                       for stack, count in self.stacks.most_common())
+
+    def summary(self, top=50):
+        """Sample totals and the hottest functions of the focus modules (self and inclusive time)"""
+        seconds_per_sample = self.elapsed / self.ticks if self.ticks else self.interval
+        functions = {}  # (label, line) -> [self samples, total samples, module]
+        modules = {module: 0 for module in FOCUS_MODULES}
+        for stack, count in self.stacks.items():
+            seen = set()
+            for info in stack:
+                label, module, line, _ = info
+                if module not in modules or (label, line) in seen:
+                    continue
+                seen.add((label, line))
+                functions.setdefault((label, line), [0, 0, module])[1] += count
+            for module in {info[1] for info in stack if info[1] in modules}:
+                modules[module] += count
+            leaf = stack[-1]
+            if leaf[1] in modules:
+                functions[(leaf[0], leaf[2])][0] += count
+
+        hottest = sorted(functions.items(), key=lambda item: (-item[1][1], -item[1][0], item[0]))[:top]
+        return {
+            'duration_seconds': round(self.elapsed, 3),
+            'interval_seconds': self.interval,
+            'ticks': self.ticks,
+            'samples': sum(self.stacks.values()),
+            'modules': {module: {'samples': samples, 'seconds': round(samples * seconds_per_sample, 3)}
+                        for module, samples in modules.items()},
+            'functions': [{
+                'function': label,
+                'module': module,
+                'line': line,
+                'self_samples': self_samples,
+                'total_samples': total_samples,
+                'self_seconds': round(self_samples * seconds_per_sample, 3),
+                'total_seconds': round(total_samples * seconds_per_sample, 3)
+            } for (label, line), (self_samples, total_samples, module) in hottest]
+        }
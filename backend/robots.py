@@ -0,0 +1,74 @@
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from urllib.robotparser import RobotFileParser
+
+
+class RobotsCache:
+    """Thread-safe TTL cache of parsed robots.txt files per site, shared across audits in the same process"""
+
+    def __init__(self, ttl=3600, max_entries=1000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, site, session, headers=None, timeout=10):
+        """Parsed robots.txt for a site ("scheme://host"), fetching it when missing or stale"""
+        with self.lock:
+            entry = self.entries.get(site)
+            if entry is not None and entry[1] >= time.monotonic():
+                self.entries.move_to_end(site)
+                return entry[0]
+
+        rules = fetch_robots(site, session, headers=headers, timeout=timeout)
+
+        with self.lock:
+            self.entries[site] = (rules, time.monotonic() + self.ttl)
+            self.entries.move_to_end(site)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return rules
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+def fetch_robots(site, session, headers=None, timeout=10):
+    """Fetch and parse a site's robots.txt with the same status rules as RobotFileParser.read()"""
+    rules = RobotFileParser(site + '/robots.txt')
+    # can_fetch() refuses everything until the rules are marked as read
+    rules.modified()
+    try:
+        response = session.get(rules.url, headers=headers, timeout=timeout)
+    except Exception as e:
+        print(f"Could not fetch {rules.url}: {str(e)}")
+        rules.allow_all = True
+        return rules
+
+    if response.status_code in (401, 403):
+        rules.disallow_all = True
+    elif response.status_code >= 400:
+        # Missing robots.txt allows everything; server errors are treated leniently too
+        rules.allow_all = True
+    else:
+        rules.parse([round_crawl_delay(line) for line in response.text.splitlines()])
+    return rules
+
+
+CRAWL_DELAY = re.compile(r'^(\s*crawl-delay\s*:\s*)(\d*\.\d+)', re.IGNORECASE)
+
+
+def round_crawl_delay(line):
+    """RobotFileParser ignores fractional Crawl-delay values; round them up to whole seconds instead"""
+    match = CRAWL_DELAY.match(line)
+    if match:
+        return f"{match.group(1)}{max(1, math.ceil(float(match.group(2))))}"
+    return line
+
+
+# Process-wide cache so repeat audits of a site do not refetch robots.txt
+robots_cache = RobotsCache()
@@ -0,0 +1,305 @@
+import hashlib
+import importlib.util
+import os
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from xml.etree import ElementTree
+
+# Longer pages are scored on evenly spaced windows totalling this many words (0 scores every word)
+MAX_WORDS = int(os.environ.get('SENTIMENT_MAX_WORDS', '10000'))
+SAMPLE_WINDOWS = 10
+
+# TextBlob's tokenizer rules (textblob/_text.py find_tokens), applied to one whitespace token at a time
+PUNCTUATION = ".,;:!?()[]{}`''\"@#$^&*+-|=~_"
+LEADING_PUNCTUATION = tuple(PUNCTUATION.replace('.', ''))
+TRAILING_PUNCTUATION = LEADING_PUNCTUATION + ('.',)
+ABBREVIATIONS = {
+    'a.', 'adj.', 'adv.', 'al.', 'a.m.', 'c.', 'cf.', 'comp.', 'conf.', 'def.', 'ed.', 'e.g.', 'esp.',
+    'etc.', 'ex.', 'f.', 'fig.', 'gen.', 'id.', 'i.e.', 'int.', 'l.', 'm.', 'Med.', 'Mil.', 'Mr.', 'n.',
+    'n.q.', 'orig.', 'pl.', 'pred.', 'pres.', 'p.m.', 'ref.', 'v.', 'vs.', 'w/'
+}
+ABBREVIATION_PATTERNS = (
+    re.compile(r'^[A-Za-z]\.$'),
+    re.compile(r'^([A-Za-z]\.)+$'),
+    re.compile('^[A-Z][' + '|'.join('bcdfghjklmnpqrstvwxz') + ']+.$'),
+)
+CONTRACTIONS = ("'d", "'m", "'s", "'ll", "'re", "'ve", "n't")
+QUOTES = ('“', '”', '‘', '’', "'", '"')
+EMOTICONS = (  # in TextBlob's order: the first mood containing an emoticon gives its polarity
+    (+1.00, ('<3', '♥')),
+    (+1.00, ('>:D', ':-D', ':D', '=-D', '=D', 'X-D', 'x-D', 'XD', 'xD', '8-D')),
+    (+0.75, ('>:P', ':-P', ':P', ':-p', ':p', ':-b', ':b', ':c)', ':o)', ':^)')),
+    (+0.50, ('>:)', ':-)', ':)', '=)', '=]', ':]', ':}', ':>', ':3', '8)', '8-)')),
+    (+0.25, ('>;]', ';-)', ';)', ';-]', ';]', ';D', ';^)', '*-)', '*)')),
+    (+0.05, ('>:o', ':-O', ':O', ':o', ':-o', 'o_O', 'o.O', '°O°', '°o°')),
+    (-0.25, ('>:/', ':-/', ':/', ':\\', '>:\\', ':-.', ':-s', ':s', ':S', ':-S', '>.>')),
+    (-0.75, ('>:[', ':-(', ':(', '=(', ':-[', ':[', ':{', ':-<', ':c', ':-c', '=/')),
+    (-1.00, (":'(", ":'''(", ";'(")),
+)
+EMOTICON_PATTERN = re.compile('(%s)($|\\s)' % '|'.join(
+    ' ?'.join(re.escape(c) for c in emoticon) for _, emoticons in EMOTICONS for emoticon in emoticons))
+SARCASM_PATTERN = re.compile(r'\( ?\! ?\)')
+PARAGRAPH_BREAK = re.compile(r'\n{2,}')  # TextBlob ends a sentence here, so emoticons are not joined across it
+
+EMOTICON_POLARITY = {}
+for _polarity, _emoticons in EMOTICONS:
+    for _emoticon in _emoticons:
+        EMOTICON_POLARITY.setdefault(_emoticon.lower(), _polarity)
+
+NEGATIONS = ('no', 'not', "n't", 'never')
+
+
+def textblob_data_path(filename):
+    """Path of a data file shipped with textblob, found without importing it (and NLTK with it)"""
+    spec = importlib.util.find_spec('textblob')
+    return os.path.join(spec.submodule_search_locations[0], 'en', filename)
+
+
+def load_lexicon(path=None):
+    """TextBlob's English sentiment lexicon: word -> (polarity, intensity, is_modifier)
+
+    Built the way textblob.en.Sentiment.load builds it: word senses are averaged per
+    part of speech and then across parts of speech, and every adjective also gets an
+    "-ly" adverb form. Scoring untagged text only ever uses the part-of-speech-free entry.
+    """
+    words = {}
+    for element in ElementTree.parse(path or textblob_data_path('en-sentiment.xml')).getroot().findall('word'):
+        form = element.attrib.get('form')
+        if form:
+            scores = (float(element.attrib.get('polarity', 0.0)), float(element.attrib.get('subjectivity', 0.0)),
+                      float(element.attrib.get('intensity', 1.0)))
+            words.setdefault(form, {}).setdefault(element.attrib.get('pos'), []).append(scores)
+
+    def average(values):
+        return sum(values) / len(values)
+
+    for form, senses in words.items():
+        words[form] = {pos: [average(each) for each in zip(*scores)] for pos, scores in senses.items()}
+    for form, senses in words.items():
+        senses[None] = [average(each) for each in zip(*senses.values())]
+    for form, senses in list(words.items()):
+        if 'JJ' in senses:
+            if form.endswith('y'):
+                form = form[:-1] + 'i'
+            if form.endswith('le'):
+                form = form[:-2]
+            adverb = words.setdefault(form + 'ly', {})
+            adverb['RB'] = adverb[None] = senses['JJ']
+
+    return {form: (senses[None][0], senses[None][2], 'RB' in senses) for form, senses in words.items()}
+
+
+def _split_punctuation(token):
+    """Split leading and trailing punctuation off a token the way TextBlob does"""
+    pieces, tail = [], []
+    while token.startswith(LEADING_PUNCTUATION) and token not in CONTRACTIONS:
+        pieces.append(token[0])
+        token = token[1:]
+    while token.endswith(TRAILING_PUNCTUATION) and token not in CONTRACTIONS:
+        if token.endswith(LEADING_PUNCTUATION):
+            tail.append(token[-1])
+            token = token[:-1]
+        if token.endswith('...'):
+            tail.append('...')
+            token = token[:-3].rstrip('.')
+        if token.endswith('.'):
+            if token in ABBREVIATIONS or any(p.match(token) for p in ABBREVIATION_PATTERNS):
+                break
+            tail.append(token[-1])
+            token = token[:-1]
+    if token:
+        pieces.append(token)
+    pieces.extend(reversed(tail))
+    return pieces
+
+
+@lru_cache(maxsize=200000)
+def split_token(token):
+    """TextBlob's tokenizer split of one whitespace token (contractions, quotes, punctuation), computed once per distinct token"""
+    for contraction in CONTRACTIONS:
+        token = token.replace(contraction, ' ' + contraction)
+    for quote in QUOTES:
+        token = token.replace(quote, f' {quote} ')
+    pieces = []
+    for part in token.split():
+        pieces.extend(_split_punctuation(part))
+    return ' '.join(pieces)
+
+
+def sentiment_words(text):
+    """The lowercase words TextBlob's sentiment analysis sees in a text"""
+    words = []
+    for paragraph in PARAGRAPH_BREAK.split(text.replace('\r\n', '\n')):
+        joined = ' '.join([split_token(token) for token in paragraph.split()])
+        # Rejoin emoticons and "(!)" that punctuation splitting took apart (also across tokens, as in "steps: (1)")
+        joined = SARCASM_PATTERN.sub('(!)', joined)
+        joined = EMOTICON_PATTERN.sub(lambda m: m.group(1).replace(' ', '') + m.group(2), joined)
+        words.extend(joined.lower().split())
+    return words
+
+
+def sample_text(text, max_words):
+    """A long text cut down to evenly spaced windows (as paragraphs) of max_words words in total"""
+    tokens = text.split()
+    if not max_words or len(tokens) <= max_words:
+        return text
+    window = max(1, max_words // SAMPLE_WINDOWS)
+    stride = (len(tokens) - window) / (SAMPLE_WINDOWS - 1)
+    return '\n\n'.join(' '.join(tokens[int(i * stride):int(i * stride) + window]) for i in range(SAMPLE_WINDOWS))
+
+
+class LexiconSentiment:
+    """Fast polarity scorer: TextBlob's pattern algorithm over cached per-token splits.
+
+    Scores the same way as TextBlob(text).sentiment.polarity (known words averaged,
+    preceding adverbs intensify, negations flip and halve, "!" boosts, emoticons
+    count), but tokenizes each distinct whitespace token once and runs without
+    TextBlob's tokenizer, tagger or NLTK imports.
+    """
+
+    name = 'lexicon'
+
+    def __init__(self, lexicon=None):
+        self.lexicon = lexicon
+
+    def polarity(self, text):
+        lexicon = self.lexicon
+        if lexicon is None:
+            lexicon = self.lexicon = get_lexicon()
+        assessments = []  # [polarity, intensity, negated]
+        modifier = None
+        negation = None
+        for word in sentiment_words(text):
+            entry = lexicon.get(word)
+            if entry is not None:
+                polarity, intensity, is_modifier = entry
+                if modifier is None:
+                    assessments.append([polarity, intensity, False])
+                else:
+                    # "really good": the adverb's intensity scales this word
+                    last = assessments[-1]
+                    last[0] = max(-1.0, min(polarity * last[1], 1.0))
+                    last[1] = intensity
+                if negation is not None:
+                    last = assessments[-1]
+                    last[1] = 1.0 / last[1]
+                    last[2] = True
+                modifier = word if is_modifier else None
+                negation = word if word in NEGATIONS else None
+                continue
+
+            if word in NEGATIONS:
+                negation = word
+            elif negation and len(word.strip("'")) > 1:
+                negation = None
+            if negation is not None and modifier is not None and modifier.endswith('ly'):
+                # "really not good"
+                assessments[-1][2] = True
+                negation = None
+            elif modifier and len(word) > 2:
+                modifier = None
+            if word == '!' and assessments:
+                assessments[-1][0] = max(-1.0, min(assessments[-1][0] * 1.25, 1.0))
+            if word == '(!)':
+                assessments.append([0.0, 1.0, False])
+            if not word.isalpha() and len(word) <= 5 and word not in PUNCTUATION:
+                polarity = EMOTICON_POLARITY.get(word)
+                if polarity is not None:
+                    assessments.append([polarity, 1.0, False])
+
+        if not assessments:
+            return 0.0
+        # "not good" is slightly bad, "not bad" slightly good
+        return sum(p * -0.5 if negated else p for p, _, negated in assessments) / len(assessments)
+
+
+class TextBlobSentiment:
+    """TextBlob's own sentiment analysis: the reference implementation, for parity checks"""
+
+    name = 'textblob'
+
+    def polarity(self, text):
+        from textblob import TextBlob
+        return TextBlob(text).sentiment.polarity
+
+
+BACKENDS = {'lexicon': LexiconSentiment, 'textblob': TextBlobSentiment}
+
+_lexicon = None
+_lexicon_lock = threading.Lock()
+
+
+def get_lexicon():
+    """The shared sentiment lexicon, loaded on first use"""
+    global _lexicon
+    with _lexicon_lock:
+        if _lexicon is None:
+            _lexicon = load_lexicon()
+        return _lexicon
+
+
+class SentimentCache:
+    """Thread-safe LRU of polarity scores keyed by a hash of the page text"""
+
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            polarity = self.entries.get(key)
+            if polarity is not None:
+                self.entries.move_to_end(key)
+            return polarity
+
+    def set(self, key, polarity):
+        with self.lock:
+            self.entries[key] = polarity
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+# Process-wide, so repeated page text (shared templates, re-audits) is scored once
+sentiment_cache = SentimentCache()
+
+
+class SentimentAnalyzer:
+    """Page polarity from a pluggable backend, with long-page sampling and a text-hash cache"""
+
+    def __init__(self, backend=None, max_words=None, cache=sentiment_cache):
+        if backend is None:
+            backend = os.environ.get('SENTIMENT_BACKEND', 'lexicon')
+        if isinstance(backend, str):
+            if backend not in BACKENDS:
+                raise ValueError(f"Unknown sentiment backend: {backend} (expected one of {', '.join(BACKENDS)})")
+            backend = BACKENDS[backend]()
+        self.backend = backend
+        self.max_words = MAX_WORDS if max_words is None else max_words
+        self.cache = cache
+
+    @property
+    def name(self):
+        return self.backend.name
+
+    def polarity(self, text):
+        """Polarity of a page's text, from -1.0 (negative) to 1.0 (positive)"""
+        key = None
+        if self.cache is not None:
+            digest = hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+            key = f'{self.backend.name}:{self.max_words}:{digest}'
+            polarity = self.cache.get(key)
+            if polarity is not None:
+                return polarity
+
+        polarity = self.backend.polarity(sample_text(text, self.max_words))
+        if key is not None:
+            self.cache.set(key, polarity)
+        return polarity
@@ -0,0 +1,85 @@
+import zlib
+from xml.etree.ElementTree import XMLPullParser, ParseError
+
+MAX_SITEMAP_URLS = 50000  # per-audit cap across all sitemaps (also the protocol's per-file limit)
+MAX_SITEMAPS = 50         # sitemap files fetched per audit, including those listed by indexes
+
+
+def local_name(tag):
+    """Tag without its XML namespace"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def iter_sitemap_chunks(response, chunk_size=64 * 1024):
+    """Body chunks of a streamed sitemap response, gunzipping .xml.gz files on the fly"""
+    decompressor = None
+    first = True
+    # iter_content already undoes Content-Encoding: gzip; a .xml.gz file is still gzipped after that
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        if first:
+            first = False
+            if chunk[:2] == b'\x1f\x8b':
+                decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        yield decompressor.decompress(chunk) if decompressor else chunk
+    if decompressor:
+        yield decompressor.flush()
+
+
+def parse_sitemap(chunks):
+    """Incrementally parse one sitemap file; yields ('url', loc, priority) and ('sitemap', loc, None) entries"""
+    parser = XMLPullParser(events=('end',))
+    entry = {}
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event, element in parser.read_events():
+            name = local_name(element.tag)
+            if name in ('loc', 'priority'):
+                entry[name] = (element.text or '').strip()
+            elif name in ('url', 'sitemap'):
+                loc = entry.get('loc')
+                if loc:
+                    priority = None
+                    if name == 'url':
+                        try:
+                            priority = float(entry.get('priority', ''))
+                        except ValueError:
+                            pass
+                    yield name, loc, priority
+                entry = {}
+                element.clear()  # keep memory flat on 50k-URL sitemaps
+    parser.close()
+
+
+def iter_sitemap_urls(sitemap_urls, session, headers=None, timeout=10, max_urls=MAX_SITEMAP_URLS,
+                      max_sitemaps=MAX_SITEMAPS, limiter=None):
+    """Yield (url, priority) from sitemaps and sitemap indexes, following indexes breadth-first"""
+    pending = list(sitemap_urls)
+    fetched = set()
+    found = 0
+    while pending and len(fetched) < max_sitemaps and found < max_urls:
+        sitemap_url = pending.pop(0)
+        if sitemap_url in fetched:
+            continue
+        fetched.add(sitemap_url)
+
+        try:
+            if limiter:
+                with limiter.slot(sitemap_url):
+                    response = session.get(sitemap_url, headers=headers, timeout=timeout, stream=True)
+            else:
+                response = session.get(sitemap_url, headers=headers, timeout=timeout, stream=True)
+            with response:
+                if response.status_code != 200:
+                    continue
+                for kind, loc, priority in parse_sitemap(iter_sitemap_chunks(response)):
+                    if kind == 'sitemap':
+                        pending.append(loc)
+                    else:
+                        yield loc, priority
+                        found += 1
+                        if found >= max_urls:
+                            break
+        except (ParseError, zlib.error) as e:
+            print(f"Could not parse sitemap {sitemap_url}: {str(e)}")
+        except Exception as e:
+            print(f"Could not fetch sitemap {sitemap_url}: {str(e)}")
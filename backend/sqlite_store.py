@@ -0,0 +1,33 @@
+import os
+import sqlite3
+import threading
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+class SQLiteStore:
+    """Base for the SQLite-backed stores: WAL mode and one connection per thread"""
+
+    SCHEMA = ''
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.local = threading.local()
+        with self.connection() as conn:
+            conn.executescript(self.SCHEMA)
+
+    def connection(self):
+        """One connection per thread; WAL lets readers proceed while another process writes"""
+        conn = getattr(self.local, 'conn', None)
+        # A connection inherited through fork (e.g. gunicorn preload_app) must not be used by the child
+        if conn is None or self.local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self.local.conn = conn
+            self.local.pid = os.getpid()
+        return conn
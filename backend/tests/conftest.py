@@ -0,0 +1,9 @@
+import os
+import tempfile
+
+# Isolated stores for the app, set before any test imports it
+DATA_DIR = tempfile.mkdtemp(prefix='seo-tests-')
+os.environ['AUDIT_DB_PATH'] = os.path.join(DATA_DIR, 'audits.db')
+os.environ['JOB_DB_PATH'] = os.path.join(DATA_DIR, 'jobs.db')
+os.environ['CHECKPOINT_PATH'] = os.path.join(DATA_DIR, 'checkpoints.db')
+os.environ['PAGE_CACHE'] = '0'
@@ -0,0 +1,26 @@
+import analyzer
+from analyzer import SEOAnalyzer
+from crawler import SEOCrawler
+from sentiment import SentimentAnalyzer
+from benchmarks.extraction import synthetic_corpus
+
+
+def test_pool_workers_use_the_parent_sentiment_config():
+    crawler = SEOCrawler('https://example.com/')
+    pages = [crawler.extract_page_data(f'https://example.com/page/{i}', html)
+             for i, html in enumerate(synthetic_corpus(count=analyzer.PARALLEL_MIN_PAGES, words=400))]
+    crawl_data = {'pages': pages, 'broken_links': [], 'total_pages_crawled': len(pages)}
+
+    def analyze(workers):
+        # A sampling limit well below the page length, so a worker on the default config would differ
+        sentiment = SentimentAnalyzer('lexicon', max_words=25, cache=None)
+        return SEOAnalyzer(workers=workers, cache=None, sentiment=sentiment).analyze_all_pages(crawl_data)
+
+    try:
+        pooled = analyze(2)
+        assert analyzer._pool_config == (2, 'lexicon', 25)
+        assert pooled == analyze(0)
+    finally:
+        if analyzer._pool is not None:
+            analyzer._pool.shutdown()
+            analyzer._pool = analyzer._pool_config = None
@@ -0,0 +1,57 @@
+import json
+import time
+import pytest
+import app
+from jobs import AuditJobQueue, QueueFullError
+from benchmarks.fixture_site import SiteSpec, start_fixture_server
+
+
+@pytest.fixture(scope='module')
+def site():
+    server, start_url = start_fixture_server(SiteSpec(pages=10, fanout=3, words=150, dead_links=1))
+    yield start_url
+    server.shutdown()
+
+
+def read_events(response):
+    events = []
+    for block in response.get_data(as_text=True).split('\n\n'):
+        if block:
+            event, data = block.split('\n')
+            events.append((event[len('event: '):], json.loads(data[len('data: '):])))
+    return events
+
+
+def test_stream_event_order(site):
+    response = app.app.test_client().get(f'/api/audit/stream?url={site}&max_pages=4&max_depth=2')
+    assert response.status_code == 200
+    events = read_events(response)
+    names = [name for name, _ in events]
+
+    assert names[0] == 'start'
+    assert names[-1] == 'summary'
+    assert names.count('summary') == 1 and 'error' not in names
+    # Every page is streamed as it is analyzed, before the link checks and the summary
+    pages = [data for name, data in events if name == 'page']
+    assert names[1:1 + len(pages)] == ['page'] * len(pages)
+    assert [page['pages_crawled'] for page in pages] == [1, 2, 3, 4]
+    summary = events[-1][1]
+    assert summary['crawl_stats']['pages_crawled'] == len(pages)
+    assert [p['url'] for p in summary['analysis']['pages']] == [page['analysis']['url'] for page in pages]
+
+    # The stream ran as a job on the audit queue
+    job_id = events[0][1]['job_id']
+    deadline = time.monotonic() + 5
+    while app.audit_jobs.get(job_id).status == 'running' and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert app.audit_jobs.get(job_id).status == 'completed'
+
+
+def test_stream_returns_503_when_queue_is_full(site, monkeypatch):
+    class FullQueue(AuditJobQueue):
+        def submit(self, params, run=None):
+            raise QueueFullError("Audit queue is full, try again later")
+
+    monkeypatch.setattr(app, 'audit_jobs', FullQueue(None))
+    response = app.app.test_client().get(f'/api/audit/stream?url={site}')
+    assert response.status_code == 503
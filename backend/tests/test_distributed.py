@@ -0,0 +1,45 @@
+import time
+import pytest
+from analyzer import SEOAnalyzer
+from crawler import SEOCrawler
+from distributed import DistributedCrawlStore, start_crawl, run_worker, run_distributed_crawl, finish_crawl
+from benchmarks.fixture_site import SiteSpec, start_fixture_server
+
+SETTINGS = dict(max_pages=12, max_depth=10, max_workers=2, max_per_host=4, requests_per_second=0,
+                use_sitemaps=False)
+
+
+@pytest.fixture(scope='module')
+def site():
+    server, start_url = start_fixture_server(SiteSpec(pages=12, fanout=3, words=150, dead_links=1))
+    yield start_url
+    server.shutdown()
+
+
+def test_distributed_crawl_matches_single_process(site, tmp_path):
+    crawl_data = SEOCrawler(site, frontier_type='fifo', **SETTINGS).crawl()
+    expected = SEOAnalyzer(workers=0, cache=None).analyze_all_pages(crawl_data)
+
+    _, dist_crawl, dist_analysis = run_distributed_crawl(site, workers=2, db_path=str(tmp_path / 'crawl.db'),
+                                                         **SETTINGS)
+    assert sorted(page['url'] for page in dist_crawl['pages']) == sorted(page['url'] for page in crawl_data['pages'])
+    assert dist_crawl['total_pages_crawled'] == SETTINGS['max_pages']
+    assert dist_analysis['broken_links'] == expected['broken_links']
+    assert dist_analysis['summary'] == expected['summary']
+
+
+def test_expired_lease_is_taken_over(site, tmp_path):
+    store = DistributedCrawlStore(str(tmp_path / 'crawl.db'))
+    crawl_id = start_crawl(store, site, workers=1, **SETTINGS)
+
+    # A worker leases the start page and dies before completing it
+    [(frontier_id, url, depth)] = store.claim(crawl_id, 'dead-worker', 1, lease_seconds=0.2)
+    assert store.claim(crawl_id, 'other-worker', 10, lease_seconds=0) == []  # still leased: nothing else yet
+    time.sleep(0.3)
+
+    assert run_worker(store, crawl_id, worker_id='live-worker') == SETTINGS['max_pages']
+    assert store.progress(crawl_id) == {'done': SETTINGS['max_pages']}
+    # The dead worker's late result is rejected; the live worker's stays
+    assert not store.complete(crawl_id, frontier_id, 'dead-worker', {}, {}, None, [], [], SETTINGS['max_pages'])
+    crawl_data, _ = finish_crawl(store, crawl_id)
+    assert url in [page['url'] for page in crawl_data['pages']]
@@ -0,0 +1,56 @@
+import json
+from crawler import SEOCrawler
+from frontier import CrawlFrontier, PriorityFrontier
+
+BASE = 'https://shop.example'
+
+
+def pop_all(frontier):
+    order = []
+    while frontier:
+        order.append(frontier.pop()[0][len(BASE):])
+    return order
+
+
+def test_inbound_links_and_sitemap_priority_outrank_new_patterns():
+    frontier = PriorityFrontier(lambda url: url)
+    frontier.add(BASE + '/p/0', 0, force=True)
+    assert frontier.pop() == (BASE + '/p/0', 0)
+
+    # Found on /p/0: pagination, facets, a dead link of a new pattern and the next product page
+    for path in ['/list/page/2', '/list/page/3', '/list/page/4', '/shop?color=red', '/shop?color=blue',
+                 '/missing/0-0', '/p/1']:
+        frontier.add(BASE + path, 1)
+    # /p/1 is linked from two more pages; /about is listed in the sitemap with a high priority
+    frontier.add(BASE + '/p/1', 1)
+    frontier.add(BASE + '/p/1', 1)
+    frontier.add(BASE + '/about', 1, priority=1.0)
+
+    assert pop_all(frontier) == [
+        '/about',          # sitemap priority 1.0
+        '/p/1',            # three inbound links, though /p/{n} was already crawled
+        '/list/page/2',    # equally ranked from here on: one URL per pattern in turn
+        '/shop?color=red',
+        '/missing/0-0',
+        '/list/page/3',
+        '/shop?color=blue',
+        '/list/page/4',
+    ]
+
+
+def test_checkpointed_priority_frontier_pops_in_the_same_order():
+    frontier = PriorityFrontier(lambda url: url)
+    for n in range(5):
+        frontier.add(f'{BASE}/page/{n}', 1)
+        frontier.add(f'{BASE}/item/{n}', 2)
+    frontier.pop()
+    restored = PriorityFrontier(lambda url: url)
+    restored.load_state(json.loads(json.dumps(frontier.to_state())))  # as stored in a checkpoint
+    assert pop_all(restored) == pop_all(frontier)
+
+
+def test_fifo_frontier_is_the_default(monkeypatch):
+    monkeypatch.delenv('CRAWL_FRONTIER', raising=False)
+    assert isinstance(SEOCrawler(BASE + '/').frontier, CrawlFrontier)
+    monkeypatch.setenv('CRAWL_FRONTIER', 'priority')
+    assert isinstance(SEOCrawler(BASE + '/').frontier, PriorityFrontier)
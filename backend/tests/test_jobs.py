@@ -0,0 +1,94 @@
+import threading
+import time
+import pytest
+import app
+from jobs import AuditJobQueue, JobStore
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'timed out'
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def stub_jobs(monkeypatch, tmp_path):
+    """The app's audit queue with one worker, room for one queued job and a run_audit that waits for release"""
+    release = threading.Event()
+
+    def stub_run_audit(url, max_pages=5, max_depth=2, progress_callback=None, **kwargs):
+        progress_callback('crawl', 3)
+        progress_callback('links', 4, 10)
+        release.wait(5)
+        return {'url': url, 'audit_id': 'stub'}
+
+    store_path = str(tmp_path / 'jobs.db')
+    jobs = AuditJobQueue(stub_run_audit, workers=1, max_queued=1, store=JobStore(store_path))
+    monkeypatch.setattr(app, 'audit_jobs', jobs)
+    yield app.app.test_client(), release, store_path
+    release.set()
+
+
+def submit(client, url='https://example.com/'):
+    return client.post('/api/audit/jobs', json={'url': url, 'max_pages': 2, 'max_depth': 1})
+
+
+def status(client, job_id):
+    return client.get(f'/api/audit/jobs/{job_id}').get_json()
+
+
+def test_job_lifecycle_and_progress(stub_jobs):
+    client, release, _ = stub_jobs
+    response = submit(client, 'https://example.com/first')
+    assert response.status_code == 202
+    first = response.get_json()
+    assert first['status_url'] == f"/api/audit/jobs/{first['job_id']}"
+    wait_for(lambda: status(client, first['job_id'])['progress']['stage'] == 'links')
+
+    running = status(client, first['job_id'])
+    assert running['status'] == 'running'
+    assert running['url'] == 'https://example.com/first'
+    assert running['progress'] == {'stage': 'links', 'pages_crawled': 3, 'links_checked': 4, 'links_total': 10}
+    assert client.get(first['result_url']).status_code == 409
+
+    # The only worker is busy, so the next job waits in the queue
+    second = submit(client, 'https://example.com/second').get_json()
+    assert status(client, second['job_id'])['status'] == 'queued'
+    assert status(client, second['job_id'])['progress']['stage'] == 'queued'
+
+    release.set()
+    wait_for(lambda: status(client, second['job_id'])['status'] == 'completed')
+    done = status(client, first['job_id'])
+    assert done['status'] == 'completed'
+    assert done['progress']['stage'] == 'done'
+    assert done['started_at'] and done['finished_at']
+    assert client.get(first['result_url']).get_json() == {'url': 'https://example.com/first', 'audit_id': 'stub'}
+
+
+def test_full_queue_returns_503(stub_jobs):
+    client, _, _ = stub_jobs
+    running = submit(client).get_json()
+    wait_for(lambda: status(client, running['job_id'])['status'] == 'running')
+    assert submit(client).status_code == 202  # fills the single queue slot
+    response = submit(client)
+    assert response.status_code == 503
+    assert 'full' in response.get_json()['error']
+
+
+def test_unknown_job_returns_404(stub_jobs):
+    client, _, _ = stub_jobs
+    assert client.get('/api/audit/jobs/no-such-job').status_code == 404
+    assert client.get('/api/audit/jobs/no-such-job/result').status_code == 404
+
+
+def test_any_process_can_report_a_job(stub_jobs, monkeypatch):
+    client, release, store_path = stub_jobs
+    job = submit(client).get_json()
+    release.set()
+    wait_for(lambda: status(client, job['job_id'])['status'] == 'completed')
+
+    # Another worker process: its own (empty) queue, the same job store
+    monkeypatch.setattr(app, 'audit_jobs', AuditJobQueue(None, store=JobStore(store_path)))
+    assert status(client, job['job_id'])['progress']['pages_crawled'] == 3
+    assert client.get(job['result_url']).get_json()['audit_id'] == 'stub'
@@ -0,0 +1,39 @@
+import time
+from link_checker import LinkStatusCache, LinkChecker
+
+
+def test_failures_expire_after_failure_ttl():
+    cache = LinkStatusCache(ttl=3600, failure_ttl=0.05)
+    cache.set('https://example.com/ok', 200)
+    cache.set('https://example.com/missing', 404)
+    cache.set('https://example.com/timeout', 0)
+    cache.set('https://example.com/error', 503)
+    assert cache.get('https://example.com/timeout') == 0
+    assert cache.get('https://example.com/error') == 503
+
+    time.sleep(0.1)
+    assert cache.get('https://example.com/timeout') is None
+    assert cache.get('https://example.com/error') is None
+    assert cache.get('https://example.com/ok') == 200
+    assert cache.get('https://example.com/missing') == 404
+
+
+def test_failures_not_cached_with_zero_failure_ttl():
+    cache = LinkStatusCache(failure_ttl=0)
+    cache.set('https://example.com/timeout', 0)
+    cache.set('https://example.com/error', 500)
+    assert cache.get('https://example.com/timeout') is None
+    assert cache.get('https://example.com/error') is None
+
+
+def test_transient_failure_is_reprobed():
+    statuses = [0, 200]
+
+    class StubChecker(LinkChecker):
+        def _probe(self, url):
+            return statuses.pop(0)
+
+    checker = StubChecker(cache=LinkStatusCache(failure_ttl=0), requests_per_second=0)
+    assert checker.check_status('https://example.com/flaky') == 0
+    assert checker.check_status('https://example.com/flaky') == 200
+    assert checker.check_status('https://example.com/flaky') == 200
@@ -0,0 +1,36 @@
+import pytest
+import lxml_extractor
+from crawler import SEOCrawler
+from benchmarks.extraction import EDGE_CASES, synthetic_corpus
+
+CORPUS = EDGE_CASES + synthetic_corpus(count=20, words=200)
+crawler = SEOCrawler('https://example.com/', parser='lxml')
+
+
+@pytest.mark.parametrize('html', CORPUS)
+def test_lxml_backend_matches_bs4(html):
+    assert crawler.extract_fields(html) == crawler.extract_fields_bs4(html)
+
+
+@pytest.mark.parametrize('html', synthetic_corpus(count=5, words=200) + [
+    '<body><p>Visible</p><template><a href="/t">T</a><h2>TH</h2></template><a href="/v">After</a></body>',
+    '<a class="x" class="y" href="/single">One href</a>',
+    '<title>Plain & simple</title><textarea>a &lt; b</textarea><iframe src="/f"></iframe>',
+])
+def test_supported_pages_are_extracted_by_lxml(html):
+    assert lxml_extractor.extract_fields(html) == crawler.extract_fields_bs4(html)
+
+
+@pytest.mark.parametrize('html, error', [
+    ('<a href="/first" href="/second">x</a>', lxml_extractor.DuplicateAttributeError),
+    ('<meta name="description" content="one" content="two">', lxml_extractor.DuplicateAttributeError),
+    ('<title>A<b>B</b></title><p>Body</p>', lxml_extractor.RawTextMarkupError),
+    ('<title>One <!-- c --> Two</title>', lxml_extractor.RawTextMarkupError),
+    ('<body><textarea><a href="/in">Link</a></textarea></body>', lxml_extractor.RawTextMarkupError),
+    ('<body><iframe><h1>Fallback</h1></iframe></body>', lxml_extractor.RawTextMarkupError),
+    ('<body><title>Unclosed <b>title', lxml_extractor.RawTextMarkupError),
+])
+def test_unsupported_markup_falls_back_to_bs4(html, error):
+    with pytest.raises(error):
+        lxml_extractor.extract_fields(html)
+    assert crawler.extract_fields(html) == crawler.extract_fields_bs4(html)
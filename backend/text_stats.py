@@ -0,0 +1,141 @@
+import re
+from collections import Counter
+from functools import lru_cache
+import pyphen
+
+KEYWORD_PATTERN = re.compile(r'\b[a-zA-Z]{4,}\b')   # words counted for keyword density
+TERM_PATTERN = re.compile(r'(?u)\b\w\w+\b')          # sklearn's default TF-IDF token pattern
+SENTENCE_BREAK = re.compile(r'[.!?]+')
+PUNCTUATION = re.compile(r"[^\w\s']|(?<!\w)'|'(?!\w)")
+
+# textstat (which loads NLTK), the hyphenation dictionary and scikit-learn's stop words are loaded on first use
+_hyphenator = None
+_stop_words = None
+_use_cmudict = True
+
+
+def english_stop_words():
+    """scikit-learn's English stop words (the ones TfidfVectorizer(stop_words='english') drops)"""
+    global _stop_words
+    if _stop_words is None:
+        from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+        _stop_words = ENGLISH_STOP_WORDS
+    return _stop_words
+
+
+@lru_cache(maxsize=200000)
+def count_word_syllables(word):
+    """Syllables in one lowercase word (textstat's dictionary, else its pyphen fallback)"""
+    global _use_cmudict, _hyphenator
+    if _use_cmudict:
+        try:
+            import textstat
+            return textstat.syllable_count(word)
+        except LookupError:
+            # CMU dictionary corpus not installed; stop retrying it for every word
+            _use_cmudict = False
+    if _hyphenator is None:
+        _hyphenator = pyphen.Pyphen(lang='en_US')
+    return len(_hyphenator.positions(word)) + 1
+
+
+@lru_cache(maxsize=200000)
+def _analyze_token(token):
+    """Everything the content metrics need from one whitespace token, computed once per distinct token"""
+    lower = token.lower()
+    pieces = SENTENCE_BREAK.split(token)
+    # Words per sentence piece, after punctuation removal (textstat's word definition)
+    piece_words = tuple(1 if PUNCTUATION.sub('', piece).strip() else 0 for piece in pieces)
+    word = PUNCTUATION.sub('', lower)
+    syllables = count_word_syllables(word) if word else 0
+    return (
+        piece_words,
+        bool(word),
+        syllables,
+        tuple(KEYWORD_PATTERN.findall(lower)),
+        tuple(t for t in TERM_PATTERN.findall(lower) if t not in english_stop_words()),
+    )
+
+
+class TextStats:
+    """Tokenize a page's text once and derive every content metric from that single pass"""
+
+    def __init__(self, text):
+        tokens = (text or '').split()
+        self.word_count = len(tokens)
+        token_freq = Counter(tokens)
+
+        # Walk tokens in order for sentence boundaries (textstat ignores sentences of <= 2 words)
+        sentences = 0
+        short_sentences = 0
+        current = 0
+        for token in tokens:
+            piece_words = _analyze_token(token)[0]
+            current += piece_words[0]
+            for words in piece_words[1:]:
+                if current:
+                    sentences += 1
+                    if current <= 2:
+                        short_sentences += 1
+                current = words
+        if current:
+            sentences += 1
+            if current <= 2:
+                short_sentences += 1
+        self.sentence_count = max(1, sentences - short_sentences) if tokens else 0
+
+        # Aggregate the per-token results by distinct token
+        self.lexicon_count = 0
+        self.syllable_count = 0
+        self.keyword_freq = Counter()
+        self.term_freq = Counter()
+        for token, count in token_freq.items():
+            _, is_word, syllables, keyword_words, terms = _analyze_token(token)
+            if is_word:
+                self.lexicon_count += count
+                self.syllable_count += syllables * count
+            for word in keyword_words:
+                self.keyword_freq[word] += count
+            for term in terms:
+                self.term_freq[term] += count
+        self.keyword_word_count = sum(self.keyword_freq.values())
+
+    COUNT_FIELDS = ('word_count', 'sentence_count', 'lexicon_count', 'syllable_count', 'keyword_word_count')
+
+    def to_counts(self):
+        """JSON-serializable counts, enough to rebuild the stats without re-tokenizing the text"""
+        counts = {field: getattr(self, field) for field in self.COUNT_FIELDS}
+        counts['keyword_freq'] = dict(self.keyword_freq)
+        counts['term_freq'] = dict(self.term_freq)
+        return counts
+
+    @classmethod
+    def from_counts(cls, counts):
+        """TextStats rebuilt from to_counts() output (e.g. computed by another process)"""
+        stats = cls.__new__(cls)
+        for field in cls.COUNT_FIELDS:
+            setattr(stats, field, counts[field])
+        stats.keyword_freq = Counter(counts['keyword_freq'])
+        stats.term_freq = Counter(counts['term_freq'])
+        return stats
+
+    def words_per_sentence(self):
+        return self.lexicon_count / self.sentence_count if self.sentence_count else 0.0
+
+    def syllables_per_word(self):
+        return self.syllable_count / self.lexicon_count if self.lexicon_count else 0.0
+
+    def flesch_reading_ease(self):
+        """Flesch Reading Ease (same formula and constants as textstat for English)"""
+        words_per_sentence = self.words_per_sentence()
+        syllables_per_word = self.syllables_per_word()
+        if words_per_sentence == 0 or syllables_per_word == 0:
+            return 0.0
+        return 206.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word
+
+    def flesch_kincaid_grade(self):
+        words_per_sentence = self.words_per_sentence()
+        syllables_per_word = self.syllables_per_word()
+        if words_per_sentence == 0 or syllables_per_word == 0:
+            return 0.0
+        return 0.39 * words_per_sentence + 11.8 * syllables_per_word - 15.59
@@ -0,0 +1,92 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """Token-bucket rate limiter: allows `rate` requests per second with bursts of `capacity`"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def set_rate(self, rate):
+        """Change the refill rate (e.g. to honour a robots.txt Crawl-delay)"""
+        with self.lock:
+            self._refill()
+            self.rate = float(rate)
+            self.capacity = min(self.capacity, max(1.0, self.rate))
+            self.tokens = min(self.tokens, self.capacity)
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Block until a token is available, then consume it"""
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class HostLimiter:
+    """Per-host politeness: caps concurrent requests and request rate for each host"""
+
+    def __init__(self, max_per_host=2, requests_per_second=4.0):
+        self.max_per_host = max_per_host
+        self.requests_per_second = requests_per_second
+        self.semaphores = {}
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def host(self, url):
+        return urlparse(url).netloc.lower()
+
+    def bucket(self, url):
+        """Get (or create) the token bucket for the URL's host"""
+        host = self.host(url)
+        with self.lock:
+            if host not in self.buckets:
+                self.buckets[host] = TokenBucket(self.requests_per_second)
+            return self.buckets[host]
+
+    def _semaphore(self, host):
+        with self.lock:
+            if host not in self.semaphores:
+                self.semaphores[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self.semaphores[host]
+
+    def slot(self, url):
+        """Context manager holding one of the host's concurrency slots after waiting for a token"""
+        return _HostSlot(self, url)
+
+
+class _HostSlot:
+    def __init__(self, limiter, url):
+        self.limiter = limiter
+        self.url = url
+        self.semaphore = limiter._semaphore(limiter.host(url))
+
+    def __enter__(self):
+        self.semaphore.acquire()
+        try:
+            self.limiter.bucket(self.url).acquire()
+        except BaseException:
+            self.semaphore.release()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.semaphore.release()
+        return False
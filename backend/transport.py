@@ -0,0 +1,63 @@
+import os
+import threading
+from http.cookiejar import DefaultCookiePolicy
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Connection pool sizing: hosts kept pooled, and keep-alive connections kept per host
+POOL_CONNECTIONS = int(os.environ.get('HTTP_POOL_CONNECTIONS', '64'))
+POOL_MAXSIZE = int(os.environ.get('HTTP_POOL_MAXSIZE', '16'))
+
+# Retries for connection resets / failed connects (not for HTTP error statuses or read timeouts)
+RETRIES = int(os.environ.get('HTTP_RETRIES', '2'))
+RETRY_BACKOFF = float(os.environ.get('HTTP_RETRY_BACKOFF', '0.3'))
+
+_session = None
+_probe_session = None
+_session_lock = threading.Lock()
+
+
+def create_session(pool_connections=None, pool_maxsize=None, retries=None, backoff_factor=None):
+    """A requests.Session with pooled keep-alive connections and retry/backoff on connection errors"""
+    # A read timeout means the server accepted the request and hung: retrying would only
+    # multiply the timeout, so reads are never retried
+    retry = Retry(
+        total=RETRIES if retries is None else retries,
+        connect=RETRIES if retries is None else retries,
+        read=0,
+        status=0,
+        redirect=None,
+        backoff_factor=RETRY_BACKOFF if backoff_factor is None else backoff_factor,
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections or POOL_CONNECTIONS,
+        pool_maxsize=pool_maxsize or POOL_MAXSIZE,
+        max_retries=retry
+    )
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    # Shared across audits of different sites, so never carry cookies from one request to the next
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+def get_session():
+    """Process-wide session shared by the crawler and scraper"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_session()
+        return _session
+
+
+def get_probe_session():
+    """Process-wide session for link checks: no retries, so a dead link costs a single timeout"""
+    global _probe_session
+    with _session_lock:
+        if _probe_session is None:
+            _probe_session = create_session(retries=0)
+        return _probe_session
@@ -65,19 +65,62 @@ function App() {
     setLoadingProgress("Crawling and analyzing your website...");
 
     try {
-      const res = await fetch(`${API_BASE}/audit`, {
+      // Stream results as they arrive (Server-Sent Events over a POST response)
+      const res = await fetch(`${API_BASE}/audit/stream`, {
         method: "POST",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify({ url, max_pages: maxPages, max_depth: maxDepth })
       });
 
-      const data = await res.json();
-
       if (!res.ok) {
+        const data = await res.json();
         throw new Error(data.error || `Error: ${res.status}`);
       }
 
-      setResult(data);
+      const reader = res.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = "";
+      let finalResult = null;
+      let brokenLinks = 0;
+
+      const handleEvent = (event, data) => {
+        if (event === "page") {
+          const score = data.running_scores ? ` · running score ${data.running_scores.overall}` : "";
+          setLoadingProgress(`Analyzed ${data.pages_crawled} of up to ${maxPages} page(s)${score}`);
+        } else if (event === "broken_link") {
+          brokenLinks += 1;
+        } else if (event === "progress" && data.stage === "links") {
+          setLoadingProgress(`Checking links: ${data.links_checked}/${data.links_total}` +
+            (brokenLinks ? ` · ${brokenLinks} broken` : ""));
+        } else if (event === "summary") {
+          finalResult = data;
+        } else if (event === "error") {
+          throw new Error(data.error);
+        }
+      };
+
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary;
+        while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+          const chunk = buffer.slice(0, boundary);
+          buffer = buffer.slice(boundary + 2);
+          const eventLine = chunk.split("\n").find(line => line.startsWith("event: "));
+          const dataLine = chunk.split("\n").find(line => line.startsWith("data: "));
+          if (eventLine && dataLine) {
+            handleEvent(eventLine.slice(7), JSON.parse(dataLine.slice(6)));
+          }
+        }
+      }
+
+      if (!finalResult) {
+        throw new Error("Audit stream ended unexpectedly");
+      }
+
+      setResult(finalResult);
       setActiveTab("overview");
     } catch (err) {
       setError(err.message);